@@ -4,7 +4,7 @@ import math
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 from tqdm import tqdm
@@ -17,11 +17,15 @@ try:
         _load_events_and_embeddings as load_kalshi_events_and_embeddings,
     )
     from tools.kalshi_client import get_kalshi_client
-    from tools.kalshi_markets import get_markets_for_event as get_kalshi_markets
+    from tools.kalshi_markets import get_markets_for_events as get_kalshi_markets_for_events
     from tools.polymarket import (
         _load_events_and_embeddings as load_polymarket_events_and_embeddings,
     )
     from tools.polymarket import get_markets_for_event as get_polymarket_markets
+    from tools.http_cache import METADATA_MAX_AGE
+    from tools.related_events import get_neighbor_graph
+    from tools.kalshi_events import get_vector_index as get_kalshi_vector_index
+    from tools.polymarket import get_vector_index as get_polymarket_vector_index
 except ImportError:
     # When run directly as a script, ensure the project root (parent of this file)
     # is on sys.path so the `tools` package can be imported.
@@ -31,11 +35,15 @@ except ImportError:
         _load_events_and_embeddings as load_kalshi_events_and_embeddings,
     )
     from tools.kalshi_client import get_kalshi_client
-    from tools.kalshi_markets import get_markets_for_event as get_kalshi_markets
+    from tools.kalshi_markets import get_markets_for_events as get_kalshi_markets_for_events
     from tools.polymarket import (
         _load_events_and_embeddings as load_polymarket_events_and_embeddings,
     )
     from tools.polymarket import get_markets_for_event as get_polymarket_markets
+    from tools.http_cache import METADATA_MAX_AGE
+    from tools.related_events import get_neighbor_graph
+    from tools.kalshi_events import get_vector_index as get_kalshi_vector_index
+    from tools.polymarket import get_vector_index as get_polymarket_vector_index
 
 
 # Default location where we persist cross-platform event candidates
@@ -96,21 +104,74 @@ def _save_all_candidates_to_csv(
                 }
             )
 
+
+def _find_candidates_from_related_graphs(
+    min_similarity: float = 0.0,
+    exclude_exact_duplicates: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Collect cross-platform candidates from the precomputed top-k neighbor graphs.
+
+    Reads both directions (Kalshi -> Polymarket and Polymarket -> Kalshi), so a
+    pair is kept if either event is among the other's nearest neighbors.
+    """
+    print("Loading cross-platform related-events graphs...")
+    kalshi_index = get_kalshi_vector_index()
+    polymarket_index = get_polymarket_vector_index()
+
+    pair_scores: Dict[Tuple[str, str], float] = {}
+    for kalshi_ticker, polymarket_id, sim in get_neighbor_graph("kalshi", "polymarket").edges(min_similarity):
+        pair_scores[(kalshi_ticker, polymarket_id)] = sim
+    for polymarket_id, kalshi_ticker, sim in get_neighbor_graph("polymarket", "kalshi").edges(min_similarity):
+        pair_scores[(kalshi_ticker, polymarket_id)] = sim
+
+    all_candidates: List[Dict[str, Any]] = []
+    for (kalshi_ticker, polymarket_id), sim in pair_scores.items():
+        # Skip exact duplicates if requested
+        if exclude_exact_duplicates and sim >= 0.9999:
+            continue
+        kalshi_event = kalshi_index.get_event(kalshi_ticker)
+        polymarket_event = polymarket_index.get_event(polymarket_id)
+        if kalshi_event is None or polymarket_event is None:
+            continue
+        all_candidates.append({
+            "kalshi_event": kalshi_event,
+            "polymarket_event": polymarket_event,
+            "similarity": sim,
+            "kalshi_ticker": kalshi_ticker,
+            "polymarket_id": polymarket_id,
+            "platform1": "kalshi",
+            "platform2": "polymarket",
+        })
+
+    print(f"Collected {len(all_candidates):,} candidate pairs from the related-events graphs.")
+    return all_candidates
+
+
 def find_similar_cross_platform_events(
     top_k: int = 10,
     min_similarity: float = 0.0,
     exclude_exact_duplicates: bool = False,
+    use_related_graph: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Find the most similar pairs of events between Polymarket and Kalshi by comparing their embeddings.
     
-    Uses numpy for efficient vectorized cosine similarity computation.
+    By default every pair is scored with numpy. Set use_related_graph=True to
+    read candidates from the precomputed top-k related-events graphs
+    (tools/related_events.py) instead, which avoids the full n*m comparison.
+    The graphs hold each event's k nearest neighbors, so they contain the
+    global top_k pairs only while top_k <= k; for larger top_k the numpy
+    scan is used anyway.
     
     Args:
         top_k: Number of most similar pairs to return.
         min_similarity: Minimum cosine similarity threshold (0.0 to 1.0).
         exclude_exact_duplicates: If True, exclude pairs with similarity exactly 1.0
                                  (likely exact duplicates).
+        use_related_graph: If True, only consider pairs where one event is among
+                           the other's top-k neighbors (precomputed graphs).
+                           The candidates CSV then holds only those graph edges.
     
     Returns:
         List of dicts, each containing:
@@ -122,6 +183,24 @@ def find_similar_cross_platform_events(
         - platform1: "kalshi"
         - platform2: "polymarket"
     """
+    if use_related_graph:
+        graph_k = min(
+            get_neighbor_graph("kalshi", "polymarket").k,
+            get_neighbor_graph("polymarket", "kalshi").k,
+        )
+        if top_k > graph_k:
+            print(f"top_k={top_k} exceeds the related-events graphs' k={graph_k}; scoring every pair instead.")
+            use_related_graph = False
+
+    if use_related_graph:
+        all_candidates = _find_candidates_from_related_graphs(
+            min_similarity=min_similarity,
+            exclude_exact_duplicates=exclude_exact_duplicates,
+        )
+        all_candidates.sort(key=lambda x: x["similarity"], reverse=True)
+        _save_all_candidates_to_csv(all_candidates)
+        return all_candidates[:top_k]
+
     # Load events and embeddings from both platforms
     print("Loading Kalshi events and embeddings...")
     kalshi_events, kalshi_embeds = load_kalshi_events_and_embeddings()
@@ -227,6 +306,7 @@ def find_arbitrage_opportunities_cross_platform(
     top_k_events: int = 10,
     min_event_similarity: float = 0.7,
     exclude_exact_duplicates: bool = True,
+    use_related_graph: bool = False,
 ) -> List[Dict[str, Any]]:
     """
     Find potential arbitrage opportunities by:
@@ -238,6 +318,8 @@ def find_arbitrage_opportunities_cross_platform(
         min_event_similarity: Minimum cosine similarity threshold for events (default 0.7).
         exclude_exact_duplicates: If True, exclude pairs with similarity exactly 1.0
                                   (likely exact duplicates). Default True.
+        use_related_graph: If True, read candidates from the precomputed
+                           related-events graphs instead of scoring every pair.
     
     Returns:
         List of dicts containing similar event pairs with their markets, each with:
@@ -257,6 +339,7 @@ def find_arbitrage_opportunities_cross_platform(
         top_k=top_k_events,
         min_similarity=min_event_similarity,
         exclude_exact_duplicates=exclude_exact_duplicates,
+        use_related_graph=use_related_graph,
     )
     
     if not similar_events:
@@ -265,7 +348,13 @@ def find_arbitrage_opportunities_cross_platform(
     
     print(f"Found {len(similar_events)} similar event pairs. Fetching markets...")
     
-    # Step 2: For each pair of similar events, fetch their markets
+    # Step 2: For each pair of similar events, fetch their markets.
+    # Kalshi markets for all pairs at once: one bulk sweep, or rate-limited
+    # concurrent requests for small batches.
+    kalshi_markets_by_event = get_kalshi_markets_for_events(
+        pair["kalshi_ticker"] for pair in similar_events
+    )
+
     results = []
     for pair in tqdm(similar_events, desc="Fetching markets for cross-platform event pairs", unit="pair"):
         kalshi_ticker = pair["kalshi_ticker"]
@@ -273,13 +362,15 @@ def find_arbitrage_opportunities_cross_platform(
         polymarket_event = pair["polymarket_event"]
         
         # Fetch markets for both events
-        kalshi_markets = get_kalshi_markets(kalshi_ticker)
+        kalshi_markets = kalshi_markets_by_event.get(kalshi_ticker, [])
         # For Polymarket, use the event dict directly if available (more efficient)
         polymarket_markets = get_polymarket_markets(event_dict=polymarket_event)
         
         # If no markets from event dict, try fetching by ID
         if not polymarket_markets:
-            polymarket_markets = get_polymarket_markets(event_id=polymarket_id)
+            polymarket_markets = get_polymarket_markets(
+                event_id=polymarket_id, max_age=METADATA_MAX_AGE
+            )
         
         results.append({
             "kalshi_event": pair["kalshi_event"],
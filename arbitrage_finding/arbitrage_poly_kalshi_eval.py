@@ -9,26 +9,26 @@ from typing import Any, Dict, List, Optional
 try:
     # When imported as part of the arbitrage_finding package
     from .arbitrage_poly_kalshi import CROSS_PLATFORM_CANDIDATES_CSV
-    from tools.kalshi_events import (
-        _load_events_and_embeddings as load_kalshi_events_and_embeddings,
-    )
+    from tools.event_lookup import IdentifierIndex
+    from tools.kalshi_events import get_identifier_index as get_kalshi_identifier_index
     from tools.kalshi_markets import get_markets_for_event as get_kalshi_markets
-    from tools.polymarket import (
-        _load_events_and_embeddings as load_polymarket_events_and_embeddings,
-    )
+    from tools.kalshi_markets import get_markets_for_events as get_kalshi_markets_for_events
+    from tools.polymarket import get_identifier_index as get_polymarket_identifier_index
     from tools.polymarket import get_markets_for_event as get_polymarket_markets
+    from tools.http_cache import METADATA_MAX_AGE
+    from tools.market_cache import MARKET_METADATA
 except ImportError:
     # When running directly, add parent directory to path and import via package name
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from arbitrage_finding.arbitrage_poly_kalshi import CROSS_PLATFORM_CANDIDATES_CSV
-    from tools.kalshi_events import (
-        _load_events_and_embeddings as load_kalshi_events_and_embeddings,
-    )
+    from tools.event_lookup import IdentifierIndex
+    from tools.kalshi_events import get_identifier_index as get_kalshi_identifier_index
     from tools.kalshi_markets import get_markets_for_event as get_kalshi_markets
-    from tools.polymarket import (
-        _load_events_and_embeddings as load_polymarket_events_and_embeddings,
-    )
+    from tools.kalshi_markets import get_markets_for_events as get_kalshi_markets_for_events
+    from tools.polymarket import get_identifier_index as get_polymarket_identifier_index
     from tools.polymarket import get_markets_for_event as get_polymarket_markets
+    from tools.http_cache import METADATA_MAX_AGE
+    from tools.market_cache import MARKET_METADATA
 
 
 # Keys that clearly encode prices / order-book information and should
@@ -97,34 +97,6 @@ def _sanitize_payload(obj: Any) -> Any:
     return obj
 
 
-def _build_event_indexes() -> Dict[str, Dict[str, Any]]:
-    """Build lookup maps for Kalshi and Polymarket events.
-
-    Returns a dict with two keys:
-    - "kalshi_by_ticker": {ticker -> event_dict}
-    - "polymarket_by_id": {str(id/slug/ticker) -> event_dict}
-    """
-    kalshi_events, _ = load_kalshi_events_and_embeddings()
-    poly_events, _ = load_polymarket_events_and_embeddings()
-
-    kalshi_by_ticker: Dict[str, Dict[str, Any]] = {}
-    for ev in kalshi_events:
-        ticker = ev.get("event_ticker") or ev.get("series_ticker")
-        if ticker:
-            kalshi_by_ticker[ticker] = ev
-
-    polymarket_by_id: Dict[str, Dict[str, Any]] = {}
-    for ev in poly_events:
-        event_id = ev.get("id") or ev.get("ticker") or ev.get("slug")
-        if event_id:
-            polymarket_by_id[str(event_id)] = ev
-
-    return {
-        "kalshi_by_ticker": kalshi_by_ticker,
-        "polymarket_by_id": polymarket_by_id,
-    }
-
-
 def load_cross_platform_candidates(
     csv_path: Optional[str] = None,
     min_similarity: float = 0.0,
@@ -169,35 +141,48 @@ def load_cross_platform_candidates(
 
 def build_event_pair_payload(
     candidate: Dict[str, Any],
-    kalshi_by_ticker: Dict[str, Dict[str, Any]],
-    polymarket_by_id: Dict[str, Dict[str, Any]],
+    kalshi_index: IdentifierIndex,
+    polymarket_index: IdentifierIndex,
+    kalshi_markets_by_event: Optional[Dict[str, List[Dict[str, Any]]]] = None,
 ) -> Dict[str, Any]:
-    """For a single CSV candidate, load the corresponding events and markets."""
+    """For a single CSV candidate, load the corresponding events and markets.
+
+    Events are resolved through the venues' shared identifier indexes
+    (ticker / id / slug -> event, O(1)).
+    `kalshi_markets_by_event` (from get_markets_for_events) is used when it
+    covers the candidate's Kalshi ticker; otherwise markets are fetched here.
+    """
     kalshi_ticker = candidate.get("kalshi_ticker")
     poly_id = candidate.get("polymarket_id")
 
-    kalshi_event = kalshi_by_ticker.get(kalshi_ticker or "")
-    poly_event = polymarket_by_id.get(str(poly_id) if poly_id is not None else "")
+    kalshi_event = kalshi_index.get_one(kalshi_ticker) if kalshi_ticker else None
+    poly_event = polymarket_index.get_one(poly_id) if poly_id not in (None, "") else None
 
     kalshi_markets: List[Dict[str, Any]] = []
     poly_markets: List[Dict[str, Any]] = []
 
-    if kalshi_ticker:
+    if kalshi_markets_by_event is not None and kalshi_ticker in kalshi_markets_by_event:
+        kalshi_markets = kalshi_markets_by_event[kalshi_ticker]
+    elif kalshi_ticker:
         try:
-            kalshi_markets = get_kalshi_markets(kalshi_ticker)
+            kalshi_markets = get_kalshi_markets(kalshi_ticker, fields=MARKET_METADATA)
         except Exception as e:  # pragma: no cover - defensive
             print(f"Error fetching Kalshi markets for {kalshi_ticker}: {e}")
 
     if poly_event is not None:
         try:
-            poly_markets = get_polymarket_markets(event_dict=poly_event)
+            poly_markets = get_polymarket_markets(event_dict=poly_event, fields=MARKET_METADATA)
         except Exception as e:  # pragma: no cover - defensive
             print(f"Error fetching Polymarket markets by event_dict for {poly_id}: {e}")
 
     # Fallback: try fetching by ID if none came back from the event dict
     if not poly_markets and poly_id is not None:
         try:
-            poly_markets = get_polymarket_markets(event_id=str(poly_id))
+            poly_markets = get_polymarket_markets(
+                event_id=str(poly_id),
+                max_age=METADATA_MAX_AGE,
+                fields=MARKET_METADATA,
+            )
         except Exception as e:  # pragma: no cover - defensive
             print(f"Error fetching Polymarket markets by ID for {poly_id}: {e}")
 
@@ -507,13 +492,22 @@ def build_prompts_for_top_candidates(
     if not candidates:
         return []
 
-    idxs = _build_event_indexes()
-    kalshi_by_ticker = idxs["kalshi_by_ticker"]
-    poly_by_id = idxs["polymarket_by_id"]
+    kalshi_index = get_kalshi_identifier_index()
+    polymarket_index = get_polymarket_identifier_index()
+
+    # Kalshi markets for every candidate up front: one bulk sweep, or
+    # rate-limited concurrent requests for small batches. Prompts carry no
+    # prices, so the long-lived metadata cache is good enough.
+    kalshi_markets_by_event = get_kalshi_markets_for_events(
+        (cand.get("kalshi_ticker") for cand in candidates),
+        fields=MARKET_METADATA,
+    )
 
     results: List[Dict[str, Any]] = []
     for cand in candidates:
-        pair_payload = build_event_pair_payload(cand, kalshi_by_ticker, poly_by_id)
+        pair_payload = build_event_pair_payload(
+            cand, kalshi_index, polymarket_index, kalshi_markets_by_event
+        )
         prompt = build_structured_prompt_for_pair(pair_payload)
         results.append(
             {
@@ -13,19 +13,47 @@ import pandas as pd
 import sys
 import math
 import json
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Tuple
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from tools.kalshi_markets import get_markets_for_event as get_kalshi_markets
+from tools.kalshi_markets import get_markets_for_events as get_kalshi_markets_for_events
+from tools.kalshi_markets import MARKET_CACHE as KALSHI_MARKET_CACHE
 from tools.polymarket import get_markets_for_event as get_polymarket_markets
+from tools.polymarket import MARKET_CACHE as POLYMARKET_MARKET_CACHE
+from tools.kalshi_stream import KalshiQuoteStream, overlay_quotes as overlay_kalshi_quotes
+from tools.market_cache import MARKET_METADATA, QUOTE_SOURCE, RECEIVED_AT, quote_age
+from tools.polymarket_stream import PolymarketBookStream, overlay_quotes as overlay_polymarket_quotes
+from tools.tick_recorder import TickRecorder
+from tools.orderbook_depth import DepthBook, fetch_kalshi_depth, fetch_polymarket_depth, paired_fill
 
 # Trading fee rate for Kalshi (7% = 0.07)
 # Note: Polymarket has NO trading fees
 KALSHI_FEE_RATE = 0.07
 
+# Stream Kalshi top of book over WebSocket for the matched markets instead of
+# relying on REST snapshots (requires Kalshi API credentials)
+STREAM_KALSHI_QUOTES = False
+# Stream Polymarket CLOB books for the matched markets instead of using the
+# bestBid/bestAsk snapshot embedded in Gamma payloads
+STREAM_POLYMARKET_BOOKS = False
+# Seconds to let the stream deliver initial snapshots before checking
+STREAM_WARMUP_SECONDS = 2.0
+# Append every observed quote (REST and streamed) to data/ticks/ for later
+# study of spread persistence
+RECORD_TICKS = True
+# Fetch order book depth for the markets behind each opportunity and report
+# how many contracts can actually be executed at a profit
+FETCH_DEPTH = True
+# Quotes older than this many seconds (since receipt) are re-fetched once; a
+# matched pair whose quotes are still too old is skipped rather than priced
+# on a phantom spread. None disables the check.
+MAX_QUOTE_AGE_SECONDS = 10.0
+
 
 def calculate_kalshi_trading_fee(price, contracts=1):
     """
@@ -53,6 +81,24 @@ def calculate_kalshi_trading_fee(price, contracts=1):
     return math.ceil(fee * 100) / 100.0
 
 
+def calculate_kalshi_order_fee(fills):
+    """
+    Kalshi fee for one order that fills across several price levels.
+    
+    The fee is rounded up to the cent once per order, not per contract:
+    fees = round_up(sum of 0.07 x C x P x (1-P) over the fills)
+    
+    Args:
+        fills: List of (price in dollars, contracts) filled at that price
+    
+    Returns:
+        Fee in dollars
+    """
+    fee = sum(KALSHI_FEE_RATE * contracts * price * (1 - price) for price, contracts in fills if 0 < price < 1)
+    # Round before ceil so float noise (e.g. 1.7500000001 cents) is not charged
+    return math.ceil(round(fee * 100, 6)) / 100.0
+
+
 def get_polymarket_prices(market):
     """
     Extract YES and NO prices from a Polymarket market.
@@ -120,6 +166,153 @@ def get_kalshi_prices(market):
         return None, None
 
 
+def record_market_ticks(
+    recorder: TickRecorder,
+    kalshi_markets: List[Dict[str, Any]],
+    polymarket_markets: List[Dict[str, Any]],
+    recorded: Optional[Set[Tuple[str, str, float]]] = None
+) -> None:
+    """
+    Record the YES bid/ask of every fetched market (Kalshi cents converted to
+    dollars) as ticks.
+
+    `recorded` holds the (venue, market id, receive time) of ticks already
+    written: the same REST batch reaches here once per event pair that
+    shares it (and again from the market caches), and is recorded only once.
+    """
+    def is_new(venue: str, market: Dict[str, Any], market_id: Any) -> bool:
+        received_at = market.get(RECEIVED_AT)
+        if recorded is None or received_at is None:
+            return True
+        key = (venue, str(market_id), received_at)
+        if key in recorded:
+            return False
+        recorded.add(key)
+        return True
+
+    for market in kalshi_markets:
+        if not is_new('kalshi', market, market.get('ticker')):
+            continue
+        yes_bid, yes_ask = market.get('yes_bid'), market.get('yes_ask')
+        recorder.record(
+            'kalshi',
+            market.get('ticker'),
+            yes_bid / 100.0 if yes_bid is not None else None,
+            yes_ask / 100.0 if yes_ask is not None else None,
+            received_at=market.get(RECEIVED_AT),
+        )
+    for market in polymarket_markets:
+        if not is_new('polymarket', market, market.get('id')):
+            continue
+        try:
+            recorder.record(
+                'polymarket', market.get('id'), market.get('bestBid'), market.get('bestAsk'),
+                received_at=market.get(RECEIVED_AT),
+            )
+        except (ValueError, TypeError):
+            continue
+
+
+def add_executable_size(
+    opportunities: List[Dict[str, Any]],
+    kalshi_books: Dict[str, DepthBook],
+    polymarket_books: Dict[str, DepthBook]
+) -> None:
+    """
+    Add executable size to each opportunity (in place).
+
+    Walks both legs' ask ladders (Polymarket YES/NO, Kalshi NO/YES per the
+    strategy) and keeps buying pairs while each step adds profit, with the
+    Kalshi fee charged once on the whole Kalshi leg. Sets:
+    - executable_contracts: contracts per leg
+    - executable_cost: total cost in dollars, including fees
+    - executable_profit: guaranteed profit in dollars
+    All three are None when either book could not be fetched.
+    """
+    for opp in opportunities:
+        kalshi_book = kalshi_books.get(opp['kalshi_market_ticker'])
+        poly_book = polymarket_books.get(str(opp['poly_market_id']))
+        if kalshi_book is None or poly_book is None:
+            opp['executable_contracts'] = opp['executable_cost'] = opp['executable_profit'] = None
+            continue
+        if 'poly_yes_price' in opp:
+            poly_asks, kalshi_asks = poly_book.yes_asks, kalshi_book.no_asks
+        else:
+            poly_asks, kalshi_asks = poly_book.no_asks, kalshi_book.yes_asks
+        contracts, cost = paired_fill(poly_asks, kalshi_asks, fee_b=calculate_kalshi_order_fee)
+        opp['executable_contracts'] = contracts
+        opp['executable_cost'] = cost
+        opp['executable_profit'] = contracts - cost
+
+
+def fetch_pair_markets(
+    kalshi_ticker: str,
+    polymarket_id: Any,
+    kalshi_prefetched: Optional[List[Dict[str, Any]]],
+    kalshi_stream: Optional[KalshiQuoteStream],
+    polymarket_stream: Optional[PolymarketBookStream],
+    recorder: Optional[TickRecorder],
+    recorded_ticks: Optional[Set[Tuple[str, str, float]]] = None
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Get all open markets of a Kalshi / Polymarket event pair.
+
+    Kalshi markets come from `kalshi_prefetched` when given, otherwise from
+    the API. REST quotes not yet in `recorded_ticks` are recorded as ticks,
+    then replaced by streamed quotes wherever a connected stream covers the
+    market (or has a newer quote while it is down).
+    """
+    try:
+        kalshi_markets = kalshi_prefetched
+        if kalshi_markets is None:
+            kalshi_markets = get_kalshi_markets(kalshi_ticker)
+    except Exception as e:
+        print(f"Error fetching Kalshi markets: {e}")
+        kalshi_markets = []
+    
+    try:
+        polymarket_markets = get_polymarket_markets(event_id=str(polymarket_id))
+    except Exception as e:
+        print(f"Error fetching Polymarket markets: {e}")
+        polymarket_markets = []
+    if recorder is not None:
+        # Streamed quotes are recorded as they arrive, so only REST here
+        record_market_ticks(recorder, kalshi_markets, polymarket_markets, recorded_ticks)
+    if kalshi_stream is not None:
+        kalshi_markets = overlay_kalshi_quotes(kalshi_markets, kalshi_stream)
+    if polymarket_stream is not None:
+        polymarket_markets = overlay_polymarket_quotes(polymarket_markets, polymarket_stream)
+    return kalshi_markets, polymarket_markets
+
+
+def is_stale(market: Dict[str, Any], max_age: float, now: Optional[float] = None) -> bool:
+    """True if the market's quotes are older than max_age seconds, or undated."""
+    age = quote_age(market, now)
+    return age is None or age > max_age
+
+
+def _format_age(age: Optional[float]) -> str:
+    return f"{age:.1f}s" if age is not None else "unknown"
+
+
+def has_stale_quotes(
+    kalshi_markets: List[Dict[str, Any]],
+    polymarket_markets: List[Dict[str, Any]],
+    matched_pairs: List[Dict[str, Any]],
+    max_age: float
+) -> bool:
+    """True if any market in the matched pairs has quotes older than max_age seconds."""
+    now = time.time()
+    for pair in matched_pairs:
+        kalshi_market = find_market_by_ticker(kalshi_markets, pair.get('kalshi_market_ticker'))
+        polymarket_id = pair.get('polymarket_market_id') or pair.get('polymarket_id') or pair.get('poly_market_id')
+        poly_market = find_market_by_id(polymarket_markets, polymarket_id) if polymarket_id else None
+        for market in (kalshi_market, poly_market):
+            if market is not None and is_stale(market, max_age, now):
+                return True
+    return False
+
+
 def parse_matched_market_pairs(matched_pairs_json: str) -> List[Dict[str, Any]]:
     """
     Parse the matched_market_pairs_json string into a list of matched pairs.
@@ -182,7 +375,8 @@ def find_market_by_id(markets: List[Dict[str, Any]], market_id: Any) -> Optional
 def check_arbitrage_opportunity(
     kalshi_markets: List[Dict[str, Any]],
     polymarket_markets: List[Dict[str, Any]],
-    matched_pairs: List[Dict[str, Any]]
+    matched_pairs: List[Dict[str, Any]],
+    max_quote_age: Optional[float] = None
 ) -> List[Dict[str, Any]]:
     """
     Check for arbitrage opportunities between matched Kalshi and Polymarket markets.
@@ -202,9 +396,12 @@ def check_arbitrage_opportunity(
         kalshi_markets: List of all Kalshi markets for the event
         polymarket_markets: List of all Polymarket markets for the event
         matched_pairs: List of matched market pairs from JSON (each with kalshi_market_ticker and polymarket_market_id)
+        max_quote_age: Skip pairs where either market's quotes are older than this
+                       many seconds (or undated); None checks every pair
     
     Returns:
-        List of arbitrage opportunities with details.
+        List of arbitrage opportunities with details, including each leg's
+        quote age (seconds, None if unknown) and source.
     """
     opportunities = []
     
@@ -244,6 +441,22 @@ def check_arbitrage_opportunity(
         print(f"    ✓ Found Kalshi market: {kalshi_market.get('ticker')} - {kalshi_market.get('title', 'N/A')[:50]}")
         print(f"    ✓ Found Polymarket market: {poly_market.get('id')} - {poly_market.get('question', 'N/A')[:50]}")
         
+        # Refuse to price phantom spreads from old quotes
+        now = time.time()
+        kalshi_age = quote_age(kalshi_market, now)
+        poly_age = quote_age(poly_market, now)
+        if max_quote_age is not None and (
+            is_stale(kalshi_market, max_quote_age, now) or is_stale(poly_market, max_quote_age, now)
+        ):
+            print(f"    ⚠️  Stale quotes (Kalshi age: {_format_age(kalshi_age)}, Polymarket age: {_format_age(poly_age)}), skipping")
+            continue
+        quote_info = {
+            'kalshi_quote_age': kalshi_age,
+            'kalshi_quote_source': kalshi_market.get(QUOTE_SOURCE),
+            'poly_quote_age': poly_age,
+            'poly_quote_source': poly_market.get(QUOTE_SOURCE),
+        }
+        
         # Extract prices
         poly_yes, poly_no = get_polymarket_prices(poly_market)
         kalshi_yes, kalshi_no = get_kalshi_prices(kalshi_market)
@@ -289,7 +502,8 @@ def check_arbitrage_opportunity(
                 'total_cost': combo1_total_cost,
                 'total_fees': poly_yes_fee + kalshi_no_fee,  # Only Kalshi fees
                 'profit': combo1_profit,
-                'profit_pct': combo1_profit * 100
+                'profit_pct': combo1_profit * 100,
+                **quote_info
             })
         
         if combo2_profit > 0:
@@ -308,7 +522,8 @@ def check_arbitrage_opportunity(
                 'total_cost': combo2_total_cost,
                 'total_fees': poly_no_fee + kalshi_yes_fee,  # Only Kalshi fees
                 'profit': combo2_profit,
-                'profit_pct': combo2_profit * 100
+                'profit_pct': combo2_profit * 100,
+                **quote_info
             })
         
         if not pair_has_opportunity:
@@ -335,8 +550,52 @@ def main():
     print(f"Found {len(arbitrage_possible)} event pairs with potential arbitrage")
     print(f"\nColumns: {arbitrage_possible.columns.tolist()}\n")
     
+    # Fetch live Kalshi markets for every pair up front: one bulk sweep, or
+    # rate-limited concurrent requests for small batches.
+    kalshi_markets_by_event = get_kalshi_markets_for_events(
+        arbitrage_possible["kalshi_ticker"].dropna().astype(str)
+    )
+
+    recorder = TickRecorder(str(Path(__file__).parent.parent / "data" / "ticks")) if RECORD_TICKS else None
+    # (venue, market id, receive time) of REST quotes already recorded
+    recorded_ticks: Set[Tuple[str, str, float]] = set()
+
+    kalshi_stream = None
+    if STREAM_KALSHI_QUOTES:
+        watchlist = [
+            pair.get('kalshi_market_ticker')
+            for matched_json in arbitrage_possible.get('matched_market_pairs_json', [])
+            for pair in parse_matched_market_pairs(matched_json)
+        ]
+        kalshi_stream = KalshiQuoteStream(watchlist)
+        if recorder is not None:
+            kalshi_stream.book.subscribe(recorder.record_quote)
+        kalshi_stream.start()
+        if kalshi_stream.wait_connected(10):
+            time.sleep(STREAM_WARMUP_SECONDS)
+        print(f"Streaming Kalshi quotes for {len(kalshi_stream.market_tickers)} markets ({len(kalshi_stream.book)} received)")
+
+    polymarket_stream = None
+    if STREAM_POLYMARKET_BOOKS:
+        # Token ids are static metadata, so the long-lived market cache is fine here
+        watched_markets = []
+        for polymarket_id in arbitrage_possible['polymarket_id'].dropna().astype(str).unique():
+            try:
+                watched_markets.extend(get_polymarket_markets(event_id=polymarket_id, fields=MARKET_METADATA))
+            except Exception as e:
+                print(f"Error fetching Polymarket markets for {polymarket_id}: {e}")
+        polymarket_stream = PolymarketBookStream(watched_markets)
+        if recorder is not None:
+            polymarket_stream.book.subscribe(recorder.record_quote)
+        polymarket_stream.start()
+        if polymarket_stream.wait_connected(10):
+            time.sleep(STREAM_WARMUP_SECONDS)
+        print(f"Streaming Polymarket books for {len(polymarket_stream.asset_ids)} tokens ({len(polymarket_stream.book)} markets received)")
+
     # Process each event pair and check for arbitrage
     all_opportunities = []
+    # Polymarket markets behind opportunities, for the depth fetch
+    opportunity_polymarket_markets: Dict[str, Dict[str, Any]] = {}
 
     for idx, row in arbitrage_possible.iterrows():
         kalshi_ticker = row.get('kalshi_ticker')
@@ -357,23 +616,27 @@ def main():
             print("⚠️  No matched market pairs found, skipping this event pair")
             continue
         
-        # Get all Kalshi markets for the event (needed to find specific matched markets)
-        try:
-            kalshi_markets = get_kalshi_markets(kalshi_ticker)
-        except Exception as e:
-            print(f"Error fetching Kalshi markets: {e}")
-            kalshi_markets = []
-        
-        # Get all Polymarket markets for the event (needed to find specific matched markets)
-        try:
-            polymarket_markets = get_polymarket_markets(event_id=str(polymarket_id))
-        except Exception as e:
-            print(f"Error fetching Polymarket markets: {e}")
-            polymarket_markets = []
+        # Get all markets of both events (needed to find specific matched markets)
+        kalshi_markets, polymarket_markets = fetch_pair_markets(
+            kalshi_ticker, polymarket_id, kalshi_markets_by_event.get(str(kalshi_ticker)),
+            kalshi_stream, polymarket_stream, recorder, recorded_ticks
+        )
+        # The up-front Kalshi fetch ages while earlier pairs are processed
+        if MAX_QUOTE_AGE_SECONDS is not None and has_stale_quotes(
+            kalshi_markets, polymarket_markets, matched_pairs, MAX_QUOTE_AGE_SECONDS
+        ):
+            print(f"⚠️  Matched quotes older than {MAX_QUOTE_AGE_SECONDS}s, re-fetching")
+            KALSHI_MARKET_CACHE.invalidate(str(kalshi_ticker))
+            POLYMARKET_MARKET_CACHE.invalidate(str(polymarket_id))
+            kalshi_markets, polymarket_markets = fetch_pair_markets(
+                kalshi_ticker, polymarket_id, None, kalshi_stream, polymarket_stream, recorder, recorded_ticks
+            )
         
         # Check for arbitrage opportunities only for matched pairs
         if kalshi_markets and polymarket_markets:
-            opportunities = check_arbitrage_opportunity(kalshi_markets, polymarket_markets, matched_pairs)
+            opportunities = check_arbitrage_opportunity(
+                kalshi_markets, polymarket_markets, matched_pairs, max_quote_age=MAX_QUOTE_AGE_SECONDS
+            )
         
             if opportunities:
                 print(f"✅ Found {len(opportunities)} arbitrage opportunity(ies) across {len(matched_pairs)} matched pair(s)!")
@@ -381,11 +644,28 @@ def main():
                     opp['kalshi_event_ticker'] = kalshi_ticker
                     opp['polymarket_event_id'] = polymarket_id
                     all_opportunities.append(opp)
+                    poly_market = find_market_by_id(polymarket_markets, opp['poly_market_id'])
+                    if poly_market is not None:
+                        opportunity_polymarket_markets[str(opp['poly_market_id'])] = poly_market
             else:
                 print(f"❌ No arbitrage opportunities found for {len(matched_pairs)} matched pair(s)")
         else:
             print("⚠️  Missing market data, skipping")
     
+    if kalshi_stream is not None:
+        kalshi_stream.stop()
+    if polymarket_stream is not None:
+        polymarket_stream.stop()
+    if FETCH_DEPTH and all_opportunities:
+        kalshi_books = fetch_kalshi_depth(opp['kalshi_market_ticker'] for opp in all_opportunities)
+        polymarket_books = fetch_polymarket_depth(opportunity_polymarket_markets.values())
+        print(f"\nFetched order books for {len(kalshi_books)} Kalshi and {len(polymarket_books)} Polymarket markets")
+        add_executable_size(all_opportunities, kalshi_books, polymarket_books)
+
+    if recorder is not None:
+        recorder.close()
+        print(f"Recorded {recorder.recorded} quote ticks to {recorder.directory} ({recorder.dropped} dropped)")
+
     # Display all arbitrage opportunities found
     if all_opportunities:
         print(f"\n{'='*80}")
@@ -420,6 +700,13 @@ def main():
             print(f"  Profit: {row['profit_pct']:.2f}% (${row['profit']:.4f} per $1)")
             print(f"  Total Cost: ${row['total_cost']:.4f} (including fees)")
             print(f"  Total Fees: ${row['total_fees']:.4f}")
+            kalshi_age = row['kalshi_quote_age'] if pd.notna(row['kalshi_quote_age']) else None
+            poly_age = row['poly_quote_age'] if pd.notna(row['poly_quote_age']) else None
+            print(f"  Quote Age: Kalshi {_format_age(kalshi_age)} ({row['kalshi_quote_source']}), "
+                  f"Polymarket {_format_age(poly_age)} ({row['poly_quote_source']})")
+            if 'executable_contracts' in row and pd.notna(row['executable_contracts']):
+                print(f"  Executable Size: {row['executable_contracts']:.0f} contracts per leg "
+                      f"(cost ${row['executable_cost']:.2f}, profit ${row['executable_profit']:.2f})")
             print(f"  Kalshi Event: {row['kalshi_event_ticker']}")
             print(f"  Kalshi Market: {row['kalshi_market_ticker']}")
             print(f"  Kalshi Market Title: {row['kalshi_market_title']}")
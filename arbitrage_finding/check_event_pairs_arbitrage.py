@@ -10,6 +10,14 @@ import dotenv
 import pandas as pd
 from google import genai
 
+# Handle both package import and direct execution
+try:
+    from tools.http_fixtures import genai_http_options
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.http_fixtures import genai_http_options
+
 # Load environment variables (same pattern as tools/emb.py)
 dotenv.load_dotenv()
 
@@ -31,6 +39,8 @@ def _get_llm_client() -> genai.Client:
             vertexai=os.getenv("GOOGLE_GENAI_USE_VERTEXAI"),
             project=os.getenv("GOOGLE_GENAI_PROJECT"),
             location=os.getenv("GOOGLE_GENAI_LOCATION"),
+            # Record / replay mode (HTTP_FIXTURES_MODE), else None
+            http_options=genai_http_options(),
         )
     return _LLM_CLIENT
 
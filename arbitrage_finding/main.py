@@ -2,6 +2,7 @@ from typing import Optional
 
 from tools.kalshi_events import ensure_events_index_on_disk as ensure_kalshi_index
 from tools.polymarket import ensure_events_index_on_disk as ensure_poly_index
+from tools.related_events import ensure_related_graphs_on_disk
 
 from arbitrage_finding.arbitrage_poly_kalshi import (
     CROSS_PLATFORM_CANDIDATES_CSV,
@@ -21,6 +22,8 @@ from arbitrage_finding.check_event_pairs_arbitrage import run_arbitrage_checks
 TOP_K_EVENTS = 10
 MIN_EVENT_SIMILARITY = 0.7
 EXCLUDE_EXACT_DUPLICATES = False
+# Bring an existing Polymarket index up to date (new events only) each run
+REFRESH_POLYMARKET_INDEX = True
 
 PROMPT_MIN_SIMILARITY = 0.7
 PROMPT_MAX_PAIRS = 10
@@ -43,11 +46,13 @@ def run_full_arbitrage_pipeline(
     llm_model: str = "gemini-2.5-pro",
     llm_max_rows: Optional[int] = None,
     llm_sleep_seconds: float = 0.0,
+    refresh_polymarket_index: bool = True,
 ) -> None:
     """
     End-to-end arbitrage pipeline:
 
-    1. Ensure Kalshi & Polymarket event indices exist on disk.
+    1. Ensure Kalshi & Polymarket event indices (and related-events graphs) exist on disk;
+       an existing Polymarket index is refreshed incrementally if requested.
     2. Run cross-platform similarity search and fetch markets (arbitrage_poly_kalshi).
        - Also writes all cross-platform candidates to CSV.
     3. Build LLM-ready prompts for the top candidates and save to CSV.
@@ -58,7 +63,8 @@ def run_full_arbitrage_pipeline(
     # -------------------------------------------------------------------------
     print("Step 0: Ensuring Kalshi & Polymarket indices exist on disk...", flush=True)
     ensure_kalshi_index()
-    ensure_poly_index()
+    ensure_poly_index(refresh=refresh_polymarket_index)
+    ensure_related_graphs_on_disk()
     print("  Indices ready.", flush=True)
 
     # -------------------------------------------------------------------------
@@ -131,6 +137,7 @@ def main() -> None:
         llm_model=LLM_MODEL,
         llm_max_rows=LLM_MAX_ROWS,
         llm_sleep_seconds=LLM_SLEEP_SECONDS,
+        refresh_polymarket_index=REFRESH_POLYMARKET_INDEX,
     )
 
 
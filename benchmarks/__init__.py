@@ -0,0 +1,5 @@
+"""Offline performance benchmarks for PulseTrader.
+
+Benchmarks in this package use synthetic data and local embeddings only,
+so they can run without network access or API credentials.
+"""
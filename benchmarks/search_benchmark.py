@@ -0,0 +1,282 @@
+"""
+Search benchmark over synthetic event catalogs.
+
+Measures, for each catalog size:
+- index load time (JSON from disk) and vector-index build time
+- peak traced memory and process max RSS after loading
+- query latency p50/p99 for search_open_events()
+- filtered-query latency p50/p99 (category filter)
+- batch-query throughput (queries/second, back to back)
+
+Everything runs offline: events and embeddings are generated from a fixed
+seed, and queries are embedded with a deterministic local hash embedding.
+Results are written as JSON so runs can be compared across commits.
+
+Run from the project root:
+    python -m benchmarks.search_benchmark
+"""
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Handle both package import and direct execution
+try:
+    from tools import kalshi_events
+    from tools.emb import set_embedding_backend
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools import kalshi_events
+    from tools.emb import set_embedding_backend
+
+
+# -----------------------------------------------------------------------------
+# Simple configuration: edit these constants to change behavior.
+# -----------------------------------------------------------------------------
+CATALOG_SIZES = (1_000, 10_000, 100_000, 500_000)
+# Real Gemini vectors have 3072 dims; a smaller dim keeps 500k-event JSON
+# catalogs manageable while exercising the same code paths.
+EMBED_DIM = 32
+NUM_TOPICS = 50
+NUM_QUERIES = 200
+BATCH_QUERIES = 1_000
+SEARCH_LIMIT = 10
+SEED = 1234
+OUTPUT_DIR = "data/benchmarks"
+
+_CATEGORIES = [
+    "Politics", "Economics", "Sports", "Crypto", "Climate and Weather",
+    "Financials", "Science and Technology", "World", "Entertainment", "Health",
+]
+_WORDS = [
+    "election", "inflation", "rate", "senate", "house", "bitcoin", "ethereum",
+    "temperature", "rain", "snow", "championship", "playoffs", "gdp", "jobs",
+    "unemployment", "fed", "tariff", "budget", "court", "ceasefire", "launch",
+    "earnings", "oscar", "box office", "pandemic", "vaccine", "mayor", "governor",
+]
+
+
+def _topic_centroids(dim: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centroids = rng.normal(size=(NUM_TOPICS, dim)).astype(np.float32)
+    return centroids / np.linalg.norm(centroids, axis=1, keepdims=True)
+
+
+def local_embed_texts(texts: List[str], dim: int = EMBED_DIM, seed: int = SEED) -> List[List[float]]:
+    """
+    Deterministic offline embedding: each text maps to a topic centroid (by
+    CRC32 of the text) plus text-seeded noise, so queries land near events.
+    """
+    centroids = _topic_centroids(dim, seed)
+    vectors: List[List[float]] = []
+    for text in texts:
+        h = zlib.crc32(text.encode("utf-8"))
+        rng = np.random.default_rng([seed, h])
+        vec = centroids[h % NUM_TOPICS] + 0.5 * rng.normal(size=dim).astype(np.float32)
+        vectors.append(vec.tolist())
+    return vectors
+
+
+def generate_catalog(
+    n_events: int,
+    dim: int = EMBED_DIM,
+    seed: int = SEED,
+) -> Tuple[List[Dict[str, Any]], Dict[str, List[float]]]:
+    """
+    Build a synthetic Kalshi-shaped catalog of `n_events` events and embeddings.
+    """
+    rng = np.random.default_rng([seed, n_events])
+    centroids = _topic_centroids(dim, seed)
+
+    topics = rng.integers(0, NUM_TOPICS, size=n_events)
+    noise = rng.normal(scale=0.5, size=(n_events, dim)).astype(np.float32)
+    vectors = np.round(centroids[topics] + noise, 5)
+    words = rng.integers(0, len(_WORDS), size=(n_events, 3))
+
+    events: List[Dict[str, Any]] = []
+    embeds: Dict[str, List[float]] = {}
+    for i in range(n_events):
+        series = f"KXSYN{int(topics[i]):03d}"
+        ticker = f"{series}-{i:07d}"
+        title = " ".join(_WORDS[w] for w in words[i])
+        events.append({
+            "event_ticker": ticker,
+            "series_ticker": series,
+            "title": f"Will {title} happen?",
+            "sub_title": f"Synthetic event {i}",
+            "category": _CATEGORIES[int(topics[i]) % len(_CATEGORIES)],
+            "mutually_exclusive": bool(i % 2),
+            "strike_date": None,
+            "markets": None,
+        })
+        embeds[ticker] = vectors[i].tolist()
+    return events, embeds
+
+
+def _percentiles_ms(samples: Sequence[float]) -> Dict[str, float]:
+    arr = np.asarray(samples, dtype=np.float64) * 1000.0
+    return {
+        "p50_ms": float(np.percentile(arr, 50)),
+        "p99_ms": float(np.percentile(arr, 99)),
+        "mean_ms": float(arr.mean()),
+    }
+
+
+def _reset_index_caches() -> None:
+    kalshi_events._EVENTS_CACHE = None
+    kalshi_events._EVENT_EMBEDS = None
+    kalshi_events._VECTOR_INDEX = None
+    kalshi_events._IDENTIFIER_INDEX = None
+
+
+def _queries(n: int, seed: int) -> List[str]:
+    rng = np.random.default_rng([seed, n, 7])
+    picks = rng.integers(0, len(_WORDS), size=(n, 2))
+    # Lower-case multi-word topics never take the identifier fast path.
+    return [f"{_WORDS[a]} {_WORDS[b]} outlook {i}" for i, (a, b) in enumerate(picks)]
+
+
+def benchmark_catalog(n_events: int, dim: int = EMBED_DIM, seed: int = SEED) -> Dict[str, Any]:
+    """Run every measurement for one catalog size and return the results dict."""
+    events, embeds = generate_catalog(n_events, dim=dim, seed=seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        events_path = os.path.join(tmp, "events.json")
+        embeds_path = os.path.join(tmp, "embeds.json")
+        kalshi_events.save_events_to_json(events, events_path)
+        with open(embeds_path, "w") as f:
+            json.dump(embeds, f)
+        del events, embeds
+        disk_bytes = os.path.getsize(events_path) + os.path.getsize(embeds_path)
+
+        _reset_index_caches()
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        kalshi_events._load_events_and_embeddings(events_path, embeds_path)
+        t1 = time.perf_counter()
+        kalshi_events.get_vector_index()
+        t2 = time.perf_counter()
+        _, peak_bytes = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    queries = _queries(NUM_QUERIES, seed)
+    search = kalshi_events.search_open_events
+
+    # Warm up (first call pays for lazy allocations)
+    search(queries[0], limit=SEARCH_LIMIT)
+
+    latencies: List[float] = []
+    for q in queries:
+        start = time.perf_counter()
+        search(q, limit=SEARCH_LIMIT)
+        latencies.append(time.perf_counter() - start)
+
+    filtered: List[float] = []
+    for i, q in enumerate(queries):
+        cats = [_CATEGORIES[i % len(_CATEGORIES)]]
+        start = time.perf_counter()
+        search(q, limit=SEARCH_LIMIT, categories=cats)
+        filtered.append(time.perf_counter() - start)
+
+    batch = _queries(BATCH_QUERIES, seed + 1)
+    start = time.perf_counter()
+    for q in batch:
+        search(q, limit=SEARCH_LIMIT)
+    batch_seconds = time.perf_counter() - start
+
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        maxrss *= 1024
+
+    _reset_index_caches()
+    return {
+        "n_events": n_events,
+        "embed_dim": dim,
+        "index_disk_bytes": disk_bytes,
+        "load_seconds": t1 - t0,
+        "index_build_seconds": t2 - t1,
+        "load_peak_traced_bytes": peak_bytes,
+        "process_max_rss_bytes": maxrss,
+        "query": _percentiles_ms(latencies),
+        "filtered_query": _percentiles_ms(filtered),
+        "batch_queries": BATCH_QUERIES,
+        "batch_seconds": batch_seconds,
+        "batch_queries_per_second": BATCH_QUERIES / batch_seconds if batch_seconds else None,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=str(Path(__file__).parent.parent),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_search_benchmark(
+    sizes: Sequence[int] = CATALOG_SIZES,
+    dim: int = EMBED_DIM,
+    seed: int = SEED,
+    output_dir: str = OUTPUT_DIR,
+) -> str:
+    """
+    Benchmark every catalog size and write the results JSON.
+
+    Returns the path of the written JSON file.
+    """
+    commit = _git_commit()
+    set_embedding_backend(lambda texts: local_embed_texts(texts, dim=dim, seed=seed))
+    try:
+        results = []
+        for n in sizes:
+            print(f"Benchmarking search over {n:,} synthetic events (dim={dim})...", flush=True)
+            r = benchmark_catalog(n, dim=dim, seed=seed)
+            print(
+                f"  load {r['load_seconds']:.3f}s + build {r['index_build_seconds']:.3f}s | "
+                f"query p50 {r['query']['p50_ms']:.2f}ms p99 {r['query']['p99_ms']:.2f}ms | "
+                f"filtered p50 {r['filtered_query']['p50_ms']:.2f}ms | "
+                f"{r['batch_queries_per_second']:.1f} q/s",
+                flush=True,
+            )
+            results.append(r)
+    finally:
+        set_embedding_backend(None)
+
+    report = {
+        "benchmark": "search",
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "seed": seed,
+        "results": results,
+    }
+
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"search_{commit}_{int(time.time())}.json")
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote benchmark results to {path}")
+    return path
+
+
+if __name__ == "__main__":
+    run_search_benchmark()
@@ -0,0 +1,641 @@
+"""
+Local stand-in for the Kalshi and Polymarket endpoints this project uses.
+
+Serves, from recorded index files or a synthetic catalog:
+- Kalshi REST:  GET /trade-api/v2/events, /trade-api/v2/markets,
+                /trade-api/v2/markets/{ticker}/orderbook
+- Kalshi WS:    /trade-api/ws/v2 (orderbook_delta + ticker channels)
+- Gamma REST:   GET /events (paged, closed / id filters), /events/{id or slug}
+- CLOB REST:    GET /book?token_id=..., POST /books
+- CLOB WS:      /ws/market (book + price_change events)
+
+REST responses carry ETags (and answer If-None-Match with 304), and can be
+slowed, failed (503) or throttled (429 + Retry-After) to exercise the
+clients' caching, retry and rate-limit paths. Gemini is not emulated; use
+tools.emb.set_embedding_backend() with a local embedding instead.
+
+Point the clients at it through environment variables (see
+VenueServer.client_env()), e.g.:
+
+    python -m benchmarks.venue_server
+    # then, in another shell, export the printed variables and run the pipeline
+
+Or in-process:
+
+    server = VenueServer(VenueData.synthetic()).start()
+    os.environ.update(server.client_env())   # before importing tools.*
+"""
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from websockets.exceptions import ConnectionClosed
+from websockets.sync.server import ServerConnection, serve
+
+# Handle both package import and direct execution
+try:
+    from tools.rate_limit import TokenBucket
+except ImportError:
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.rate_limit import TokenBucket
+
+
+# -----------------------------------------------------------------------------
+# Simple configuration: edit these constants to change behavior.
+# -----------------------------------------------------------------------------
+HOST = "127.0.0.1"
+HTTP_PORT = 8765
+WS_PORT = 8766
+NUM_KALSHI_EVENTS = 2_000
+NUM_POLYMARKET_EVENTS = 2_000
+MARKETS_PER_EVENT = 4
+# Added to every REST response: fixed latency plus uniform jitter, seconds
+LATENCY_SECONDS = 0.02
+LATENCY_JITTER_SECONDS = 0.01
+# Fraction of REST requests answered with 503
+ERROR_RATE = 0.0
+# REST requests/second before 429s (None = unlimited)
+RATE_LIMIT_PER_SECOND: Optional[float] = None
+# Book updates/second pushed to each WebSocket subscriber
+WS_UPDATES_PER_SECOND = 50.0
+SEED = 1234
+
+KALSHI_PREFIX = "/trade-api/v2"
+KALSHI_WS_PATH = "/trade-api/ws/v2"
+CLOB_WS_PATH = "/ws/market"
+
+_CATEGORIES = ["Politics", "Economics", "Sports", "Crypto", "World", "Financials"]
+_WORDS = ["election", "inflation", "rate", "senate", "bitcoin", "playoffs", "gdp", "tariff", "court", "launch"]
+
+
+# -----------------------------------------------------------------------------
+# Data
+# -----------------------------------------------------------------------------
+class VenueData:
+    """
+    Catalogs served by the stand-in: Kalshi events (with nested markets) and
+    Polymarket events (with nested markets), plus lookup maps.
+    """
+
+    def __init__(self, kalshi_events: List[Dict[str, Any]], polymarket_events: List[Dict[str, Any]]):
+        self.kalshi_events = kalshi_events
+        self.kalshi_markets: Dict[str, Dict[str, Any]] = {}
+        for ev in kalshi_events:
+            for m in ev.get("markets") or []:
+                self.kalshi_markets[m["ticker"]] = m
+
+        # Gamma pages are ordered by id, newest first
+        self.polymarket_events = sorted(
+            polymarket_events, key=lambda ev: int(ev.get("id") or 0), reverse=True
+        )
+        self.polymarket_by_key: Dict[str, Dict[str, Any]] = {}
+        self.polymarket_tokens: Dict[str, Tuple[Dict[str, Any], int]] = {}
+        for ev in self.polymarket_events:
+            for key in (ev.get("id"), ev.get("slug")):
+                if key:
+                    self.polymarket_by_key[str(key)] = ev
+            for m in ev.get("markets") or []:
+                for outcome, token in enumerate(_token_ids(m)):
+                    self.polymarket_tokens[token] = (m, outcome)
+
+    @classmethod
+    def synthetic(
+        cls,
+        n_kalshi: int = NUM_KALSHI_EVENTS,
+        n_polymarket: int = NUM_POLYMARKET_EVENTS,
+        markets_per_event: int = MARKETS_PER_EVENT,
+        seed: int = SEED,
+    ) -> "VenueData":
+        rng = random.Random(seed)
+        kalshi_events = []
+        for i in range(n_kalshi):
+            event_ticker = f"KXSYN{i}-26"
+            kalshi_events.append({
+                "event_ticker": event_ticker,
+                "series_ticker": f"KXSYN{i}",
+                "title": f"Will {rng.choice(_WORDS)} {rng.choice(_WORDS)} happen by 2026? ({i})",
+                "sub_title": "",
+                "category": rng.choice(_CATEGORIES),
+                "strike_date": "2026-12-31T00:00:00Z",
+                "markets": [
+                    _kalshi_market(f"{event_ticker}-M{j}", event_ticker, rng)
+                    for j in range(markets_per_event)
+                ],
+            })
+        polymarket_events = []
+        for i in range(n_polymarket):
+            event_id = str(100_000 + i)
+            polymarket_events.append({
+                "id": event_id,
+                "slug": f"synthetic-event-{i}",
+                "ticker": f"synthetic-event-{i}",
+                "title": f"{rng.choice(_WORDS).title()} {rng.choice(_WORDS)} in 2026? ({i})",
+                "description": "Synthetic event",
+                "category": rng.choice(_CATEGORIES),
+                "endDate": "2026-12-31T00:00:00Z",
+                "active": True,
+                "closed": False,
+                "archived": False,
+                "markets": [
+                    _polymarket_market(str(500_000 + i * 100 + j), rng)
+                    for j in range(markets_per_event)
+                ],
+            })
+        return cls(kalshi_events, polymarket_events)
+
+    @classmethod
+    def from_index_files(
+        cls,
+        kalshi_events_path: str = "data/open_events.json",
+        polymarket_events_path: str = "data/polymarket_open_events.json",
+        markets_per_event: int = MARKETS_PER_EVENT,
+        seed: int = SEED,
+    ) -> "VenueData":
+        """
+        Serve recorded catalogs (the files setup_events_index() writes).
+        Kalshi events recorded without nested markets get synthetic ones.
+        """
+        rng = random.Random(seed)
+        with open(kalshi_events_path) as f:
+            kalshi_events = json.load(f)
+        with open(polymarket_events_path) as f:
+            polymarket_events = json.load(f)
+        for ev in kalshi_events:
+            if not ev.get("markets"):
+                ticker = ev.get("event_ticker")
+                ev["markets"] = [
+                    _kalshi_market(f"{ticker}-M{j}", ticker, rng) for j in range(markets_per_event)
+                ]
+        return cls(kalshi_events, polymarket_events)
+
+
+def _kalshi_market(ticker: str, event_ticker: str, rng: random.Random) -> Dict[str, Any]:
+    yes_bid = rng.randint(2, 95)
+    yes_ask = min(99, yes_bid + rng.randint(1, 4))
+    return {
+        "ticker": ticker,
+        "event_ticker": event_ticker,
+        "title": f"Synthetic market {ticker}",
+        "status": "active",
+        "yes_bid": yes_bid,
+        "yes_ask": yes_ask,
+        "no_bid": 100 - yes_ask,
+        "no_ask": 100 - yes_bid,
+        "volume": rng.randint(0, 100_000),
+        "open_interest": rng.randint(0, 50_000),
+        "close_time": "2026-12-31T00:00:00Z",
+    }
+
+
+def _polymarket_market(market_id: str, rng: random.Random) -> Dict[str, Any]:
+    best_bid = rng.randint(2, 95) / 100.0
+    best_ask = min(0.99, round(best_bid + rng.randint(1, 4) / 100.0, 2))
+    return {
+        "id": market_id,
+        "question": f"Synthetic market {market_id}?",
+        "slug": f"synthetic-market-{market_id}",
+        "active": True,
+        "closed": False,
+        "bestBid": best_bid,
+        "bestAsk": best_ask,
+        "outcomes": json.dumps(["Yes", "No"]),
+        "outcomePrices": json.dumps([str(best_ask), str(round(1 - best_bid, 2))]),
+        "clobTokenIds": json.dumps([f"{market_id}1", f"{market_id}2"]),
+    }
+
+
+def _token_ids(market: Dict[str, Any]) -> List[str]:
+    tokens = market.get("clobTokenIds")
+    if isinstance(tokens, str):
+        tokens = json.loads(tokens)
+    return [str(t) for t in tokens or []]
+
+
+def kalshi_orderbook(market: Dict[str, Any], depth: int = 5) -> Dict[str, List[List[int]]]:
+    """
+    Resting bids (cents, contracts) around a Kalshi market's quoted bid/ask.
+    """
+    yes_bid, yes_ask = int(market.get("yes_bid") or 1), int(market.get("yes_ask") or 99)
+    seed = int(hashlib.md5(market["ticker"].encode()).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+    yes = [[p, rng.randint(10, 500)] for p in range(yes_bid, max(yes_bid - depth, 0), -1)]
+    best_no = 100 - yes_ask
+    no = [[p, rng.randint(10, 500)] for p in range(best_no, max(best_no - depth, 0), -1)]
+    return {"yes": sorted(yes), "no": sorted(no)}
+
+
+def clob_book(market: Dict[str, Any], outcome: int, depth: int = 5) -> Dict[str, List[Dict[str, str]]]:
+    """
+    CLOB levels for one outcome token of a Gamma market (NO mirrors YES).
+    """
+    best_bid = float(market.get("bestBid") or 0.01)
+    best_ask = float(market.get("bestAsk") or 0.99)
+    if outcome == 1:
+        best_bid, best_ask = round(1 - best_ask, 2), round(1 - best_bid, 2)
+    seed = int(hashlib.md5(f"{market['id']}:{outcome}".encode()).hexdigest()[:8], 16)
+    rng = random.Random(seed)
+    bids = [
+        {"price": f"{best_bid - k / 100:.2f}", "size": str(rng.randint(10, 2_000))}
+        for k in range(depth) if best_bid - k / 100 > 0
+    ]
+    asks = [
+        {"price": f"{best_ask + k / 100:.2f}", "size": str(rng.randint(10, 2_000))}
+        for k in range(depth) if best_ask + k / 100 < 1
+    ]
+    # The CLOB lists levels worst-first
+    return {"bids": bids[::-1], "asks": asks[::-1]}
+
+
+# -----------------------------------------------------------------------------
+# Server
+# -----------------------------------------------------------------------------
+class VenueServer:
+    """
+    HTTP + WebSocket stand-in for Kalshi and Polymarket, run on background
+    threads. Fault injection (latency, error rate, rate limit) applies to
+    REST requests.
+    """
+
+    def __init__(
+        self,
+        data: Optional[VenueData] = None,
+        host: str = HOST,
+        http_port: int = HTTP_PORT,
+        ws_port: int = WS_PORT,
+        latency: float = LATENCY_SECONDS,
+        latency_jitter: float = LATENCY_JITTER_SECONDS,
+        error_rate: float = ERROR_RATE,
+        rate_limit: Optional[float] = RATE_LIMIT_PER_SECOND,
+        ws_updates_per_second: float = WS_UPDATES_PER_SECOND,
+        seed: int = SEED,
+    ):
+        self.data = data if data is not None else VenueData.synthetic()
+        self.host = host
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.limiter = TokenBucket(rate_limit) if rate_limit else None
+        self.ws_updates_per_second = ws_updates_per_second
+        self.closed_event_ids: set = set()
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._stats: Dict[str, int] = {}
+        self._stats_lock = threading.Lock()
+
+        self._http = ThreadingHTTPServer((host, http_port), _make_handler(self))
+        self._http.daemon_threads = True
+        self._ws = serve(self._handle_ws, host, ws_port)
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def http_url(self) -> str:
+        return f"http://{self.host}:{self._http.server_address[1]}"
+
+    @property
+    def ws_url(self) -> str:
+        return f"ws://{self.host}:{self._ws.socket.getsockname()[1]}"
+
+    def client_env(self) -> Dict[str, str]:
+        """
+        Environment variables that point this project's clients here.
+        """
+        return {
+            "KALSHI_API_BASE": self.http_url + KALSHI_PREFIX,
+            "KALSHI_WS_URL": self.ws_url + KALSHI_WS_PATH,
+            "POLYMARKET_GAMMA_URL": self.http_url,
+            "POLYMARKET_CLOB_URL": self.http_url,
+            "POLYMARKET_CLOB_WS_URL": self.ws_url + CLOB_WS_PATH,
+        }
+
+    def start(self) -> "VenueServer":
+        for target in (self._http.serve_forever, self._ws.serve_forever):
+            thread = threading.Thread(target=target, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self) -> None:
+        self._http.shutdown()
+        self._http.server_close()
+        self._ws.shutdown()
+
+    def __enter__(self) -> "VenueServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] = self._stats.get(key, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        """Requests served per route, plus injected errors / throttles."""
+        with self._stats_lock:
+            return dict(self._stats)
+
+    def random(self) -> float:
+        with self._rng_lock:
+            return self._rng.random()
+
+    # --- REST routes ------------------------------------------------------
+    def route(self, method: str, path: str, query: Dict[str, List[str]], body: Any) -> Tuple[int, Any]:
+        def arg(name: str, default: Optional[str] = None) -> Optional[str]:
+            values = query.get(name)
+            return values[0] if values else default
+
+        if path.startswith(KALSHI_PREFIX):
+            sub = path[len(KALSHI_PREFIX):]
+            if sub == "/events":
+                return 200, self._kalshi_events(arg)
+            if sub == "/markets":
+                return 200, self._kalshi_markets(arg)
+            if sub.startswith("/markets/") and sub.endswith("/orderbook"):
+                ticker = unquote(sub[len("/markets/"):-len("/orderbook")])
+                market = self.data.kalshi_markets.get(ticker)
+                if market is None:
+                    return 404, {"error": {"code": "not_found", "message": ticker}}
+                return 200, {"orderbook": kalshi_orderbook(market, int(arg("depth") or 5))}
+        elif path == "/events":
+            return 200, self._gamma_events(query, arg)
+        elif path.startswith("/events/"):
+            ev = self.data.polymarket_by_key.get(unquote(path[len("/events/"):]))
+            if ev is None:
+                return 404, {"error": "not found"}
+            return 200, ev
+        elif path == "/book":
+            return self._clob_book(arg("token_id"))
+        elif path == "/books" and method == "POST":
+            books = []
+            for item in body or []:
+                status, book = self._clob_book(str(item.get("token_id")))
+                if status == 200:
+                    books.append(book)
+            return 200, books
+        return 404, {"error": f"no route for {method} {path}"}
+
+    def _kalshi_events(self, arg: Any) -> Dict[str, Any]:
+        limit = min(int(arg("limit") or 200), 200)
+        start = int(arg("cursor") or 0)
+        nested = arg("with_nested_markets") == "true"
+        page = self.data.kalshi_events[start:start + limit]
+        if not nested:
+            page = [{k: v for k, v in ev.items() if k != "markets"} for ev in page]
+        end = start + limit
+        return {"events": page, "cursor": str(end) if end < len(self.data.kalshi_events) else ""}
+
+    def _kalshi_markets(self, arg: Any) -> Dict[str, Any]:
+        limit = min(int(arg("limit") or 1000), 1000)
+        start = int(arg("cursor") or 0)
+        event_ticker = arg("event_ticker")
+        tickers = arg("tickers")
+        if tickers:
+            markets = [self.data.kalshi_markets[t] for t in tickers.split(",") if t in self.data.kalshi_markets]
+        elif event_ticker:
+            markets = [m for m in self.data.kalshi_markets.values() if m.get("event_ticker") == event_ticker]
+        else:
+            markets = list(self.data.kalshi_markets.values())
+        end = start + limit
+        return {"markets": markets[start:end], "cursor": str(end) if end < len(markets) else ""}
+
+    def _gamma_events(self, query: Dict[str, List[str]], arg: Any) -> List[Dict[str, Any]]:
+        closed = arg("closed")
+        events = self.data.polymarket_events
+        ids = query.get("id")
+        if ids:
+            wanted = set(ids)
+            events = [ev for ev in events if str(ev.get("id")) in wanted]
+        if closed == "true":
+            events = [dict(ev, closed=True) for ev in events if str(ev.get("id")) in self.closed_event_ids]
+        elif closed == "false":
+            events = [ev for ev in events if str(ev.get("id")) not in self.closed_event_ids]
+        offset = int(arg("offset") or 0)
+        limit = int(arg("limit") or 100)
+        return events[offset:offset + limit]
+
+    def _clob_book(self, token_id: Optional[str]) -> Tuple[int, Any]:
+        entry = self.data.polymarket_tokens.get(str(token_id))
+        if entry is None:
+            return 404, {"error": f"No orderbook exists for the requested token id {token_id}"}
+        market, outcome = entry
+        book = clob_book(market, outcome)
+        book.update({
+            "asset_id": str(token_id),
+            "market": market.get("conditionId", market["id"]),
+            "timestamp": str(int(time.time() * 1000)),
+        })
+        return 200, book
+
+    # --- WebSocket --------------------------------------------------------
+    def _handle_ws(self, ws: ServerConnection) -> None:
+        path = ws.request.path if ws.request is not None else ""
+        self.count(f"ws {path}")
+        try:
+            subscription = json.loads(ws.recv())
+            if path.startswith(KALSHI_WS_PATH):
+                self._stream_kalshi(ws, subscription)
+            elif path.startswith(CLOB_WS_PATH):
+                self._stream_clob(ws, subscription)
+        except (ConnectionClosed, ValueError):
+            return
+
+    def _tick_interval(self) -> float:
+        return 1.0 / self.ws_updates_per_second if self.ws_updates_per_second > 0 else 3600.0
+
+    def _stream_kalshi(self, ws: ServerConnection, subscription: Dict[str, Any]) -> None:
+        tickers = [
+            t for t in (subscription.get("params") or {}).get("market_tickers") or []
+            if t in self.data.kalshi_markets
+        ]
+        # One sid per channel, as Kalshi assigns them; only orderbook messages carry seq
+        sid, ticker_sid, seq = 1, 2, 0
+        books: Dict[str, Dict[str, Dict[int, int]]] = {}
+        for ticker in tickers:
+            seq += 1
+            book = kalshi_orderbook(self.data.kalshi_markets[ticker])
+            books[ticker] = {side: {p: q for p, q in book[side]} for side in ("yes", "no")}
+            ws.send(json.dumps({
+                "type": "orderbook_snapshot", "sid": sid, "seq": seq,
+                "msg": {"market_ticker": ticker, **book},
+            }))
+        if not tickers:
+            return
+        rng = random.Random(hash(tuple(tickers)))
+        while True:
+            time.sleep(self._tick_interval())
+            ticker = rng.choice(tickers)
+            side = rng.choice(("yes", "no"))
+            levels = books[ticker][side]
+            other = books[ticker]["no" if side == "yes" else "yes"]
+            if levels:
+                price = rng.choice(list(levels))
+            else:
+                # A new best bid must stay below the opposite side's implied ask
+                highest = 99 - max(other, default=0)
+                if highest < 1:
+                    continue
+                price = rng.randint(max(1, highest - 4), highest)
+            delta = rng.randint(-levels.get(price, 0), 200)
+            if delta == 0:
+                continue
+            levels[price] = levels.get(price, 0) + delta
+            if levels[price] <= 0:
+                del levels[price]
+            seq += 1
+            ws.send(json.dumps({
+                "type": "orderbook_delta", "sid": sid, "seq": seq,
+                "msg": {"market_ticker": ticker, "price": price, "delta": delta, "side": side},
+            }))
+            yes_bid, no_bid = max(books[ticker]["yes"], default=None), max(books[ticker]["no"], default=None)
+            ws.send(json.dumps({
+                "type": "ticker", "sid": ticker_sid,
+                "msg": {
+                    "market_ticker": ticker,
+                    "yes_bid": yes_bid,
+                    "yes_ask": 100 - no_bid if no_bid is not None else None,
+                    "ts": int(time.time()),
+                },
+            }))
+
+    def _stream_clob(self, ws: ServerConnection, subscription: Dict[str, Any]) -> None:
+        tokens = [
+            str(t) for t in subscription.get("assets_ids") or []
+            if str(t) in self.data.polymarket_tokens
+        ]
+        snapshots = []
+        # token -> side -> {price in cents: size}, to keep changes uncrossed
+        books: Dict[str, Dict[str, Dict[int, int]]] = {}
+        for token in tokens:
+            status, book = self._clob_book(token)
+            snapshots.append(dict(book, event_type="book"))
+            books[token] = {
+                side: {round(float(level["price"]) * 100): int(level["size"]) for level in book.get(key) or []}
+                for side, key in (("BUY", "bids"), ("SELL", "asks"))
+            }
+        if snapshots:
+            ws.send(json.dumps(snapshots))
+        if not tokens:
+            return
+        rng = random.Random(hash(tuple(tokens)))
+        while True:
+            time.sleep(self._tick_interval())
+            token = rng.choice(tokens)
+            side = rng.choice(("BUY", "SELL"))
+            levels = books[token][side]
+            other = books[token]["SELL" if side == "BUY" else "BUY"]
+            if levels and rng.random() < 0.7:
+                # Resize (or clear) an existing level
+                price = rng.choice(list(levels))
+            elif side == "BUY":
+                # New bids stay below the best ask, new asks above the best bid
+                highest = min(other, default=100) - 1
+                if highest < 1:
+                    continue
+                price = rng.randint(max(1, highest - 4), highest)
+            else:
+                lowest = max(other, default=0) + 1
+                if lowest > 99:
+                    continue
+                price = rng.randint(lowest, min(99, lowest + 4))
+            size = rng.choice((0, rng.randint(10, 2_000)))
+            if size:
+                levels[price] = size
+            else:
+                levels.pop(price, None)
+            ws.send(json.dumps({
+                "event_type": "price_change",
+                "market": self.data.polymarket_tokens[token][0]["id"],
+                "price_changes": [
+                    {"asset_id": token, "price": f"{price / 100:.2f}", "size": str(size), "side": side}
+                ],
+                "timestamp": str(int(time.time() * 1000)),
+            }))
+
+
+def _route_key(path: str) -> str:
+    # Collapse per-item paths so stats stay one counter per endpoint
+    if path.startswith(KALSHI_PREFIX + "/markets/"):
+        return KALSHI_PREFIX + "/markets/{ticker}/orderbook"
+    if path.startswith("/events/"):
+        return "/events/{id}"
+    return path
+
+
+def _make_handler(server: VenueServer) -> type:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+        def _respond(self, status: int, payload: Any, headers: Optional[Dict[str, str]] = None) -> None:
+            body = b"" if payload is None else json.dumps(payload).encode()
+            self.send_response(status)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            if payload is not None:
+                self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self, method: str) -> None:
+            parsed = urlparse(self.path)
+            server.count(f"{method} {_route_key(parsed.path)}")
+
+            body = None
+            length = int(self.headers.get("Content-Length") or 0)
+            if length:
+                body = json.loads(self.rfile.read(length))
+
+            delay = server.latency + server.latency_jitter * server.random()
+            if delay > 0:
+                time.sleep(delay)
+            if server.limiter is not None and not server.limiter.try_acquire():
+                server.count("throttled")
+                self._respond(429, {"error": "rate limited"}, {"Retry-After": "1"})
+                return
+            if server.error_rate and server.random() < server.error_rate:
+                server.count("errors")
+                self._respond(503, {"error": "injected failure"})
+                return
+
+            status, payload = server.route(method, parsed.path, parse_qs(parsed.query), body)
+            if status != 200:
+                self._respond(status, payload)
+                return
+            etag = '"' + hashlib.md5(json.dumps(payload, sort_keys=True).encode()).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                server.count("not_modified")
+                self._respond(304, None, {"ETag": etag})
+                return
+            self._respond(200, payload, {"ETag": etag})
+
+        def do_GET(self) -> None:
+            self._handle("GET")
+
+        def do_POST(self) -> None:
+            self._handle("POST")
+
+    return Handler
+
+
+if __name__ == "__main__":
+    server = VenueServer().start()
+    print(f"Venue stand-in on {server.http_url} (REST) and {server.ws_url} (WebSocket)")
+    print("Point the clients at it with:")
+    for key, value in server.client_env().items():
+        print(f"  export {key}={value}")
+    try:
+        while True:
+            time.sleep(10)
+            print(server.stats())
+    except KeyboardInterrupt:
+        server.stop()
@@ -8,10 +8,12 @@ from .prompt import EVENT_FINDER_AGENT_PROMPT
 
 # Tools built for Events Agent
 from tools.kalshi_events import search_open_events
+from tools.cross_venue_search import search_open_events_all_venues
+from tools.related_events import find_related_events
 from tools.kalshi_markets import get_markets_for_event as _get_markets_for_event
 
 
-def find_kalshi_events(topic: str, limit: int = 5) -> dict:
+def find_kalshi_events(topic: str, limit: int = 5, full_payload: bool = False) -> dict:
     """
     Find Kalshi events related to a user-specified topic.
 
@@ -19,20 +21,71 @@ def find_kalshi_events(topic: str, limit: int = 5) -> dict:
         topic: Free-text description of what the user wants to trade/research
                (e.g. "inflation", "NYC weather", "US elections").
         limit: Maximum number of matching events to return.
+        full_payload: Return the full Kalshi event payloads instead of the
+                      slim fields (tickers, title, sub_title, category,
+                      strike_date). Leave False unless a field is missing.
 
     Returns:
         A dict with:
         - topic
         - limit
         - total_matches
-        - events: list of event dicts (full Kalshi event payload + similarity score)
+        - events: list of event dicts (slim event fields + similarity score)
     """
-    events = search_open_events(topic=topic, limit=limit)
+    events = search_open_events(topic=topic, limit=limit, full_payload=full_payload)
     print("topic: ", topic)
     print("events: ", events)
     return events
 
 
+def find_cross_venue_events(topic: str, limit: int = 5, full_payload: bool = False) -> dict:
+    """
+    Find Kalshi and Polymarket events related to a topic in a single search.
+
+    Args:
+        topic: Free-text description of what the user wants to trade/research.
+        limit: Maximum number of matching events to return across both venues.
+        full_payload: Return full venue event payloads instead of the slim fields.
+
+    Returns:
+        A dict with:
+        - topic
+        - limit
+        - total_matches
+        - total_matches_by_venue: {"kalshi": int, "polymarket": int}
+        - events: list of event dicts merged by similarity score, each tagged
+          with "venue" ("kalshi" or "polymarket") and "score"
+    """
+    events = search_open_events_all_venues(topic=topic, limit=limit, full_payload=full_payload)
+    print("topic: ", topic)
+    print("events: ", events)
+    return events
+
+
+def find_related_markets(identifier: str, limit: int = 5, full_payload: bool = False) -> dict:
+    """
+    Find events related to a known event on Kalshi and Polymarket.
+
+    Args:
+        identifier: Kalshi event/series ticker (e.g. "KXBALANCE-29") or
+                    Polymarket event id/slug.
+        limit: Maximum number of related events to return per venue.
+        full_payload: Return full venue event payloads instead of the slim fields.
+
+    Returns:
+        A dict with:
+        - identifier
+        - venue: venue of the source event (None if the identifier is unknown)
+        - event: the source event
+        - related: {"kalshi": [...], "polymarket": [...]} event dicts, each
+          tagged with "venue" and a similarity "score"
+    """
+    related = find_related_events(identifier=identifier, limit=limit, full_payload=full_payload)
+    print("identifier: ", identifier)
+    print("related: ", related)
+    return related
+
+
 def _filter_market_data(market: dict) -> dict:
     """
     Filter market data to only include fields relevant for LLM decision-making.
@@ -136,6 +189,8 @@ def get_event_markets(event_ticker: str) -> dict:
 
 
 find_kalshi_events_tool = FunctionTool(find_kalshi_events)
+find_cross_venue_events_tool = FunctionTool(find_cross_venue_events)
+find_related_markets_tool = FunctionTool(find_related_markets)
 get_event_markets_tool = FunctionTool(get_event_markets)
 
 
@@ -144,5 +199,10 @@ event_finder_agent = Agent(
     model='gemini-2.5-pro',
     description="Finds relevant Kalshi events based on user's interests and can retrieve markets for a specific event.",
     instruction=EVENT_FINDER_AGENT_PROMPT,
-    tools=[find_kalshi_events_tool, get_event_markets_tool],
+    tools=[
+        find_kalshi_events_tool,
+        find_cross_venue_events_tool,
+        find_related_markets_tool,
+        get_event_markets_tool,
+    ],
 )
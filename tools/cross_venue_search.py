@@ -0,0 +1,129 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Handle both package import and direct execution
+try:
+    from . import kalshi_events, polymarket
+    from .emb import embed_text
+    from .event_lookup import looks_like_identifier
+    from .projection import scored_event
+    from .vector_index import normalize_vector
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools import kalshi_events, polymarket
+    from tools.emb import embed_text
+    from tools.event_lookup import looks_like_identifier
+    from tools.projection import scored_event
+    from tools.vector_index import normalize_vector
+
+
+# Venue name -> module exposing get_vector_index() / get_identifier_index()
+VENUE_MODULES = {
+    "kalshi": kalshi_events,
+    "polymarket": polymarket,
+}
+DEFAULT_VENUES = ("kalshi", "polymarket")
+
+
+def search_open_events_all_venues(
+    topic: str,
+    limit: int = 10,
+    categories: Optional[List[str]] = None,
+    venues: Sequence[str] = DEFAULT_VENUES,
+    full_payload: bool = False,
+) -> Dict[str, Any]:
+    """
+    Embedding-based search over open Kalshi *and* Polymarket events in one call.
+
+    The query is embedded once and scored against every venue's vector index;
+    hits are tagged with a "venue" field and merged by similarity score, so
+    equivalent markets on both venues show up side by side. Queries that look
+    like a ticker/id/slug are resolved through each venue's identifier index
+    first and never reach the embedding model.
+
+    Returns a dict with:
+    - topic
+    - limit
+    - total_matches: matches across all venues
+    - total_matches_by_venue: {venue -> matches}
+    - events: top `limit` events, each with "venue" and "score". Events are
+      projected to the venue's SLIM_EVENT_FIELDS unless full_payload=True.
+    """
+    empty = {
+        "topic": topic,
+        "limit": limit,
+        "total_matches": 0,
+        "total_matches_by_venue": {v: 0 for v in venues},
+        "events": [],
+    }
+
+    q = (topic or "").strip()
+    if not q:
+        return empty
+
+    for venue in venues:
+        if venue not in VENUE_MODULES:
+            raise ValueError(f"Unknown venue: {venue}")
+
+    if looks_like_identifier(q):
+        id_hits: List[Dict[str, Any]] = []
+        id_totals: Dict[str, int] = {}
+        for venue in venues:
+            matches = VENUE_MODULES[venue].get_identifier_index().lookup(q, limit=limit, exact_required=True)
+            id_totals[venue] = len(matches)
+            fields = None if full_payload else VENUE_MODULES[venue].SLIM_EVENT_FIELDS
+            for ev, field, match_type in matches:
+                id_hits.append(
+                    scored_event(
+                        ev, 1.0, fields,
+                        venue=venue, matched_field=field, match_type=match_type,
+                    )
+                )
+        if id_hits:
+            # Exact hits from any venue rank ahead of prefix hits.
+            id_hits.sort(key=lambda x: x["match_type"] != "exact")
+            return {
+                "topic": topic,
+                "limit": limit,
+                "total_matches": sum(id_totals.values()),
+                "total_matches_by_venue": id_totals,
+                "matched_by": "identifier",
+                "events": id_hits[: max(0, limit)],
+            }
+
+    indexes = {venue: VENUE_MODULES[venue].get_vector_index() for venue in venues}
+    query_vec = normalize_vector(embed_text(q))
+    if query_vec is None:
+        return empty
+
+    merged: List[Dict[str, Any]] = []
+    totals: Dict[str, int] = {}
+    for venue, index in indexes.items():
+        # The global top `limit` can never need more than `limit` hits per venue.
+        total, hits = index.search(query_vec, limit=limit, categories=categories)
+        totals[venue] = total
+        fields = None if full_payload else VENUE_MODULES[venue].SLIM_EVENT_FIELDS
+        merged.extend(scored_event(ev, sim, fields, venue=venue) for ev, sim in hits)
+
+    merged.sort(key=lambda x: x["score"], reverse=True)
+
+    return {
+        "topic": topic,
+        "limit": limit,
+        "total_matches": sum(totals.values()),
+        "total_matches_by_venue": totals,
+        "events": merged[: max(0, limit)],
+    }
+
+
+if __name__ == "__main__":
+    import time
+    start_time = time.time()
+    results = search_open_events_all_venues("elections")
+    end_time = time.time()
+    print(f"Time taken to search both venues: {end_time - start_time} seconds")
+    print(f"Matches by venue: {results['total_matches_by_venue']}")
+    for event in results["events"]:
+        print(f"[{event['venue']}] {event['score']:.4f} {event.get('title', 'N/A')}")
@@ -1,15 +1,29 @@
-from typing import List
+import sys
+from pathlib import Path
+from typing import Callable, List, Optional
 
 from google import genai
 from google.genai.types import EmbedContentConfig
 import dotenv
 import os
 
+# Handle both package import and direct execution
+try:
+    from .http_fixtures import genai_http_options
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.http_fixtures import genai_http_options
+
 
 dotenv.load_dotenv()
 
 _EMBED_CLIENT: genai.Client | None = None
 
+# Optional replacement for the Gemini call (e.g. a local, offline embedding
+# used by benchmarks). Takes a batch of texts, returns one vector per text.
+_EMBED_BACKEND: Optional[Callable[[List[str]], List[List[float]]]] = None
+
 
 def _get_embed_client() -> genai.Client:
     """
@@ -26,10 +40,24 @@ def _get_embed_client() -> genai.Client:
             vertexai=os.getenv("GOOGLE_GENAI_USE_VERTEXAI"),
             project=os.getenv("GOOGLE_GENAI_PROJECT"),
             location=os.getenv("GOOGLE_GENAI_LOCATION"),
+            # Record / replay mode (HTTP_FIXTURES_MODE), else None
+            http_options=genai_http_options(),
         )
     return _EMBED_CLIENT
 
 
+def set_embedding_backend(
+    backend: Optional[Callable[[List[str]], List[List[float]]]],
+) -> None:
+    """
+    Route embed_texts()/embed_text() through `backend` instead of Gemini.
+
+    Pass None to restore the default Gemini embeddings.
+    """
+    global _EMBED_BACKEND
+    _EMBED_BACKEND = backend
+
+
 def embed_texts(texts: List[str]) -> List[List[float]]:
     """
     Embed a batch of texts using Gemini embeddings.
@@ -39,6 +67,9 @@ def embed_texts(texts: List[str]) -> List[List[float]]:
     if not texts:
         return []
 
+    if _EMBED_BACKEND is not None:
+        return _EMBED_BACKEND(texts)
+
     client = _get_embed_client()
     vectors: List[List[float]] = []
 
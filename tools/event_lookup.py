@@ -0,0 +1,181 @@
+import bisect
+import re
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Handle both package import and direct execution
+try:
+    from .projection import scored_event
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.projection import scored_event
+
+# Pasted identifiers are a single token: Kalshi tickers ("KXBALANCE-29"),
+# series prefixes ("KXPRESPERSON"), Polymarket ids ("16085") or slugs
+# ("fed-decision-in-december").
+_IDENTIFIER_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._\-]*$")
+
+
+def looks_like_identifier(query: str) -> bool:
+    """
+    Heuristic: does this query look like a ticker/id/slug rather than a topic?
+
+    Single-token queries qualify if they contain a digit or a hyphen, or are
+    written entirely in upper case (e.g. "KXPRESPERSON"). Plain words such as
+    "inflation" still go through semantic search.
+    """
+    q = (query or "").strip()
+    if len(q) < 2 or not _IDENTIFIER_RE.match(q):
+        return False
+    if any(ch.isdigit() for ch in q) or "-" in q:
+        return True
+    return q.isupper() and len(q) >= 3
+
+
+def _normalize_key(key: Any) -> str:
+    return str(key).strip().lower()
+
+
+class IdentifierIndex:
+    """
+    Exact and prefix lookup over event identifiers.
+
+    - Exact lookups hit a dict: O(1).
+    - Prefix lookups bisect a sorted key list: O(log n + k) for k results.
+
+    Keys are case-insensitive. One key can map to several events (a series
+    ticker is shared by every event in the series).
+    """
+
+    def __init__(
+        self,
+        events: List[Dict[str, Any]],
+        key_fields: Iterable[str],
+    ) -> None:
+        self.events = events
+        self.key_fields = tuple(key_fields)
+
+        self._exact: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for ev in events:
+            for field in self.key_fields:
+                value = ev.get(field)
+                if value is None or value == "":
+                    continue
+                self._exact.setdefault(_normalize_key(value), []).append((field, ev))
+
+        self._sorted_keys: List[str] = sorted(self._exact)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def is_built_from(self, events: List[Dict[str, Any]]) -> bool:
+        """True if this index was built from exactly this (cached) events list."""
+        return self.events is events
+
+    def get(self, key: Any) -> List[Dict[str, Any]]:
+        """Return all events whose id/ticker/slug equals `key` exactly."""
+        return [ev for _, ev in self._exact.get(_normalize_key(key), [])]
+
+    def get_one(self, key: Any) -> Optional[Dict[str, Any]]:
+        """
+        Return the event matching `key` exactly, or None.
+
+        When a key collides across fields (a Kalshi series ticker equal to an
+        event ticker), the match on the earliest of `key_fields` wins, so the
+        primary id (event_ticker, Polymarket id) beats shared or secondary ones.
+        """
+        matches = self._exact.get(_normalize_key(key))
+        if not matches:
+            return None
+        return min(matches, key=lambda m: self.key_fields.index(m[0]))[1]
+
+    def prefix_keys(self, prefix: str, limit: int = 50) -> List[str]:
+        """Return up to `limit` indexed keys starting with `prefix`, in sorted order."""
+        p = _normalize_key(prefix)
+        if not p:
+            return []
+        keys: List[str] = []
+        i = bisect.bisect_left(self._sorted_keys, p)
+        while i < len(self._sorted_keys) and len(keys) < limit:
+            key = self._sorted_keys[i]
+            if not key.startswith(p):
+                break
+            keys.append(key)
+            i += 1
+        return keys
+
+    def lookup(
+        self,
+        query: str,
+        limit: int = 10,
+        exact_required: bool = False,
+    ) -> List[Tuple[Dict[str, Any], str, str]]:
+        """
+        Resolve `query` to events: exact matches first, then prefix matches.
+
+        Prefix matching only applies to queries containing a letter; an
+        all-digit query ("2028", a Polymarket id) is matched exactly. With
+        exact_required=True nothing is returned unless some key matches
+        exactly, so callers can fall back to semantic search.
+
+        Returns up to `limit` (event, matched_field, match_type) tuples, where
+        match_type is "exact" or "prefix". Each event appears at most once.
+        """
+        results: List[Tuple[Dict[str, Any], str, str]] = []
+        seen: set = set()
+
+        def _add(entries: List[Tuple[str, Dict[str, Any]]], match_type: str) -> bool:
+            for field, ev in entries:
+                if id(ev) in seen:
+                    continue
+                seen.add(id(ev))
+                results.append((ev, field, match_type))
+                if len(results) >= limit:
+                    return True
+            return False
+
+        q = _normalize_key(query)
+        if limit <= 0 or not q:
+            return results
+        exact = self._exact.get(q, [])
+        if exact_required and not exact:
+            return results
+        if _add(exact, "exact") or not any(ch.isalpha() for ch in q):
+            return results
+
+        # Scan a bounded window of keys; a series prefix may fan out to many events.
+        for key in self.prefix_keys(q, limit=max(limit * 4, 50)):
+            if key == q:
+                continue
+            if _add(self._exact[key], "prefix"):
+                break
+        return results
+
+
+def identifier_search_result(
+    topic: str,
+    limit: int,
+    matches: List[Tuple[Dict[str, Any], str, str]],
+    fields: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Shape identifier lookup hits like a search_open_events() response.
+
+    Identifier hits get score 1.0 and carry "matched_field"/"match_type" so
+    callers can tell them apart from embedding matches. `fields` projects
+    each event (None keeps the full payload).
+    """
+    events = [
+        scored_event(ev, 1.0, fields, matched_field=field, match_type=match_type)
+        for ev, field, match_type in matches
+    ]
+
+    return {
+        "topic": topic,
+        "limit": limit,
+        "total_matches": len(events),
+        "matched_by": "identifier",
+        "events": events,
+    }
@@ -0,0 +1,263 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Handle both package import and direct execution
+try:
+    from .http_session import get_http_session
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.http_session import get_http_session
+
+
+# Freshness policies (max_age, seconds) for cached_get():
+# - FRESH: always ask the origin; a 304 still avoids re-downloading the body.
+#   Use for prices and anything trading decisions depend on.
+FRESH = 0.0
+# - Static event/market metadata: served locally for a few minutes, then
+#   revalidated with a conditional request.
+METADATA_MAX_AGE = 5 * 60.0
+
+# Responses are kept on disk, so validators survive restarts and a fresh run's
+# catalog walk is answered with 304s: one <hash>.json (url, headers,
+# validators) plus one <hash>.body per URL+params
+HTTP_CACHE_DIR = os.getenv("HTTP_CACHE_DIR") or "data/http_cache"
+# Maximum number of entries whose metadata stays in memory (least recently
+# used are dropped first and re-read from disk on demand); bodies are always
+# read from disk
+HTTP_CACHE_MAX_ENTRIES = 2048
+
+
+_CacheKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class _CacheEntry:
+    """
+    What a cached 200 needs to be served again: headers and validators, with
+    the body in a file next to them. The Response object itself (and its
+    connection) is not kept.
+    """
+
+    __slots__ = ("path", "url", "headers", "encoding", "etag", "last_modified", "validated_at")
+
+    def __init__(
+        self,
+        path: str,
+        url: str,
+        headers: Dict[str, str],
+        encoding: Optional[str],
+        validated_at: float,
+    ):
+        self.path = path
+        self.url = url
+        self.headers = headers
+        self.encoding = encoding
+        self.etag = headers.get("ETag")
+        self.last_modified = headers.get("Last-Modified")
+        self.validated_at = validated_at
+
+    @classmethod
+    def store(cls, path: str, response: requests.Response) -> "_CacheEntry":
+        """Write `response` under `path` and return its entry."""
+        entry = cls(
+            path, response.url, dict(response.headers), response.encoding, time.time()
+        )
+        _write_atomic(path + ".body", response.content)
+        entry.save()
+        return entry
+
+    @classmethod
+    def load(cls, path: str) -> Optional["_CacheEntry"]:
+        try:
+            with open(path + ".json", "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(path + ".body"):
+            return None
+        return cls(path, meta["url"], meta["headers"], meta["encoding"], meta["validated_at"])
+
+    def save(self) -> None:
+        meta = {
+            "url": self.url,
+            "headers": self.headers,
+            "encoding": self.encoding,
+            "validated_at": self.validated_at,
+        }
+        _write_atomic(self.path + ".json", json.dumps(meta).encode("utf-8"))
+
+    def to_response(self) -> Optional[requests.Response]:
+        """Rebuild the cached 200, or None if its body file is gone."""
+        try:
+            with open(self.path + ".body", "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = "OK"
+        response.url = self.url
+        response._content = body
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = self.encoding
+        return response
+
+
+_CACHE: "OrderedDict[_CacheKey, _CacheEntry]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_STATS = {"hits": 0, "revalidated": 0, "misses": 0}
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def _cache_key(url: str, params: Optional[Dict[str, Any]]) -> _CacheKey:
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return url, items
+
+
+def _entry_path(key: _CacheKey) -> str:
+    digest = hashlib.sha256(json.dumps(key).encode("utf-8")).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, digest)
+
+
+def _remember(key: _CacheKey, entry: _CacheEntry) -> None:
+    # Caller holds _CACHE_LOCK
+    _CACHE[key] = entry
+    _CACHE.move_to_end(key)
+    while len(_CACHE) > HTTP_CACHE_MAX_ENTRIES:
+        _CACHE.popitem(last=False)
+
+
+def _forget(key: _CacheKey) -> None:
+    # Caller holds _CACHE_LOCK
+    _CACHE.pop(key, None)
+    path = _entry_path(key)
+    for suffix in (".json", ".body"):
+        try:
+            os.remove(path + suffix)
+        except OSError:
+            pass
+
+
+def _is_cacheable(response: requests.Response) -> bool:
+    cache_control = response.headers.get("Cache-Control", "").lower()
+    return response.status_code == 200 and "no-store" not in cache_control
+
+
+def cached_get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    max_age: float = FRESH,
+    session: Optional[requests.Session] = None,
+    **kwargs: Any,
+) -> requests.Response:
+    """
+    GET `url` through a local validator cache persisted under HTTP_CACHE_DIR.
+
+    - A cached 200 response younger than `max_age` seconds is returned
+      without any network request.
+    - Otherwise the request is sent with If-None-Match / If-Modified-Since
+      from the cached ETag / Last-Modified. A 304 returns the cached response
+      (and resets its age); anything else replaces the entry.
+
+    max_age=FRESH (0) therefore always reaches the origin, and
+    "Cache-Control: no-cache" is sent so intermediaries revalidate too.
+
+    Returns a requests.Response; cache hits and 304s get a new Response
+    rebuilt from the cached body and headers.
+    """
+    session = session or get_http_session()
+    key = _cache_key(url, params)
+
+    with _CACHE_LOCK:
+        entry = _CACHE.get(key)
+        if entry is None:
+            entry = _CacheEntry.load(_entry_path(key))
+            if entry is not None:
+                _remember(key, entry)
+        else:
+            _CACHE.move_to_end(key)
+        if entry is not None and max_age > 0 and time.time() - entry.validated_at < max_age:
+            cached = entry.to_response()
+            if cached is not None:
+                _STATS["hits"] += 1
+                return cached
+            entry = None
+
+    headers = dict(kwargs.pop("headers", None) or {})
+    if max_age <= 0:
+        headers.setdefault("Cache-Control", "no-cache")
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+    response = session.get(url, params=params, headers=headers, **kwargs)
+
+    if response.status_code == 304 and entry is not None:
+        cached = entry.to_response()
+        if cached is not None:
+            entry.validated_at = time.time()
+            entry.save()
+            with _CACHE_LOCK:
+                _STATS["revalidated"] += 1
+            return cached
+
+    if _is_cacheable(response):
+        fresh = _CacheEntry.store(_entry_path(key), response)
+        with _CACHE_LOCK:
+            _STATS["misses"] += 1
+            _remember(key, fresh)
+        return response
+
+    with _CACHE_LOCK:
+        _STATS["misses"] += 1
+        if response.status_code < 500 and response.status_code != 429:
+            # Keep validators across throttling / server errors so the retry
+            # can still be answered with a 304.
+            _forget(key)
+    return response
+
+
+def http_cache_stats() -> Dict[str, int]:
+    """
+    Counts of local hits, 304 revalidations and full downloads, plus entries held
+    in memory.
+    """
+    with _CACHE_LOCK:
+        return dict(_STATS, entries=len(_CACHE))
+
+
+def clear_http_cache() -> None:
+    """
+    Drop every cached response, in memory and under HTTP_CACHE_DIR, and reset
+    the counters.
+    """
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        if os.path.isdir(HTTP_CACHE_DIR):
+            for name in os.listdir(HTTP_CACHE_DIR):
+                if name.endswith((".json", ".body")):
+                    try:
+                        os.remove(os.path.join(HTTP_CACHE_DIR, name))
+                    except OSError:
+                        pass
+        for k in _STATS:
+            _STATS[k] = 0
@@ -0,0 +1,318 @@
+import atexit
+import base64
+import gzip
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import dotenv
+import httpx
+import urllib3
+from requests.adapters import HTTPAdapter
+
+dotenv.load_dotenv()
+
+
+# Record / replay of every HTTP exchange the venue and model clients make, so
+# pipeline runs can be profiled offline and repeatably:
+# - the pooled requests session (Kalshi raw reads, Gamma, CLOB) gets an adapter,
+# - the Kalshi SDK client gets a wrapped urllib3 pool manager,
+# - genai clients get an httpx transport (see genai_http_options()).
+#
+# Configured through the environment so any entry point can be recorded:
+#   HTTP_FIXTURES_MODE=record|replay   (unset / "off" = live traffic)
+#   HTTP_FIXTURES_PATH=data/fixtures/http.jsonl.gz
+#   HTTP_FIXTURES_LATENCY=recorded|zero   (replay only)
+RECORD = "record"
+REPLAY = "replay"
+OFF = "off"
+
+# Replay sleeps for each response's recorded round-trip time, or not at all
+RECORDED_LATENCY = "recorded"
+ZERO_LATENCY = "zero"
+
+HTTP_FIXTURES_MODE = (os.getenv("HTTP_FIXTURES_MODE") or OFF).lower()
+HTTP_FIXTURES_PATH = os.getenv("HTTP_FIXTURES_PATH") or "data/fixtures/http.jsonl.gz"
+HTTP_FIXTURES_LATENCY = (os.getenv("HTTP_FIXTURES_LATENCY") or RECORDED_LATENCY).lower()
+
+# Recorded bodies are stored decoded, so transfer framing headers no longer apply
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class FixtureMissError(LookupError):
+    """
+    Raised in replay mode for a request that was never recorded.
+    """
+
+
+class Exchange(NamedTuple):
+    status: int
+    headers: List[Tuple[str, str]]
+    body: bytes
+    elapsed: float
+
+
+def request_key(method: str, url: str, body: Any = None) -> str:
+    """
+    Identity of a request for matching: method, URL with sorted query
+    parameters, and a digest of the body. Headers (auth signatures with
+    timestamps, validators) are deliberately left out.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key = f"{method.upper()} {parts.scheme}://{parts.netloc}{parts.path}"
+    if query:
+        key += f"?{query}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode()
+        if isinstance(body, (bytes, bytearray)):
+            key += f" #{hashlib.sha1(body).hexdigest()[:16]}"
+    return key
+
+
+def _kept_headers(headers: Any) -> List[Tuple[str, str]]:
+    return [(k, v) for k, v in headers.items() if k.lower() not in _DROP_HEADERS]
+
+
+class FixtureStore:
+    """
+    Recorded HTTP exchanges, one gzip-compressed JSON line per response.
+
+    Identical requests may be recorded several times (e.g. a revalidated
+    event fetch); replay returns them in recorded order and then keeps
+    repeating the last one. Thread-safe.
+    """
+
+    def __init__(self, path: str, mode: str, latency: str = RECORDED_LATENCY):
+        if mode not in (RECORD, REPLAY):
+            raise ValueError(f"Unknown fixture mode: {mode!r}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.recorded = 0
+        self.replayed = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._records: List[Dict[str, Any]] = []
+        self._queues: Dict[str, Deque[Exchange]] = defaultdict(deque)
+        self._last: Dict[str, Exchange] = {}
+        if mode == REPLAY:
+            self._load()
+        else:
+            atexit.register(self.save)
+
+    def _load(self) -> None:
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            for line in f:
+                rec = json.loads(line)
+                body = base64.b64decode(rec["body"]) if rec.get("b64") else rec["body"].encode()
+                exchange = Exchange(rec["status"], [tuple(h) for h in rec["headers"]], body, rec["elapsed"])
+                self._queues[rec["key"]].append(exchange)
+
+    def record(self, key: str, status: int, headers: Any, body: bytes, elapsed: float) -> None:
+        try:
+            text, b64 = body.decode("utf-8"), False
+        except UnicodeDecodeError:
+            text, b64 = base64.b64encode(body).decode("ascii"), True
+        rec = {
+            "key": key,
+            "status": status,
+            "headers": _kept_headers(headers),
+            "body": text,
+            "b64": b64,
+            "elapsed": round(elapsed, 6),
+        }
+        with self._lock:
+            self._records.append(rec)
+            self.recorded += 1
+
+    def replay(self, key: str) -> Exchange:
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue:
+                exchange = queue.popleft()
+                self._last[key] = exchange
+            else:
+                exchange = self._last.get(key)
+            if exchange is None:
+                self.misses += 1
+                raise FixtureMissError(f"No recorded response for {key}")
+            self.replayed += 1
+        if self.latency == RECORDED_LATENCY and exchange.elapsed > 0:
+            time.sleep(exchange.elapsed)
+        return exchange
+
+    def save(self) -> None:
+        """Write everything recorded so far (record mode; replaces the file)."""
+        if self.mode != RECORD:
+            return
+        with self._lock:
+            records = list(self._records)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = self.path + ".tmp"
+        with gzip.open(tmp, "wt", encoding="utf-8") as f:
+            for rec in records:
+                f.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        os.replace(tmp, self.path)
+
+
+def _urllib3_response(exchange: Exchange) -> urllib3.HTTPResponse:
+    return urllib3.HTTPResponse(
+        body=io.BytesIO(exchange.body),
+        headers=exchange.headers,
+        status=exchange.status,
+        preload_content=False,
+        decode_content=False,
+    )
+
+
+class FixtureAdapter(HTTPAdapter):
+    """
+    requests transport adapter that records or replays through a FixtureStore.
+    """
+
+    def __init__(self, store: FixtureStore, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.store = store
+
+    def send(self, request: Any, **kwargs: Any) -> Any:
+        key = request_key(request.method, request.url, request.body)
+        if self.store.mode == REPLAY:
+            return self.build_response(request, _urllib3_response(self.store.replay(key)))
+        start = time.perf_counter()
+        response = super().send(request, **kwargs)
+        body = response.content
+        self.store.record(key, response.status_code, response.headers, body, time.perf_counter() - start)
+        return response
+
+
+class FixturePoolManager:
+    """
+    Stand-in for the urllib3 pool manager inside the Kalshi SDK's REST client.
+    """
+
+    def __init__(self, store: FixtureStore, pool_manager: Any):
+        self.store = store
+        self.pool_manager = pool_manager
+
+    def request(self, method: str, url: str, body: Any = None, fields: Any = None, **kwargs: Any) -> Any:
+        key_body = body
+        if fields:
+            # Form posts: key on the encoded fields instead of the body
+            key_body = urlencode(sorted(fields.items()) if isinstance(fields, dict) else fields)
+        key = request_key(method, url, key_body)
+        if self.store.mode == REPLAY:
+            return _urllib3_response(self.store.replay(key))
+        start = time.perf_counter()
+        response = self.pool_manager.request(method, url, body=body, fields=fields, **kwargs)
+        data = response.data
+        self.store.record(key, response.status, response.headers, data, time.perf_counter() - start)
+        return response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.pool_manager, name)
+
+
+class FixtureTransport(httpx.BaseTransport):
+    """
+    httpx transport (as used by genai clients) that records or replays
+    through a FixtureStore.
+    """
+
+    def __init__(self, store: FixtureStore, transport: Optional[httpx.BaseTransport] = None):
+        self.store = store
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        key = request_key(request.method, str(request.url), request.read())
+        if self.store.mode == REPLAY:
+            exchange = self.store.replay(key)
+        else:
+            if self._transport is None:
+                self._transport = httpx.HTTPTransport()
+            start = time.perf_counter()
+            response = self._transport.handle_request(request)
+            try:
+                body = response.read()
+            finally:
+                response.close()
+            exchange = Exchange(response.status_code, _kept_headers(response.headers), body, time.perf_counter() - start)
+            self.store.record(key, exchange.status, response.headers, body, exchange.elapsed)
+        return httpx.Response(exchange.status, headers=exchange.headers, content=exchange.body, request=request)
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+
+
+_STORE: Optional[FixtureStore] = None
+_STORE_LOCK = threading.Lock()
+_STORE_FROM_ENV = True
+
+
+def get_fixture_store() -> Optional[FixtureStore]:
+    """
+    The active FixtureStore, or None when fixtures are off. On first use it
+    is built from HTTP_FIXTURES_MODE / _PATH / _LATENCY.
+    """
+    global _STORE, _STORE_FROM_ENV
+    if _STORE_FROM_ENV:
+        with _STORE_LOCK:
+            if _STORE_FROM_ENV:
+                if HTTP_FIXTURES_MODE in (RECORD, REPLAY):
+                    _STORE = FixtureStore(HTTP_FIXTURES_PATH, HTTP_FIXTURES_MODE, HTTP_FIXTURES_LATENCY)
+                _STORE_FROM_ENV = False
+    return _STORE
+
+
+def set_fixture_store(store: Optional[FixtureStore]) -> None:
+    """
+    Make `store` the active FixtureStore (None = live traffic). Clients built
+    afterwards pick it up; call before the first request, or reset the
+    shared session / Kalshi client (tools.http_session.reset_http_session,
+    tools.kalshi_client.reset_kalshi_client) so they are rebuilt.
+    """
+    global _STORE, _STORE_FROM_ENV
+    with _STORE_LOCK:
+        _STORE = store
+        _STORE_FROM_ENV = False
+
+
+def install_session_fixtures(session: Any, **adapter_kwargs: Any) -> None:
+    """Route a requests session through the active store, if any."""
+    store = get_fixture_store()
+    if store is None:
+        return
+    adapter = FixtureAdapter(store, **adapter_kwargs)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def install_kalshi_fixtures(client: Any) -> None:
+    """Route a Kalshi SDK client's REST calls through the active store, if any."""
+    store = get_fixture_store()
+    if store is None:
+        return
+    rest_client = client.rest_client
+    if not isinstance(rest_client.pool_manager, FixturePoolManager):
+        rest_client.pool_manager = FixturePoolManager(store, rest_client.pool_manager)
+
+
+def genai_http_options() -> Any:
+    """
+    HttpOptions routing a genai.Client through the active store, or None
+    when fixtures are off. Pass as genai.Client(http_options=...).
+    """
+    store = get_fixture_store()
+    if store is None:
+        return None
+    from google.genai.types import HttpOptions
+
+    return HttpOptions(client_args={"transport": FixtureTransport(store)})
@@ -0,0 +1,122 @@
+import os
+import sys
+import threading
+from pathlib import Path
+from typing import Optional, Tuple
+
+import dotenv
+import requests
+from requests.adapters import HTTPAdapter
+
+# Handle both package import and direct execution
+try:
+    from .http_fixtures import install_session_fixtures
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.http_fixtures import install_session_fixtures
+
+dotenv.load_dotenv()
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _env_float(name: str, default: float) -> float:
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+# Connections kept alive per host; should be >= the number of threads issuing
+# requests concurrently (e.g. polymarket.PAGE_FETCH_WORKERS).
+HTTP_POOL_SIZE = _env_int("HTTP_POOL_SIZE", 16)
+
+# (connect, read) timeouts in seconds applied when a call passes none
+HTTP_CONNECT_TIMEOUT = _env_float("HTTP_CONNECT_TIMEOUT", 5.0)
+HTTP_READ_TIMEOUT = _env_float("HTTP_READ_TIMEOUT", 30.0)
+
+
+def _accept_encoding() -> str:
+    # requests/urllib3 only decode brotli when a brotli module is installed
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return "gzip, deflate"
+    return "gzip, deflate, br"
+
+
+class _TimeoutSession(requests.Session):
+    """
+    requests.Session that applies a default timeout to every request.
+    """
+
+    def __init__(self, timeout: Tuple[float, float]):
+        super().__init__()
+        self._default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self._default_timeout
+        return super().request(method, url, **kwargs)
+
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def _build_session() -> requests.Session:
+    session = _TimeoutSession((HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT))
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        pool_block=False,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # Record / replay mode (HTTP_FIXTURES_MODE) swaps in a fixture adapter
+    install_session_fixtures(
+        session,
+        pool_connections=HTTP_POOL_SIZE,
+        pool_maxsize=HTTP_POOL_SIZE,
+        pool_block=False,
+    )
+    session.headers.update({
+        "Accept": "application/json",
+        "Accept-Encoding": _accept_encoding(),
+        "Connection": "keep-alive",
+    })
+    return session
+
+
+def get_http_session() -> requests.Session:
+    """
+    Return the process-wide pooled HTTP session.
+
+    Connections are kept alive and reused across calls and threads (urllib3
+    pools are thread-safe), responses are accepted gzip/brotli compressed, and
+    requests without an explicit timeout use (HTTP_CONNECT_TIMEOUT,
+    HTTP_READ_TIMEOUT). Pool size and timeouts can be set through the
+    HTTP_POOL_SIZE, HTTP_CONNECT_TIMEOUT and HTTP_READ_TIMEOUT env vars.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = _build_session()
+    return _SESSION
+
+
+def reset_http_session() -> None:
+    """
+    Close the shared session; the next get_http_session() builds a new one.
+    """
+    global _SESSION
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+        _SESSION = None
@@ -0,0 +1,195 @@
+import json
+import os
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+# Handle both package import and direct execution
+try:
+    from .emb import embed_texts
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.emb import embed_texts
+
+
+# Texts sent to the embedding backend per call
+EMBED_BATCH_SIZE = 200
+
+# Fetched pages buffered between the download thread and the embedder
+PAGE_QUEUE_SIZE = 16
+
+_DONE = object()
+
+
+class _JsonArrayWriter:
+    """
+    Write a JSON list one element at a time.
+    """
+
+    def __init__(self, f: TextIO):
+        self._f = f
+        self._first = True
+        f.write("[")
+
+    def write(self, item: Any) -> None:
+        self._f.write("\n" if self._first else ",\n")
+        self._f.write(json.dumps(item, default=str))
+        self._first = False
+
+    def close(self) -> None:
+        self._f.write("\n]" if not self._first else "]")
+
+
+class _JsonObjectWriter:
+    """
+    Write a JSON object one key/value pair at a time.
+    """
+
+    def __init__(self, f: TextIO):
+        self._f = f
+        self._first = True
+        f.write("{")
+
+    def write(self, key: str, value: Any) -> None:
+        if not self._first:
+            self._f.write(", ")
+        self._f.write(f"{json.dumps(key)}: {json.dumps(value)}")
+        self._first = False
+
+    def close(self) -> None:
+        self._f.write("}")
+
+
+def _put(out: "queue.Queue", item: Any, stop: threading.Event) -> bool:
+    # Block until there is room, unless the consumer has gone away
+    while not stop.is_set():
+        try:
+            out.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce_pages(
+    pages: Iterable[List[Dict[str, Any]]],
+    out: "queue.Queue",
+    stop: threading.Event,
+) -> None:
+    try:
+        for page in pages:
+            if not _put(out, page, stop):
+                break
+    except BaseException as e:  # surfaced in the consumer thread
+        _put(out, e, stop)
+    finally:
+        # Close the page generator on the thread iterating it, so its own
+        # cleanup (e.g. the Polymarket fetch checkpoint file) runs now
+        close = getattr(pages, "close", None)
+        if close is not None:
+            close()
+        _put(out, _DONE, stop)
+
+
+def build_index_streaming(
+    pages: Iterable[List[Dict[str, Any]]],
+    key_fn: Callable[[Dict[str, Any]], Optional[str]],
+    text_fn: Callable[[Dict[str, Any]], str],
+    events_path: str,
+    embeds_path: str,
+    batch_size: int = EMBED_BATCH_SIZE,
+) -> Tuple[List[Dict[str, Any]], Dict[str, List[float]]]:
+    """
+    Build an events + embeddings index while the catalog is still downloading.
+
+    `pages` (e.g. a venue's iter_open_event_pages()) is consumed on a
+    background thread. Events are written to `events_path` as they arrive and
+    embedded in batches of `batch_size` as soon as a batch is full, so fetching
+    and embedding overlap. Vectors are appended to `embeds_path` per batch.
+
+    Both files are written to temporary paths and moved into place only when
+    the whole catalog has been processed, so an interrupted build never leaves
+    a truncated index behind. Errors raised while fetching are re-raised here;
+    on any error the download thread is stopped and `pages` closed before
+    returning.
+
+    Returns:
+        (events, embeds) with the same shapes as the JSON files on disk
+    """
+    for path in (events_path, embeds_path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    events_tmp = events_path + ".tmp"
+    embeds_tmp = embeds_path + ".tmp"
+
+    page_queue: "queue.Queue" = queue.Queue(maxsize=PAGE_QUEUE_SIZE)
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=_produce_pages, args=(pages, page_queue, stop), daemon=True
+    )
+
+    events: List[Dict[str, Any]] = []
+    embeds: Dict[str, List[float]] = {}
+    pending_keys: List[str] = []
+    pending_texts: List[str] = []
+
+    try:
+        with open(events_tmp, "w") as ef, open(embeds_tmp, "w") as vf:
+            events_out = _JsonArrayWriter(ef)
+            embeds_out = _JsonObjectWriter(vf)
+
+            def flush() -> None:
+                vectors = embed_texts(pending_texts)
+                for key, vec in zip(pending_keys, vectors):
+                    embeds[key] = vec
+                    embeds_out.write(key, vec)
+                vf.flush()
+                pending_keys.clear()
+                pending_texts.clear()
+
+            producer.start()
+            while True:
+                item = page_queue.get()
+                if item is _DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+
+                for ev in item:
+                    events.append(ev)
+                    events_out.write(ev)
+                    key = key_fn(ev)
+                    if not key:
+                        continue
+                    pending_keys.append(key)
+                    pending_texts.append(text_fn(ev))
+                    if len(pending_texts) >= batch_size:
+                        flush()
+
+            if pending_texts:
+                flush()
+            events_out.close()
+            embeds_out.close()
+    except BaseException:
+        for tmp in (events_tmp, embeds_tmp):
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        raise
+    finally:
+        # On error (e.g. embedding failed) the producer may be blocked on a
+        # full queue: stop it, drop what it buffered and wait for it to close
+        # the page generator.
+        stop.set()
+        while True:
+            try:
+                page_queue.get_nowait()
+            except queue.Empty:
+                break
+        if producer.is_alive():
+            producer.join()
+
+    os.replace(events_tmp, events_path)
+    os.replace(embeds_tmp, embeds_path)
+    return events, embeds
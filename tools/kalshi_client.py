@@ -1,22 +1,89 @@
 from kalshi_python_sync import Configuration, KalshiClient
 import dotenv
 import os
+import sys
+import threading
+from pathlib import Path
+from typing import Optional
 
-def get_kalshi_client():
+# Handle both package import and direct execution
+try:
+    from .http_fixtures import install_kalshi_fixtures
+    from .http_session import HTTP_POOL_SIZE
+    from .rate_limit import TokenBucket
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.http_fixtures import install_kalshi_fixtures
+    from tools.http_session import HTTP_POOL_SIZE
+    from tools.rate_limit import TokenBucket
+
+
+dotenv.load_dotenv()
+
+# Override with KALSHI_API_BASE to point every Kalshi REST call (SDK and raw
+# reads) at another environment, e.g. benchmarks/venue_server.py.
+KALSHI_HOST = os.getenv("KALSHI_API_BASE") or "https://api.elections.kalshi.com/trade-api/v2"
+KALSHI_PRIVATE_KEY_PATH = "keys/llmfin.txt"
+
+# Kalshi's published Basic-tier read limit is 20 requests/second; raise it
+# via KALSHI_READS_PER_SECOND on higher tiers.
+KALSHI_READS_PER_SECOND = float(os.getenv("KALSHI_READS_PER_SECOND") or 20)
+
+# Every Kalshi read (events, markets, orderbooks) takes a token from this
+# bucket first, so worker pools as a whole stay under the limit.
+KALSHI_READ_LIMITER = TokenBucket(KALSHI_READS_PER_SECOND)
+
+_CLIENT: Optional[KalshiClient] = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _build_kalshi_client() -> KalshiClient:
     dotenv.load_dotenv()
     # Configure the client
     config = Configuration(
-        host="https://api.elections.kalshi.com/trade-api/v2"
+        host=KALSHI_HOST
     )
+    # Enough pooled connections for concurrent market fetches; never shrink
+    # the SDK default (cpu_count() * 5)
+    config.connection_pool_maxsize = max(config.connection_pool_maxsize, HTTP_POOL_SIZE)
 
     # For authenticated requests
     # Read private key from file
-    with open("keys/llmfin.txt", "r") as f:
+    with open(KALSHI_PRIVATE_KEY_PATH, "r") as f:
         private_key = f.read()
 
     config.api_key_id = os.getenv("KALSHI_API_KEY_ID")
     config.private_key_pem = private_key
 
-    # Initialize the client
+    # Initialize the client (parses the private key once)
     client = KalshiClient(config)
+    # Record / replay mode (HTTP_FIXTURES_MODE) wraps the SDK's connection pool
+    install_kalshi_fixtures(client)
     return client
+
+
+def get_kalshi_client() -> KalshiClient:
+    """
+    Return the process-wide Kalshi client, building it on first use.
+
+    The .env lookup, key file read and private-key parsing happen once; every
+    later call reuses the same client and its pooled HTTPS connections. Safe to
+    call from multiple threads. Use reset_kalshi_client() after rotating keys.
+    """
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = _build_kalshi_client()
+    return _CLIENT
+
+
+def reset_kalshi_client() -> None:
+    """
+    Drop the cached client so the next get_kalshi_client() re-reads the
+    API key id and private key (e.g. after key rotation).
+    """
+    global _CLIENT
+    with _CLIENT_LOCK:
+        _CLIENT = None
@@ -1,49 +1,60 @@
 import json
-import math
 import os
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 # Handle both package import and direct execution
 try:
-    from .kalshi_client import get_kalshi_client
+    from .kalshi_rest import get_events as get_events_page, iter_pages
     from .emb import embed_texts, embed_text
+    from .index_pipeline import build_index_streaming
+    from .vector_index import EventVectorIndex, normalize_vector
+    from .knn_graph import NeighborGraph
+    from .projection import scored_event
+    from .event_lookup import (
+        IdentifierIndex,
+        identifier_search_result,
+        looks_like_identifier,
+    )
 except ImportError:
     # When running directly, add parent directory to path
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from tools.kalshi_client import get_kalshi_client
+    from tools.kalshi_rest import get_events as get_events_page, iter_pages
     from tools.emb import embed_texts, embed_text
-
-
-def event_to_dict(event: Any) -> Dict[str, Any]:
+    from tools.index_pipeline import build_index_streaming
+    from tools.vector_index import EventVectorIndex, normalize_vector
+    from tools.knn_graph import NeighborGraph
+    from tools.projection import scored_event
+    from tools.event_lookup import (
+        IdentifierIndex,
+        identifier_search_result,
+        looks_like_identifier,
+    )
+
+
+def iter_open_event_pages(
+    limit: int = 200,
+    fields: Optional[Iterable[str]] = None,
+) -> Iterator[List[Dict[str, Any]]]:
     """
-    Convert a Kalshi Event model to a plain dict
+    Yield open Kalshi events one API page at a time (as plain dicts), so
+    callers can start processing before the whole catalog has downloaded.
+
+    Reads the raw JSON (see kalshi_rest), skipping SDK model validation;
+    `fields` optionally keeps only those event fields.
     """
-    return event.model_dump()
+    yield from iter_pages(get_events_page, "events", limit=limit, status="open", fields=fields)
 
 
 def fetch_all_open_events(limit: int = 200) -> List[Dict[str, Any]]:
     """
-    Fetch all open events from Kalshi (elections environment via get_kalshi_client)
+    Fetch all open events from Kalshi (elections environment, KALSHI_HOST)
     and return them as a list of plain dicts.
     """
-    client = get_kalshi_client()
-
     all_events: List[Dict[str, Any]] = []
-    cursor = None
-    status = "open"
-
-    while True:
-        resp = client.get_events(limit=limit, cursor=cursor, status=status)
-
-        events = getattr(resp, "events", []) or []
-        all_events.extend(event_to_dict(e) for e in events)
-
-        cursor = getattr(resp, "cursor", None)
-        if not cursor:
-            break
-
+    for page in iter_open_event_pages(limit=limit):
+        all_events.extend(page)
     return all_events
 
 
@@ -58,10 +69,21 @@ def save_events_to_json(events: List[Dict[str, Any]], output_path: str) -> None:
 
 _EVENTS_CACHE: Optional[List[Dict[str, Any]]] = None
 _EVENT_EMBEDS: Optional[Dict[str, List[float]]] = None
+_VECTOR_INDEX: Optional[EventVectorIndex] = None
+_IDENTIFIER_INDEX: Optional[IdentifierIndex] = None
+
+# Event fields indexed for exact / prefix identifier lookup
+IDENTIFIER_FIELDS = ("event_ticker", "series_ticker")
+
+# Fields returned by search_open_events() unless full_payload=True.
+# Kalshi events carry no close time of their own; `strike_date` is the
+# event-level resolution date (market close times come from get_markets_for_event).
+SLIM_EVENT_FIELDS = ("event_ticker", "series_ticker", "title", "sub_title", "category", "strike_date")
 
 # Default on-disk locations for the precomputed index
 DEFAULT_EVENTS_PATH = "data/open_events.json"
 DEFAULT_EMBEDS_PATH = "data/open_events_embeds.json"
+DEFAULT_KNN_PATH = "data/open_events_knn.npz"
 
 
 def _load_open_events_cached(limit: int = 200) -> List[Dict[str, Any]]:
@@ -78,20 +100,21 @@ def _load_open_events_cached(limit: int = 200) -> List[Dict[str, Any]]:
     return _EVENTS_CACHE
 
 
-def _cosine_similarity(a: List[float], b: List[float]) -> float:
+def event_key(ev: Dict[str, Any]) -> Optional[str]:
+    """
+    Identifier used as the key of a Kalshi event in the embeddings index.
+    """
+    return ev.get("event_ticker") or ev.get("series_ticker")
+
+
+def _event_text(ev: Dict[str, Any]) -> str:
     """
-    Compute cosine similarity between two dense vectors.
+    Text embedded for a Kalshi event.
     """
-    if not a or not b or len(a) != len(b):
-        return 0.0
-    dot = sum(x * y for x, y in zip(a, b))
-    if dot == 0.0:
-        return 0.0
-    na = math.sqrt(sum(x * x for x in a))
-    nb = math.sqrt(sum(x * x for x in b))
-    if na == 0.0 or nb == 0.0:
-        return 0.0
-    return dot / (na * nb)
+    title = str(ev.get("title") or "")
+    sub_title = str(ev.get("sub_title") or "")
+    category = str(ev.get("category") or "")
+    return f"{title}. {sub_title} [category: {category}]"
 
 
 def _load_events_and_embeddings(
@@ -131,17 +154,12 @@ def _load_events_and_embeddings(
     texts: List[str] = []
     tickers: List[str] = []
     for ev in events:
-        ticker = ev.get("event_ticker") or ev.get("series_ticker")
+        ticker = event_key(ev)
         if not ticker:
             continue
 
-        title = str(ev.get("title") or "")
-        sub_title = str(ev.get("sub_title") or "")
-        category = str(ev.get("category") or "")
-        text = f"{title}. {sub_title} [category: {category}]"
-
         tickers.append(ticker)
-        texts.append(text)
+        texts.append(_event_text(ev))
 
     if texts:
         vectors = embed_texts(texts)
@@ -164,43 +182,35 @@ def setup_events_index(
     - Fetch all open events from Kalshi
     - Save them to `events_path`
     - Embed each event and save a small vector index to `embeds_path`
+    - Precompute the top-k related-events graph (CSR) and save it to
+      DEFAULT_KNN_PATH, where related_events.get_neighbor_graph() reads it
 
     After this has been run, search_open_events() will load everything from disk,
     which is much faster than re-embedding on each cold start.
-    """
-    events = fetch_all_open_events()
-    save_events_to_json(events, events_path)
 
-    texts: List[str] = []
-    tickers: List[str] = []
-    for ev in events:
-        ticker = ev.get("event_ticker") or ev.get("series_ticker")
-        if not ticker:
-            continue
-
-        title = str(ev.get("title") or "")
-        sub_title = str(ev.get("sub_title") or "")
-        category = str(ev.get("category") or "")
-        text = f"{title}. {sub_title} [category: {category}]"
-
-        tickers.append(ticker)
-        texts.append(text)
-
-    if texts:
-        vectors = embed_texts(texts)
-        embeds = {t: v for t, v in zip(tickers, vectors)}
-    else:
-        embeds = {}
-
-    os.makedirs(os.path.dirname(embeds_path) or ".", exist_ok=True)
-    with open(embeds_path, "w") as f:
-        json.dump(embeds, f)
+    Pages stream from iter_open_event_pages() into embedding batches while
+    later pages are still downloading (see build_index_streaming()).
+    """
+    events, embeds = build_index_streaming(
+        iter_open_event_pages(),
+        key_fn=event_key,
+        text_fn=_event_text,
+        events_path=events_path,
+        embeds_path=embeds_path,
+    )
 
     # Populate in-process cache as well
     global _EVENTS_CACHE, _EVENT_EMBEDS
     _EVENTS_CACHE = events
     _EVENT_EMBEDS = embeds
 
+    # Related-events graph within this venue (self-matches excluded)
+    index = get_vector_index()
+    graph = NeighborGraph.build(
+        index.keys, index.matrix, index.keys, index.matrix, exclude_self=True
+    )
+    graph.save(DEFAULT_KNN_PATH)
+
 
 def ensure_events_index_on_disk(
     events_path: str = DEFAULT_EVENTS_PATH,
@@ -217,10 +227,57 @@ def ensure_events_index_on_disk(
     setup_events_index(events_path=events_path, embeds_path=embeds_path)
 
 
+def get_vector_index() -> EventVectorIndex:
+    """
+    Return the normalized embedding matrix for all open Kalshi events.
+
+    Built lazily from _load_events_and_embeddings() and rebuilt automatically
+    whenever the in-process events/embeddings cache is replaced.
+    """
+    global _VECTOR_INDEX
+    events, embeds = _load_events_and_embeddings()
+    if _VECTOR_INDEX is None or not _VECTOR_INDEX.is_built_from(events, embeds):
+        _VECTOR_INDEX = EventVectorIndex("kalshi", events, embeds, event_key)
+    return _VECTOR_INDEX
+
+
+def get_identifier_index() -> IdentifierIndex:
+    """
+    Return the hash + sorted-prefix index over Kalshi event/series tickers.
+
+    Built lazily and rebuilt automatically whenever the in-process events
+    cache is replaced.
+    """
+    global _IDENTIFIER_INDEX
+    events, _ = _load_events_and_embeddings()
+    if _IDENTIFIER_INDEX is None or not _IDENTIFIER_INDEX.is_built_from(events):
+        _IDENTIFIER_INDEX = IdentifierIndex(events, IDENTIFIER_FIELDS)
+    return _IDENTIFIER_INDEX
+
+
+def get_event_by_identifier(identifier: Any) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached open event whose event (or series) ticker equals
+    `identifier` (case-insensitive), or None. O(1) via the identifier index.
+    """
+    if identifier is None or identifier == "":
+        return None
+    return get_identifier_index().get_one(identifier)
+
+
+def cached_event_count() -> Optional[int]:
+    """
+    Number of open events in the in-process catalog, or None if it has not
+    been loaded yet. Never triggers a fetch or disk read.
+    """
+    return len(_EVENTS_CACHE) if _EVENTS_CACHE is not None else None
+
+
 def search_open_events(
     topic: str,
     limit: int = 10,
     categories: Optional[List[str]] = None,
+    full_payload: bool = False,
 ) -> Dict[str, Any]:
     """
     Embedding-based search over all open events using Gemini embeddings.
@@ -228,50 +285,36 @@ def search_open_events(
     - Considers every open event (no hard keyword gate), so paraphrases like
       "United States" vs "U.S. state" can still match.
     - Keeps everything local to this process: tiny in-memory "vector DB".
+    - Queries that look like an identifier are first resolved through
+      get_identifier_index(); only misses fall through to embedding search.
+    - Each hit is projected to SLIM_EVENT_FIELDS plus "score"; pass
+      full_payload=True to get the complete event payload instead.
     """
     q = (topic or "").strip()
     if not q:
         return {"topic": topic, "limit": limit, "total_matches": 0, "events": []}
 
-    events, embeds = _load_events_and_embeddings()
-    query_vec = embed_text(q)
-    if not query_vec:
-        return {"topic": topic, "limit": limit, "total_matches": 0, "events": []}
-
-    cat_set = {c.lower() for c in categories} if categories else None
-
-    scored: List[Dict[str, Any]] = []
-    for ev in events:
-        ticker = ev.get("event_ticker") or ev.get("series_ticker")
-        if not ticker:
-            continue
-
-        # Optional category filter
-        ev_cat = (ev.get("category") or "").lower()
-        if cat_set and ev_cat not in cat_set:
-            continue
-
-        ev_vec = embeds.get(ticker)
-        if not ev_vec:
-            continue
+    fields = None if full_payload else SLIM_EVENT_FIELDS
 
-        sim = _cosine_similarity(query_vec, ev_vec)
-        if sim <= 0.0:
-            continue
+    # Pasted tickers / ids that match a key exactly skip the embedding call;
+    # anything else ("2028", "covid-19") falls through to semantic search.
+    if looks_like_identifier(q):
+        matches = get_identifier_index().lookup(q, limit=limit, exact_required=True)
+        if matches:
+            return identifier_search_result(topic, limit, matches, fields=fields)
 
-        # Return the full event payload plus a similarity score.
-        ev_with_score = dict(ev)
-        ev_with_score["score"] = sim
-        scored.append(ev_with_score)
+    index = get_vector_index()
+    query_vec = normalize_vector(embed_text(q))
+    if query_vec is None:
+        return {"topic": topic, "limit": limit, "total_matches": 0, "events": []}
 
-    scored.sort(key=lambda x: x["score"], reverse=True)
-    top = scored[: max(0, limit)]
+    total, hits = index.search(query_vec, limit=limit, categories=categories)
 
     return {
         "topic": topic,
         "limit": limit,
-        "total_matches": len(scored),
-        "events": top,
+        "total_matches": total,
+        "events": [scored_event(ev, sim, fields) for ev, sim in hits],
     }
 
 
@@ -1,14 +1,20 @@
+import math
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 # Handle both package import and direct execution
 try:
-    from .kalshi_client import get_kalshi_client
+    from .kalshi_events import cached_event_count
+    from .kalshi_rest import get_events as get_events_page, get_markets as get_markets_page, iter_pages
+    from .market_cache import MARKET_METADATA, MARKET_PRICES, MarketCache, metadata_only, stamp_quotes
 except ImportError:
     # When running directly, add parent directory to path
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from tools.kalshi_client import get_kalshi_client
+    from tools.kalshi_events import cached_event_count
+    from tools.kalshi_rest import get_events as get_events_page, get_markets as get_markets_page, iter_pages
+    from tools.market_cache import MARKET_METADATA, MARKET_PRICES, MarketCache, metadata_only, stamp_quotes
 
 
 def market_to_dict(market: Any) -> Dict[str, Any]:
@@ -19,46 +25,214 @@ def market_to_dict(market: Any) -> Dict[str, Any]:
     return market.model_dump()
 
 
+# Events per sweep page (the GET /events maximum)
+SWEEP_PAGE_SIZE = 200
+
+# Open events assumed before the catalog has been loaded or swept once
+KALSHI_OPEN_EVENTS_ESTIMATE = 5_000
+
+# Open events seen by the last sweep_open_markets()
+_LAST_SWEEP_EVENTS: Optional[int] = None
+
+# Worker threads for concurrent per-event fetches; throughput is bounded by
+# kalshi_client.KALSHI_READ_LIMITER, so this only needs to cover the request latency.
+MARKET_FETCH_WORKERS = 16
+
+# event_ticker -> open markets; metadata served for hours, prices for seconds
+MARKET_CACHE = MarketCache()
+
+
+def _open_markets_only(markets: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Convert markets to dicts and *explicitly* keep only markets whose status
+    is "open". This defends against any API/SDK mismatch where non-open
+    statuses (e.g. "inactive") might slip through server-side filters.
+    """
+    open_markets: List[Dict[str, Any]] = []
+    for m in markets:
+        m_dict = m if isinstance(m, dict) else market_to_dict(m)
+        if m_dict.get("status") in ["open", "active"]:
+            open_markets.append(m_dict)
+    return open_markets
+
+
+def _select_fields(markets: List[Dict[str, Any]], fields: str) -> List[Dict[str, Any]]:
+    if fields == MARKET_METADATA:
+        return [metadata_only(m) for m in markets]
+    return markets
+
+
+def sweep_open_markets(limit: int = SWEEP_PAGE_SIZE) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch the open markets of every open event in one paginated sweep.
+
+    Uses GET /events with nested markets, so the whole catalog costs about
+    (open events / limit) requests instead of one request per event. The
+    result is grouped by event_ticker and stored in MARKET_CACHE, where
+    per-event lookups find it. Markets are stamped with their page's receive
+    time (source "kalshi_sweep").
+
+    Args:
+        limit: Events per page (max 200 per Kalshi docs).
+
+    Returns:
+        Dict mapping event_ticker -> list of open market dicts.
+    """
+    by_event: Dict[str, List[Dict[str, Any]]] = {}
+    requests_made = 0
+
+    for events in iter_pages(get_events_page, "events", limit=limit, status="open", with_nested_markets=True):
+        requests_made += 1
+        for ev in events:
+            event_ticker = ev.get("event_ticker")
+            if event_ticker:
+                by_event[event_ticker] = stamp_quotes(_open_markets_only(ev.get("markets") or []), "kalshi_sweep")
+
+    MARKET_CACHE.put_many(by_event)
+    global _LAST_SWEEP_EVENTS
+    _LAST_SWEEP_EVENTS = len(by_event)
+
+    n_markets = sum(len(v) for v in by_event.values())
+    print(f"Swept {n_markets} open Kalshi markets across {len(by_event)} events in {requests_made} requests")
+    return by_event
+
+
+def estimated_sweep_requests(limit: int = SWEEP_PAGE_SIZE) -> int:
+    """
+    Requests a sweep_open_markets() would make: open events / limit, using
+    the loaded Kalshi catalog, else the last sweep, else
+    KALSHI_OPEN_EVENTS_ESTIMATE.
+    """
+    n_events = cached_event_count() or _LAST_SWEEP_EVENTS or KALSHI_OPEN_EVENTS_ESTIMATE
+    return max(1, math.ceil(n_events / limit))
+
+
+def get_markets_for_events(
+    event_tickers: Iterable[str],
+    fields: str = MARKET_PRICES,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Retrieve open markets for many events at once.
+
+    Events with a cache entry fresh enough for `fields` are answered from
+    MARKET_CACHE. If more events remain than a sweep would need requests
+    (estimated_sweep_requests()), one sweep_open_markets() covers them;
+    anything still missing (or all of them, for small batches) is fetched via
+    fetch_markets_concurrently().
+
+    Args:
+        event_tickers: Kalshi event tickers.
+        fields: MARKET_PRICES for full markets with quotes no older than
+                MARKET_PRICE_TTL, or MARKET_METADATA for price-free markets
+                that may be served from the long-lived cache.
+
+    Returns:
+        Dict mapping each requested event_ticker -> list of open market dicts.
+    """
+    tickers = list(dict.fromkeys(t for t in event_tickers if t))
+
+    result: Dict[str, List[Dict[str, Any]]] = {}
+    missing: List[str] = []
+    for ticker in tickers:
+        cached = MARKET_CACHE.get(ticker, fields)
+        if cached is not None:
+            result[ticker] = cached
+        else:
+            missing.append(ticker)
+
+    if len(missing) > estimated_sweep_requests():
+        swept = sweep_open_markets()
+        still_missing = []
+        for ticker in missing:
+            if ticker in swept:
+                result[ticker] = _select_fields(list(swept[ticker]), fields)
+            else:
+                still_missing.append(ticker)
+        missing = still_missing
+
+    for ticker, markets in fetch_markets_concurrently(missing).items():
+        result[ticker] = _select_fields(markets, fields)
+    return {ticker: result[ticker] for ticker in tickers}
+
+
+def fetch_markets_concurrently(
+    event_tickers: Iterable[str],
+    max_workers: int = MARKET_FETCH_WORKERS,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Fetch open markets for each event on a worker pool.
+
+    Every request first takes a token from kalshi_client.KALSHI_READ_LIMITER, so the pool
+    runs at the configured Kalshi read rate rather than at serial latency.
+    Results are stored in MARKET_CACHE. An event whose fetch fails is logged
+    and mapped to an empty list (and not cached).
+
+    Returns:
+        Dict mapping event_ticker -> list of open market dicts.
+    """
+    tickers = list(dict.fromkeys(t for t in event_tickers if t))
+    if not tickers:
+        return {}
+
+    def fetch(ticker: str) -> List[Dict[str, Any]]:
+        try:
+            markets = _fetch_markets_for_event(ticker)
+        except Exception as e:
+            print(f"Error fetching Kalshi markets for {ticker}: {e}")
+            return []
+        MARKET_CACHE.put(ticker, markets)
+        return markets
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as pool:
+        return dict(zip(tickers, pool.map(fetch, tickers)))
+
+
 def get_markets_for_event(
     event_ticker: str,
     limit: int = 1000,
+    fields: str = MARKET_PRICES,
 ) -> List[Dict[str, Any]]:
     """
     Retrieve **all** open markets for a given event ticker, handling pagination.
 
+    Answered from MARKET_CACHE when an entry is fresh enough for `fields`;
+    otherwise fetched from the API and cached.
+
     Args:
         event_ticker: Full Kalshi event ticker (e.g. "KXELONMARS-99").
         limit: Page size for API calls (max 1000 per Kalshi docs).
+        fields: MARKET_PRICES (default) for full markets with quotes no older
+                than MARKET_PRICE_TTL; MARKET_METADATA for price-free markets
+                that may come from the long-lived metadata cache.
 
     Returns:
         List of market dicts for the specified event.
     """
-    client = get_kalshi_client()
+    cached = MARKET_CACHE.get(event_ticker, fields)
+    if cached is not None:
+        return cached
+    markets = _fetch_markets_for_event(event_ticker, limit=limit)
+    MARKET_CACHE.put(event_ticker, markets)
+    return _select_fields(markets, fields)
 
+
+def _fetch_markets_for_event(
+    event_ticker: str,
+    limit: int = 1000,
+) -> List[Dict[str, Any]]:
+    """
+    Page through GET /markets for a single event. Markets are stamped with
+    their page's receive time (source "kalshi_rest").
+    """
     all_markets: List[Dict[str, Any]] = []
-    cursor: Optional[str] = None
-
-    while True:
-        resp = client.get_markets(
-            limit=limit,
-            cursor=cursor,
-            event_ticker=event_ticker,
-            status="open",
-        )
-
-        markets = getattr(resp, "markets", []) or []
-
-        # Convert to dicts and *explicitly* keep only markets whose status is "open".
-        # This defends against any API/SDK mismatch where non-open statuses
-        # (e.g. "inactive") might slip through server-side filters.
-        for m in markets:
-            m_dict = market_to_dict(m)
-            if m_dict.get("status") in ["open", "active"]:
-                all_markets.append(m_dict)
-
-        cursor = getattr(resp, "cursor", None)
-        if not cursor:
-            break
+    for markets in iter_pages(
+        get_markets_page,
+        "markets",
+        limit=limit,
+        event_ticker=event_ticker,
+        status="open",
+    ):
+        all_markets.extend(stamp_quotes(_open_markets_only(markets), "kalshi_rest"))
 
     return all_markets
 
@@ -0,0 +1,190 @@
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import quote
+
+import requests
+
+# Handle both package import and direct execution
+try:
+    from .http_session import get_http_session
+    from .kalshi_client import KALSHI_HOST, KALSHI_READ_LIMITER
+    from .projection import project_fields
+    from .resilience import get_circuit_breaker, send_with_retry
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.http_session import get_http_session
+    from tools.kalshi_client import KALSHI_HOST, KALSHI_READ_LIMITER
+    from tools.projection import project_fields
+    from tools.resilience import get_circuit_breaker, send_with_retry
+
+
+# Raw-JSON reads for Kalshi's public market-data endpoints (GET /events,
+# GET /markets, GET /markets/{ticker}/orderbook).
+#
+# The SDK validates every response into pydantic models, which callers then
+# turn back into dicts with model_dump(); for a catalog of thousands of
+# markets that round trip dominates CPU time, and its strict enum validation
+# is what the README's local SDK patches work around. These endpoints need no
+# authentication, so they are read here straight off the pooled HTTP session
+# and returned as the plain dicts the API sent. Trading and portfolio calls
+# still go through get_kalshi_client().
+
+
+def _query_params(params: Dict[str, Any]) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    for k, v in params.items():
+        if v is None or v == "":
+            continue
+        if isinstance(v, bool):
+            v = "true" if v else "false"
+        out[k] = v
+    return out
+
+
+def kalshi_get_json(path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    GET `path` (relative to KALSHI_HOST) and return the decoded JSON body.
+
+    Every attempt takes a token from KALSHI_READ_LIMITER first. Throttling,
+    server errors and dropped connections are retried with backoff (see
+    resilience.send_with_retry) under the "kalshi" circuit breaker. Raises
+    requests.HTTPError on a non-2xx final response and CircuitOpenError while
+    Kalshi is failing.
+    """
+    session = get_http_session()
+    url = f"{KALSHI_HOST}/{path.lstrip('/')}"
+    query = _query_params(params or {})
+
+    def send() -> requests.Response:
+        KALSHI_READ_LIMITER.acquire()
+        return session.get(url, params=query)
+
+    resp = send_with_retry(send, get_circuit_breaker("kalshi"))
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _project(records: List[Dict[str, Any]], fields: Optional[Iterable[str]]) -> List[Dict[str, Any]]:
+    if fields is None:
+        return records
+    fields = tuple(fields)
+    return [project_fields(r, fields) for r in records]
+
+
+def get_events(
+    limit: int = 200,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    series_ticker: Optional[str] = None,
+    with_nested_markets: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    market_fields: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    One page of GET /events as plain dicts.
+
+    Args:
+        limit: Events per page (max 200).
+        cursor: Cursor from the previous page, or None for the first page.
+        status: e.g. "open".
+        series_ticker: Restrict to one series.
+        with_nested_markets: Include each event's markets under "markets".
+        fields: Keep only these event fields (None = everything the API sent).
+        market_fields: Same, for nested markets.
+
+    Returns:
+        {"events": [...], "cursor": str or None}
+    """
+    body = kalshi_get_json(
+        "/events",
+        {
+            "limit": limit,
+            "cursor": cursor,
+            "status": status,
+            "series_ticker": series_ticker,
+            "with_nested_markets": with_nested_markets or None,
+        },
+    )
+    events = body.get("events") or []
+    if market_fields is not None:
+        market_fields = tuple(market_fields)
+        for ev in events:
+            if ev.get("markets"):
+                ev["markets"] = _project(ev["markets"], market_fields)
+    return {"events": _project(events, fields), "cursor": body.get("cursor") or None}
+
+
+def get_markets(
+    limit: int = 1000,
+    cursor: Optional[str] = None,
+    event_ticker: Optional[str] = None,
+    series_ticker: Optional[str] = None,
+    status: Optional[str] = None,
+    tickers: Optional[Iterable[str]] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> Dict[str, Any]:
+    """
+    One page of GET /markets as plain dicts.
+
+    Args:
+        limit: Markets per page (max 1000).
+        cursor: Cursor from the previous page, or None for the first page.
+        event_ticker / series_ticker: Restrict to one event or series.
+        status: e.g. "open".
+        tickers: Restrict to these market tickers.
+        fields: Keep only these market fields (None = everything the API sent).
+
+    Returns:
+        {"markets": [...], "cursor": str or None}
+    """
+    body = kalshi_get_json(
+        "/markets",
+        {
+            "limit": limit,
+            "cursor": cursor,
+            "event_ticker": event_ticker,
+            "series_ticker": series_ticker,
+            "status": status,
+            "tickers": ",".join(tickers) if tickers else None,
+        },
+    )
+    markets = body.get("markets") or []
+    return {"markets": _project(markets, fields), "cursor": body.get("cursor") or None}
+
+
+def get_orderbook(ticker: str, depth: Optional[int] = None) -> Dict[str, Any]:
+    """
+    GET /markets/{ticker}/orderbook as a plain dict.
+
+    Kalshi books only hold bids: {"yes": [[price_cents, contracts], ...],
+    "no": [...]}, each sorted by ascending price (best bid last). A side with
+    no resting orders may be null or missing.
+
+    Args:
+        ticker: Market ticker.
+        depth: Levels per side (None = the API's full book).
+    """
+    body = kalshi_get_json(f"/markets/{quote(ticker, safe='')}/orderbook", {"depth": depth})
+    return body.get("orderbook") or {}
+
+
+def iter_pages(fetch_page: Any, items_key: str, **kwargs: Any) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Follow Kalshi cursors: call fetch_page(cursor=..., **kwargs) (get_events
+    or get_markets) until the API returns no cursor, yielding each page's
+    `items_key` list.
+    """
+    cursor: Optional[str] = None
+    while True:
+        page = fetch_page(cursor=cursor, **kwargs)
+        yield page[items_key]
+        cursor = page["cursor"]
+        if not cursor:
+            break
+
+
+if __name__ == "__main__":
+    page = get_events(limit=5, status="open", fields=("event_ticker", "title"))
+    print(page)
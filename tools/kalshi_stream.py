@@ -0,0 +1,234 @@
+import json
+import os
+import sys
+from pathlib import Path
+from urllib.parse import urlparse
+from typing import Any, Dict, Iterable, List, Optional
+
+from websockets.sync.client import ClientConnection
+
+# Handle both package import and direct execution
+try:
+    from .kalshi_client import get_kalshi_client
+    from .market_cache import QUOTE_SOURCE, RECEIVED_AT
+    from .quote_book import Quote, QuoteBook
+    from .ws_feed import ResubscribeRequired, WebSocketFeed
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.kalshi_client import get_kalshi_client
+    from tools.market_cache import QUOTE_SOURCE, RECEIVED_AT
+    from tools.quote_book import Quote, QuoteBook
+    from tools.ws_feed import ResubscribeRequired, WebSocketFeed
+
+
+KALSHI_WS_URL = os.getenv("KALSHI_WS_URL") or "wss://api.elections.kalshi.com/trade-api/ws/v2"
+
+# orderbook_delta gives full depth (snapshot + deltas) and so sizes;
+# ticker gives top of book for markets whose snapshot hasn't arrived yet.
+KALSHI_WS_CHANNELS = ("orderbook_delta", "ticker")
+
+
+class _KalshiOrderbook:
+    """
+    Resting bids for one market in cents: price -> contracts, per side.
+
+    Kalshi books only hold bids; a YES ask is the complement of the best NO
+    bid (yes_ask = 100 - best_no_bid) with that bid's size.
+    """
+
+    __slots__ = ("yes", "no")
+
+    def __init__(self, yes: Iterable[Any], no: Iterable[Any]):
+        self.yes: Dict[int, int] = {int(p): int(q) for p, q in yes or [] if int(q) > 0}
+        self.no: Dict[int, int] = {int(p): int(q) for p, q in no or [] if int(q) > 0}
+
+    def apply_delta(self, side: str, price: int, delta: int) -> None:
+        levels = self.yes if side == "yes" else self.no
+        qty = levels.get(price, 0) + delta
+        if qty > 0:
+            levels[price] = qty
+        else:
+            levels.pop(price, None)
+
+    def top(self) -> Dict[str, Optional[float]]:
+        best_yes = max(self.yes) if self.yes else None
+        best_no = max(self.no) if self.no else None
+        return {
+            "yes_bid": best_yes / 100.0 if best_yes is not None else None,
+            "yes_bid_size": self.yes[best_yes] if best_yes is not None else None,
+            "yes_ask": (100 - best_no) / 100.0 if best_no is not None else None,
+            "yes_ask_size": self.no[best_no] if best_no is not None else None,
+        }
+
+
+def kalshi_ws_auth_headers(url: str = KALSHI_WS_URL) -> Dict[str, str]:
+    """
+    Signed handshake headers for the Kalshi WebSocket (same RSA-PSS scheme as
+    REST, over "GET <url path>").
+    """
+    auth = get_kalshi_client().kalshi_auth
+    if auth is None:
+        return {}
+    return auth.create_auth_headers("GET", urlparse(url).path)
+
+
+class KalshiQuoteStream(WebSocketFeed):
+    """
+    Streams top of book for a watchlist of Kalshi market tickers into a
+    QuoteBook (prices in dollars, sizes in contracts).
+
+    Usage:
+        stream = KalshiQuoteStream(["KXFED-25DEC-T4.00"]).start()
+        stream.wait_connected(10)
+        quote = stream.book.get("KXFED-25DEC-T4.00")
+
+    `url` may point at a local stand-in server. Handshakes are signed for
+    wss:// URLs by default and not for plain ws:// (local) ones; pass
+    `authenticate` to force either way.
+    """
+
+    name = "kalshi"
+
+    def __init__(
+        self,
+        market_tickers: Iterable[str],
+        book: Optional[QuoteBook] = None,
+        url: str = KALSHI_WS_URL,
+        authenticate: Optional[bool] = None,
+        channels: Iterable[str] = KALSHI_WS_CHANNELS,
+    ):
+        super().__init__(url)
+        self.market_tickers: List[str] = list(dict.fromkeys(t for t in market_tickers if t))
+        self.book = book if book is not None else QuoteBook("kalshi")
+        self.authenticate = url.startswith("wss://") if authenticate is None else authenticate
+        self.channels = list(channels)
+        self._orderbooks: Dict[str, _KalshiOrderbook] = {}
+        self._seq: Dict[int, int] = {}
+
+    def connect_headers(self) -> Dict[str, str]:
+        # Signatures embed a timestamp, so sign again on every reconnect
+        return kalshi_ws_auth_headers(self.url) if self.authenticate else {}
+
+    def on_open(self, ws: ClientConnection) -> None:
+        ws.send(json.dumps({
+            "id": 1,
+            "cmd": "subscribe",
+            "params": {"channels": self.channels, "market_tickers": self.market_tickers},
+        }))
+
+    def on_disconnect(self) -> None:
+        # Fresh snapshots follow the next subscription
+        self._orderbooks.clear()
+        self._seq.clear()
+
+    def get(self, market_ticker: str) -> Optional[Quote]:
+        return self.book.get(market_ticker)
+
+    def live_quote(self, market_ticker: str) -> Optional[Quote]:
+        """
+        The streamed quote for `market_ticker` if it is current, else None.
+
+        A quote is current while the feed is connected and the market's book
+        was snapshotted on this connection: the book then holds as of the
+        last message received, even if this market has been quiet, so the
+        quote is dated last_message_at rather than its last change.
+        """
+        quote = self.book.get(market_ticker)
+        last_message_at = self.last_message_at
+        if quote is None or last_message_at is None or not self.connected:
+            return None
+        if market_ticker not in self._orderbooks:
+            return None
+        return quote._replace(received_at=max(quote.received_at, last_message_at))
+
+    def _check_seq(self, message: Dict[str, Any]) -> None:
+        sid, seq = message.get("sid"), message.get("seq")
+        if sid is None or seq is None:
+            return
+        last = self._seq.get(sid)
+        if last is not None and seq != last + 1:
+            raise ResubscribeRequired(f"orderbook sequence gap on sid {sid} ({last} -> {seq})")
+        self._seq[sid] = seq
+
+    def _publish(self, ticker: str, ts: Optional[float] = None) -> None:
+        self.book.update(ticker, ts=ts, **self._orderbooks[ticker].top())
+
+    def handle_message(self, message: Any) -> None:
+        if not isinstance(message, dict):
+            return
+        kind = message.get("type")
+        msg = message.get("msg") or {}
+        ticker = msg.get("market_ticker")
+
+        if kind == "orderbook_snapshot":
+            self._check_seq(message)
+            self._orderbooks[ticker] = _KalshiOrderbook(msg.get("yes"), msg.get("no"))
+            self._publish(ticker)
+        elif kind == "orderbook_delta":
+            self._check_seq(message)
+            orderbook = self._orderbooks.get(ticker)
+            if orderbook is None:
+                raise ResubscribeRequired(f"delta for {ticker} before its snapshot")
+            orderbook.apply_delta(msg.get("side"), int(msg["price"]), int(msg["delta"]))
+            self._publish(ticker)
+        elif kind == "ticker":
+            # Depth-backed quotes win; ticker only fills the gap before a snapshot
+            if ticker and ticker not in self._orderbooks:
+                yes_bid, yes_ask = msg.get("yes_bid"), msg.get("yes_ask")
+                self.book.update(
+                    ticker,
+                    yes_bid=yes_bid / 100.0 if yes_bid is not None else None,
+                    yes_ask=yes_ask / 100.0 if yes_ask is not None else None,
+                    ts=msg.get("ts"),
+                )
+        elif kind == "error":
+            print(f"kalshi: subscription error {msg}")
+
+
+def overlay_quotes(markets: List[Dict[str, Any]], stream: KalshiQuoteStream) -> List[Dict[str, Any]]:
+    """
+    Return copies of Kalshi market dicts with yes/no bid/ask (in cents, as the
+    REST API reports them) replaced by the stream's quotes.
+
+    While the feed is connected, subscribed markets always take the streamed
+    quote (see live_quote()). Otherwise a stored quote is used only if it is
+    newer than the market's own REST quotes. Overlaid markets are stamped
+    with the stream quote's receive time.
+    """
+    out: List[Dict[str, Any]] = []
+    for market in markets:
+        ticker = market.get("ticker")
+        quote = stream.live_quote(ticker)
+        if quote is None:
+            # Feed down: fall back to REST unless the stream saw something later
+            quote = stream.get(ticker)
+            received_at = market.get(RECEIVED_AT)
+            if quote is None or (received_at is not None and received_at > quote.received_at):
+                out.append(market)
+                continue
+        market = dict(market)
+        market[RECEIVED_AT] = quote.received_at
+        market[QUOTE_SOURCE] = "kalshi_ws"
+        for field, value in (
+            ("yes_bid", quote.yes_bid),
+            ("yes_ask", quote.yes_ask),
+            ("no_bid", quote.no_bid),
+            ("no_ask", quote.no_ask),
+        ):
+            market[field] = round(value * 100) if value is not None else None
+        out.append(market)
+    return out
+
+
+if __name__ == "__main__":
+    import time
+
+    # Simple manual test: stream a sample market for ten seconds.
+    sample_tickers = ["KXGRETAGAZA-26JAN01"]
+    with KalshiQuoteStream(sample_tickers) as stream:
+        stream.wait_connected(10)
+        for _ in range(10):
+            time.sleep(1)
+            for quote in stream.book.snapshot().values():
+                print(quote)
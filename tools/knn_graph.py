@@ -0,0 +1,234 @@
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Neighbors kept per event in the precomputed graphs
+DEFAULT_KNN_K = 20
+# Rows of the source matrix scored per matmul block (bounds peak memory)
+_BLOCK_SIZE = 1024
+
+
+def top_k_neighbors(
+    src: np.ndarray,
+    dst: np.ndarray,
+    k: int = DEFAULT_KNN_K,
+    exclude_self: bool = False,
+    self_offset: int = 0,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Compute the top-k cosine neighbors in `dst` for every row of `src`.
+
+    Both matrices must already be L2-normalized. Similarities are computed in
+    row blocks so memory stays O(block * n_dst) instead of O(n_src * n_dst).
+    Only positive similarities are kept.
+
+    With exclude_self, source row i is the same event as dst row
+    i + self_offset and is never its own neighbor (self_offset lets `src` be
+    the trailing slice of `dst`).
+
+    Returns CSR arrays (indptr, indices, scores): the neighbors of source row i
+    are indices[indptr[i]:indptr[i + 1]], sorted by descending score.
+    """
+    n_src = src.shape[0]
+    n_dst = dst.shape[0]
+    indptr = np.zeros(n_src + 1, dtype=np.int64)
+    if n_src == 0 or n_dst == 0 or k <= 0:
+        return indptr, np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+
+    kk = min(k, n_dst - 1 if exclude_self else n_dst)
+    if kk <= 0:
+        return indptr, np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+
+    all_indices: List[np.ndarray] = []
+    all_scores: List[np.ndarray] = []
+    for start in range(0, n_src, _BLOCK_SIZE):
+        stop = min(start + _BLOCK_SIZE, n_src)
+        sims = src[start:stop] @ dst.T
+        if exclude_self:
+            rows = np.arange(stop - start)
+            sims[rows, rows + start + self_offset] = -np.inf
+
+        top = np.argpartition(-sims, kk - 1, axis=1)[:, :kk]
+        top_sims = np.take_along_axis(sims, top, axis=1)
+        order = np.argsort(-top_sims, axis=1, kind="stable")
+        top = np.take_along_axis(top, order, axis=1)
+        top_sims = np.take_along_axis(top_sims, order, axis=1)
+
+        for r in range(stop - start):
+            keep = top_sims[r] > 0.0
+            all_indices.append(top[r][keep].astype(np.int32))
+            all_scores.append(top_sims[r][keep].astype(np.float32))
+            indptr[start + r + 1] = indptr[start + r] + int(keep.sum())
+
+    return indptr, np.concatenate(all_indices), np.concatenate(all_scores)
+
+
+class NeighborGraph:
+    """
+    Sparse top-k neighbor graph between two sets of event keys, stored as CSR.
+
+    Row i lists the nearest `dst_keys` of `src_keys[i]`; reading the
+    neighbors of one event is a dict lookup plus an O(k) slice.
+    """
+
+    def __init__(
+        self,
+        src_keys: Sequence[str],
+        dst_keys: Sequence[str],
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        scores: np.ndarray,
+    ) -> None:
+        self.src_keys = list(src_keys)
+        self.dst_keys = list(dst_keys)
+        self.indptr = indptr
+        self.indices = indices
+        self.scores = scores
+        self._src_pos: Dict[str, int] = {key: i for i, key in enumerate(self.src_keys)}
+
+    @classmethod
+    def build(
+        cls,
+        src_keys: Sequence[str],
+        src_matrix: np.ndarray,
+        dst_keys: Sequence[str],
+        dst_matrix: np.ndarray,
+        k: int = DEFAULT_KNN_K,
+        exclude_self: bool = False,
+    ) -> "NeighborGraph":
+        indptr, indices, scores = top_k_neighbors(
+            src_matrix, dst_matrix, k=k, exclude_self=exclude_self
+        )
+        return cls(src_keys, dst_keys, indptr, indices, scores)
+
+    def extend(
+        self,
+        src_keys: Sequence[str],
+        src_matrix: np.ndarray,
+        dst_keys: Sequence[str],
+        dst_matrix: np.ndarray,
+        k: int = DEFAULT_KNN_K,
+        exclude_self: bool = False,
+    ) -> Optional["NeighborGraph"]:
+        """
+        Return this graph grown to key lists that only append to the stored ones.
+
+        New source rows are scored against every destination; existing rows
+        only against the appended destinations, merged into their stored
+        top-k. The result equals a full build() over the new keys. Returns
+        None if the stored keys are not a prefix of the new ones (events were
+        removed or reordered), in which case callers rebuild.
+        """
+        n_src_old = len(self.src_keys)
+        n_dst_old = len(self.dst_keys)
+        if (
+            list(src_keys[:n_src_old]) != self.src_keys
+            or list(dst_keys[:n_dst_old]) != self.dst_keys
+        ):
+            return None
+        n_src = len(src_keys)
+        n_dst = len(dst_keys)
+        if n_src == n_src_old and n_dst == n_dst_old:
+            return self
+
+        row_indices: List[np.ndarray] = []
+        row_scores: List[np.ndarray] = []
+        kk = min(k, n_dst - 1 if exclude_self else n_dst)
+        for start in range(0, n_src_old, _BLOCK_SIZE):
+            stop = min(start + _BLOCK_SIZE, n_src_old)
+            # Old sources are dst rows < n_dst_old, so never among the new columns
+            sims = src_matrix[start:stop] @ dst_matrix[n_dst_old:].T
+            for r in range(stop - start):
+                a = int(self.indptr[start + r])
+                b = int(self.indptr[start + r + 1])
+                old_idx = self.indices[a:b]
+                old_sc = self.scores[a:b]
+                row = sims[r]
+                # Rows already full only change if a new score beats their worst
+                floor = float(old_sc[-1]) if b - a >= kk and b > a else 0.0
+                new_pos = np.nonzero(row > floor)[0]
+                if new_pos.size == 0:
+                    row_indices.append(old_idx)
+                    row_scores.append(old_sc)
+                    continue
+                idx = np.concatenate([old_idx, (new_pos + n_dst_old).astype(np.int32)])
+                sc = np.concatenate([old_sc, row[new_pos].astype(np.float32)])
+                order = np.argsort(-sc, kind="stable")[:kk]
+                row_indices.append(idx[order])
+                row_scores.append(sc[order])
+
+        new_indptr, new_indices, new_scores = top_k_neighbors(
+            src_matrix[n_src_old:],
+            dst_matrix,
+            k=k,
+            exclude_self=exclude_self,
+            self_offset=n_src_old,
+        )
+
+        indptr = np.zeros(n_src + 1, dtype=np.int64)
+        indptr[1 : n_src_old + 1] = np.cumsum([len(ix) for ix in row_indices], dtype=np.int64)
+        indptr[n_src_old + 1 :] = indptr[n_src_old] + new_indptr[1:]
+        indices = np.concatenate(row_indices + [new_indices]).astype(np.int32)
+        scores = np.concatenate(row_scores + [new_scores]).astype(np.float32)
+        return NeighborGraph(src_keys, dst_keys, indptr, indices, scores)
+
+    @property
+    def num_edges(self) -> int:
+        return int(self.indices.shape[0])
+
+    @property
+    def k(self) -> int:
+        """Most neighbors stored for any source event (the k it was built with)."""
+        return int(np.diff(self.indptr).max()) if len(self.src_keys) else 0
+
+    def matches_keys(self, src_keys: Sequence[str], dst_keys: Sequence[str]) -> bool:
+        """True if the graph was built over exactly these key lists (same order)."""
+        return self.src_keys == list(src_keys) and self.dst_keys == list(dst_keys)
+
+    def neighbors(self, key: str, k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Return up to `k` (neighbor_key, score) pairs for `key`, best first."""
+        pos = self._src_pos.get(key)
+        if pos is None:
+            return []
+        start = int(self.indptr[pos])
+        stop = int(self.indptr[pos + 1])
+        if k is not None:
+            stop = min(stop, start + max(0, k))
+        return [
+            (self.dst_keys[int(j)], float(s))
+            for j, s in zip(self.indices[start:stop], self.scores[start:stop])
+        ]
+
+    def edges(self, min_score: float = 0.0):
+        """Yield (src_key, dst_key, score) for every stored edge with score >= min_score."""
+        for i, src_key in enumerate(self.src_keys):
+            start = int(self.indptr[i])
+            stop = int(self.indptr[i + 1])
+            for j, s in zip(self.indices[start:stop], self.scores[start:stop]):
+                if s >= min_score:
+                    yield src_key, self.dst_keys[int(j)], float(s)
+
+    def save(self, path: str) -> None:
+        """Persist the CSR arrays and key lists to a compressed .npz file."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez_compressed(
+                f,
+                src_keys=np.asarray(self.src_keys, dtype=str),
+                dst_keys=np.asarray(self.dst_keys, dtype=str),
+                indptr=self.indptr,
+                indices=self.indices,
+                scores=self.scores,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "NeighborGraph":
+        with np.load(path) as data:
+            return cls(
+                data["src_keys"].tolist(),
+                data["dst_keys"].tolist(),
+                data["indptr"],
+                data["indices"],
+                data["scores"],
+            )
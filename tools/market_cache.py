@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import dotenv
+
+dotenv.load_dotenv()
+
+
+# What a caller needs from cached markets:
+# - MARKET_METADATA: titles, rules, strikes, timing. Price/volume fields are
+#   stripped, so long-lived entries never leak stale quotes.
+# - MARKET_PRICES: the full market including quotes, only if fetched within
+#   the (short) price TTL.
+MARKET_METADATA = "metadata"
+MARKET_PRICES = "prices"
+
+# Seconds a fetched market list may serve metadata / price reads
+MARKET_METADATA_TTL = float(os.getenv("MARKET_METADATA_TTL") or 6 * 60 * 60)
+MARKET_PRICE_TTL = float(os.getenv("MARKET_PRICE_TTL") or 5)
+
+# Stamped onto every price-bearing market dict: when its quotes were received
+# (epoch seconds, None if unknown) and where they came from (e.g.
+# "kalshi_rest", "polymarket_ws"). Cached copies keep the original stamp, so
+# a cache hit still reports the quotes' true age.
+RECEIVED_AT = "_received_at"
+QUOTE_SOURCE = "_source"
+
+# Fields that change while a market trades (quotes, activity, outcome).
+# Anything containing one of the substrings below is treated the same way.
+# Lifecycle flags (status / active / closed) are kept as metadata: cached
+# lists only ever hold markets that were open when fetched.
+_DYNAMIC_FIELDS_EXACT = {
+    # Kalshi
+    "result",
+    "open_interest",
+    "settlement_value",
+    "expiration_value",
+    # Polymarket
+    "acceptingOrders",
+    "outcomePrices",
+    "competitive",
+    # Quote stamps describe the prices, so they go wherever prices go
+    RECEIVED_AT,
+    QUOTE_SOURCE,
+}
+_DYNAMIC_SUBSTRINGS = ("price", "ask", "bid", "spread", "liquidity", "volume", "interest")
+
+
+def is_price_field(key: str) -> bool:
+    """
+    True for market fields that must not be served from a long-lived cache.
+    """
+    if key in _DYNAMIC_FIELDS_EXACT:
+        return True
+    kl = key.lower()
+    return any(sub in kl for sub in _DYNAMIC_SUBSTRINGS)
+
+
+def metadata_only(market: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of `market` without price / activity fields.
+    """
+    return {k: v for k, v in market.items() if not is_price_field(k)}
+
+
+def stamp_quotes(
+    markets: List[Dict[str, Any]],
+    source: str,
+    received_at: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Stamp market dicts (in place) with the receive time of their quotes
+    (default: now) and their source. Returns `markets`.
+    """
+    if received_at is None:
+        received_at = time.time()
+    for m in markets:
+        m[RECEIVED_AT] = received_at
+        m[QUOTE_SOURCE] = source
+    return markets
+
+
+def quote_age(market: Dict[str, Any], now: Optional[float] = None) -> Optional[float]:
+    """
+    Seconds since the market's quotes were received, or None if unstamped.
+    """
+    received_at = market.get(RECEIVED_AT)
+    if received_at is None:
+        return None
+    return (now if now is not None else time.time()) - received_at
+
+
+class MarketCache:
+    """
+    In-process cache of market lists keyed by event, with one TTL for static
+    metadata and a much shorter one for prices.
+
+    An entry fetched at time t answers MARKET_PRICES reads until
+    t + price_ttl and MARKET_METADATA reads (price fields stripped) until
+    t + metadata_ttl. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        metadata_ttl: float = MARKET_METADATA_TTL,
+        price_ttl: float = MARKET_PRICE_TTL,
+    ):
+        self.metadata_ttl = metadata_ttl
+        self.price_ttl = price_ttl
+        self._entries: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, event_key: str, markets: List[Dict[str, Any]]) -> None:
+        """
+        Store a freshly fetched market list for `event_key`.
+        """
+        with self._lock:
+            self._entries[event_key] = (time.monotonic(), [dict(m) for m in markets])
+
+    def put_many(self, markets_by_event: Dict[str, List[Dict[str, Any]]]) -> None:
+        """
+        Store several freshly fetched market lists at once.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for event_key, markets in markets_by_event.items():
+                self._entries[event_key] = (now, [dict(m) for m in markets])
+
+    def get(
+        self,
+        event_key: str,
+        fields: str = MARKET_PRICES,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return cached markets for `event_key`, or None if there is no entry
+        fresh enough for `fields` (MARKET_PRICES or MARKET_METADATA).
+        """
+        with self._lock:
+            entry = self._entries.get(event_key)
+        if entry is None:
+            return None
+
+        fetched_at, markets = entry
+        age = time.monotonic() - fetched_at
+        if fields == MARKET_METADATA:
+            if age >= self.metadata_ttl:
+                return None
+            return [metadata_only(m) for m in markets]
+        if fields != MARKET_PRICES:
+            raise ValueError(f"Unknown market fields policy: {fields!r}")
+        if age >= self.price_ttl:
+            return None
+        return [dict(m) for m in markets]
+
+    def invalidate(self, event_key: Optional[str] = None) -> None:
+        """
+        Drop one event's entry, or everything when `event_key` is None.
+        """
+        with self._lock:
+            if event_key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(event_key, None)
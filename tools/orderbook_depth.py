@@ -0,0 +1,281 @@
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import requests
+
+# Handle both package import and direct execution
+try:
+    from .http_session import get_http_session
+    from .kalshi_rest import get_orderbook
+    from .polymarket import POLYMARKET_CLOB_URL
+    from .polymarket_stream import clob_token_ids
+    from .resilience import get_circuit_breaker, send_with_retry
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.http_session import get_http_session
+    from tools.kalshi_rest import get_orderbook
+    from tools.polymarket import POLYMARKET_CLOB_URL
+    from tools.polymarket_stream import clob_token_ids
+    from tools.resilience import get_circuit_breaker, send_with_retry
+
+
+# Concurrent requests per venue. Kalshi has no batch orderbook endpoint, so
+# each ticker is one request (paced by KALSHI_READ_LIMITER); CLOB books are
+# batched and need far fewer.
+DEPTH_FETCH_WORKERS = 8
+
+# Token ids per POST /books request
+CLOB_BOOKS_BATCH_SIZE = 100
+
+# The CLOB is a different service from Gamma, so it fails independently
+CLOB_BREAKER = get_circuit_breaker("polymarket-clob")
+
+
+def _levels(rows: Iterable[Tuple[float, float]], descending: bool) -> np.ndarray:
+    """(n, 2) float array of [price, size], best price first, empty levels dropped."""
+    levels = np.array([r for r in rows if r[1] > 0], dtype=np.float64).reshape(-1, 2)
+    order = np.argsort(levels[:, 0], kind="stable")
+    return levels[order[::-1] if descending else order]
+
+
+def _complement(levels: np.ndarray) -> np.ndarray:
+    """YES levels as the opposite side of NO (price -> 1 - price); order is kept."""
+    out = levels.copy()
+    out[:, 0] = 1.0 - out[:, 0]
+    return out
+
+
+class DepthBook(NamedTuple):
+    """
+    Order book for one binary market, normalized across venues.
+
+    yes_bids / yes_asks are (n, 2) float arrays of [price in dollars (0-1),
+    size in contracts], best price first. NO levels are their complements
+    (buying NO at 1 - p takes the other side of a YES bid at p).
+    """
+
+    venue: str
+    market_id: str
+    yes_bids: np.ndarray
+    yes_asks: np.ndarray
+    received_at: float
+
+    @property
+    def no_bids(self) -> np.ndarray:
+        return _complement(self.yes_asks)
+
+    @property
+    def no_asks(self) -> np.ndarray:
+        return _complement(self.yes_bids)
+
+
+def _kalshi_side(orderbook: Dict[str, Any], side: str) -> List[Tuple[float, float]]:
+    # Integer-cent levels, or the dollar-string variant newer responses add
+    levels = orderbook.get(side)
+    if levels:
+        return [(float(p) / 100.0, float(q)) for p, q in levels]
+    return [(float(p), float(q)) for p, q in orderbook.get(f"{side}_dollars") or []]
+
+
+def kalshi_depth_book(ticker: str, orderbook: Dict[str, Any], received_at: Optional[float] = None) -> DepthBook:
+    """
+    Normalize a Kalshi orderbook (bids only, per side) into a DepthBook.
+    """
+    no_bids = _levels(_kalshi_side(orderbook, "no"), descending=True)
+    return DepthBook(
+        venue="kalshi",
+        market_id=ticker,
+        yes_bids=_levels(_kalshi_side(orderbook, "yes"), descending=True),
+        yes_asks=_complement(no_bids),
+        received_at=received_at if received_at is not None else time.time(),
+    )
+
+
+def clob_depth_book(market_id: str, book: Dict[str, Any], received_at: Optional[float] = None) -> DepthBook:
+    """
+    Normalize a CLOB book for a market's YES token into a DepthBook.
+    """
+    def rows(levels: Any) -> List[Tuple[float, float]]:
+        return [(float(level["price"]), float(level["size"])) for level in levels or []]
+
+    return DepthBook(
+        venue="polymarket",
+        market_id=market_id,
+        yes_bids=_levels(rows(book.get("bids")), descending=True),
+        yes_asks=_levels(rows(book.get("asks")), descending=False),
+        received_at=received_at if received_at is not None else time.time(),
+    )
+
+
+def fetch_kalshi_depth(
+    tickers: Iterable[str],
+    depth: Optional[int] = None,
+    max_workers: int = DEPTH_FETCH_WORKERS,
+) -> Dict[str, DepthBook]:
+    """
+    Fetch Kalshi orderbooks for many market tickers concurrently.
+
+    Returns:
+        Dict mapping ticker -> DepthBook. Tickers whose fetch fails are logged
+        and left out.
+    """
+    tickers = list(dict.fromkeys(t for t in tickers if t))
+    if not tickers:
+        return {}
+
+    def fetch(ticker: str) -> Optional[DepthBook]:
+        try:
+            return kalshi_depth_book(ticker, get_orderbook(ticker, depth=depth))
+        except requests.RequestException as e:
+            print(f"Error fetching Kalshi orderbook for {ticker}: {e}")
+            return None
+
+    books: Dict[str, DepthBook] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(tickers)))) as pool:
+        for ticker, book in zip(tickers, pool.map(fetch, tickers)):
+            if book is not None:
+                books[ticker] = book
+    return books
+
+
+def _post_books(token_ids: List[str]) -> List[Dict[str, Any]]:
+    session = get_http_session()
+    response = send_with_retry(
+        lambda: session.post(
+            f"{POLYMARKET_CLOB_URL}/books",
+            json=[{"token_id": token_id} for token_id in token_ids],
+        ),
+        CLOB_BREAKER,
+    )
+    response.raise_for_status()
+    return response.json() or []
+
+
+def fetch_polymarket_depth(
+    markets: Iterable[Dict[str, Any]],
+    batch_size: int = CLOB_BOOKS_BATCH_SIZE,
+    max_workers: int = DEPTH_FETCH_WORKERS,
+) -> Dict[str, DepthBook]:
+    """
+    Fetch CLOB books for the YES tokens of many Gamma markets, batch_size
+    tokens per POST /books request, batches running concurrently.
+
+    Returns:
+        Dict mapping Gamma market id -> DepthBook. Markets without token ids,
+        or in a batch whose request fails (logged), are left out.
+    """
+    market_by_token: Dict[str, str] = {}
+    for market in markets:
+        tokens = clob_token_ids(market)
+        if tokens and market.get("id") is not None:
+            market_by_token[tokens[0]] = str(market["id"])
+    token_ids = list(market_by_token)
+    batches = [token_ids[i:i + batch_size] for i in range(0, len(token_ids), batch_size)]
+    if not batches:
+        return {}
+
+    def fetch(batch: List[str]) -> Tuple[float, List[Dict[str, Any]]]:
+        try:
+            batch_books = _post_books(batch)
+        except requests.RequestException as e:
+            print(f"Error fetching {len(batch)} Polymarket CLOB books: {e}")
+            batch_books = []
+        return time.time(), batch_books
+
+    books: Dict[str, DepthBook] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as pool:
+        for received_at, batch_books in pool.map(fetch, batches):
+            for book in batch_books:
+                market_id = market_by_token.get(str(book.get("asset_id")))
+                if market_id is not None:
+                    books[market_id] = clob_depth_book(market_id, book, received_at)
+    return books
+
+
+LegFee = Callable[[List[Tuple[float, float]]], float]
+
+
+def paired_fill(
+    asks_a: np.ndarray,
+    asks_b: np.ndarray,
+    fee_a: Optional[LegFee] = None,
+    fee_b: Optional[LegFee] = None,
+    payout: float = 1.0,
+) -> Tuple[float, float]:
+    """
+    Walk two ask ladders together, buying one contract on each leg per pair,
+    for as long as each step adds profit.
+
+    fee_a / fee_b get a leg's whole fill as [(price, contracts), ...] and
+    return that order's total fee, so per-order rounding (e.g. Kalshi's
+    round-up to the cent) is applied once per leg rather than per contract.
+
+    Returns:
+        (contracts, total cost in dollars including fees) of the most
+        profitable fill, (0.0, 0.0) if none is profitable; the profit is
+        contracts * payout - cost.
+
+    >>> a = np.array([[0.40, 100.0], [0.45, 50.0]])
+    >>> b = np.array([[0.50, 30.0], [0.52, 200.0]])
+    >>> [round(x, 4) for x in paired_fill(a, b)]
+    [150.0, 139.9]
+    >>> flat_fee = lambda fills: 0.04 * sum(c for _, c in fills)
+    >>> [round(x, 4) for x in paired_fill(a, b, fee_b=flat_fee)]
+    [100.0, 95.4]
+    """
+    fills_a: List[Tuple[float, float]] = []
+    fills_b: List[Tuple[float, float]] = []
+    contracts = price_cost = 0.0
+    best = (0.0, 0.0, 0.0)  # (profit, contracts, cost)
+
+    def total_cost(price_cost: float) -> float:
+        return (
+            price_cost
+            + (fee_a(fills_a) if fee_a and fills_a else 0.0)
+            + (fee_b(fills_b) if fee_b and fills_b else 0.0)
+        )
+
+    i = j = 0
+    left_a = asks_a[0, 1] if len(asks_a) else 0.0
+    left_b = asks_b[0, 1] if len(asks_b) else 0.0
+    while i < len(asks_a) and j < len(asks_b):
+        price_a, price_b = float(asks_a[i, 0]), float(asks_b[j, 0])
+        if price_a + price_b >= payout:
+            break
+        take = float(min(left_a, left_b))
+        fills_a.append((price_a, take))
+        fills_b.append((price_b, take))
+        contracts += take
+        price_cost += take * (price_a + price_b)
+        cost = total_cost(price_cost)
+        profit = contracts * payout - cost
+        if profit < best[0]:
+            # Marginal profit turned negative; later levels are only dearer
+            break
+        if profit > best[0]:
+            best = (profit, contracts, cost)
+        left_a -= take
+        left_b -= take
+        if left_a <= 0:
+            i += 1
+            left_a = asks_a[i, 1] if i < len(asks_a) else 0.0
+        if left_b <= 0:
+            j += 1
+            left_b = asks_b[j, 1] if j < len(asks_b) else 0.0
+    return best[1], best[2]
+
+
+if __name__ == "__main__":
+    # Simple manual test: depth for the markets of a sample event on each venue.
+    from tools.kalshi_markets import get_markets_for_event as get_kalshi_markets
+    from tools.polymarket import get_markets_for_event as get_polymarket_markets
+
+    for book in fetch_kalshi_depth(m["ticker"] for m in get_kalshi_markets("KXGRETAGAZA-26JAN01")).values():
+        print(book.market_id, book.yes_bids[:3].tolist(), book.yes_asks[:3].tolist())
+    for book in fetch_polymarket_depth(get_polymarket_markets(event_id="16085")).values():
+        print(book.market_id, book.yes_bids[:3].tolist(), book.yes_asks[:3].tolist())
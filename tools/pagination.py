@@ -0,0 +1,59 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Default number of page requests kept in flight at once
+DEFAULT_PAGE_WORKERS = 8
+
+
+def iter_offset_pages(
+    fetch_page: Callable[[int, int], List[Any]],
+    page_size: int,
+    max_workers: int = DEFAULT_PAGE_WORKERS,
+    start_offset: int = 0,
+    max_offset: Optional[int] = None,
+) -> Iterator[Tuple[int, List[Any]]]:
+    """
+    Fetch offset-paginated results with up to `max_workers` pages in flight.
+
+    Pages are yielded in offset order as (offset, items). Iteration stops at
+    the first short (or empty) page; requests already submitted for later
+    offsets are cancelled or discarded. Errors raised by `fetch_page`
+    propagate to the caller.
+
+    Args:
+        fetch_page: Callable (offset, page_size) -> list of items for that page
+        page_size: Number of items requested per page
+        max_workers: Maximum number of concurrent page requests
+        start_offset: Offset of the first page to fetch
+        max_offset: If set, no page beyond this offset is requested
+
+    Yields:
+        (offset, items) tuples in increasing offset order
+    """
+    max_workers = max(1, max_workers)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        in_flight: Dict[int, Future] = {}
+        next_offset = start_offset
+        expected = start_offset
+
+        def submit_until_full() -> None:
+            nonlocal next_offset
+            while len(in_flight) < max_workers and (
+                max_offset is None or next_offset <= max_offset
+            ):
+                in_flight[next_offset] = pool.submit(fetch_page, next_offset, page_size)
+                next_offset += page_size
+
+        try:
+            submit_until_full()
+            while expected in in_flight:
+                items = in_flight.pop(expected).result()
+                yield expected, items
+                if len(items) < page_size:
+                    break
+                expected += page_size
+                submit_until_full()
+        finally:
+            for future in in_flight.values():
+                future.cancel()
@@ -1,109 +1,308 @@
 import json
-import math
 import os
 import sys
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 # Handle both package import and direct execution
 try:
     from .emb import embed_texts, embed_text
+    from .http_cache import FRESH, cached_get
+    from .index_pipeline import build_index_streaming
+    from .vector_index import EventVectorIndex, normalize_vector
+    from .knn_graph import NeighborGraph
+    from .market_cache import (
+        MARKET_METADATA,
+        MARKET_PRICES,
+        RECEIVED_AT,
+        MarketCache,
+        metadata_only,
+        stamp_quotes,
+    )
+    from .pagination import iter_offset_pages
+    from .projection import scored_event
+    from .resilience import get_circuit_breaker, send_with_retry
+    from .event_lookup import (
+        IdentifierIndex,
+        identifier_search_result,
+        looks_like_identifier,
+    )
 except ImportError:
     # When running directly, add parent directory to path
     sys.path.insert(0, str(Path(__file__).parent.parent))
     from tools.emb import embed_texts, embed_text
+    from tools.http_cache import FRESH, cached_get
+    from tools.index_pipeline import build_index_streaming
+    from tools.vector_index import EventVectorIndex, normalize_vector
+    from tools.knn_graph import NeighborGraph
+    from tools.market_cache import (
+        MARKET_METADATA,
+        MARKET_PRICES,
+        RECEIVED_AT,
+        MarketCache,
+        metadata_only,
+        stamp_quotes,
+    )
+    from tools.pagination import iter_offset_pages
+    from tools.projection import scored_event
+    from tools.resilience import get_circuit_breaker, send_with_retry
+    from tools.event_lookup import (
+        IdentifierIndex,
+        identifier_search_result,
+        looks_like_identifier,
+    )
+
+
+# Override with POLYMARKET_GAMMA_URL to use another Gamma API host, e.g.
+# benchmarks/venue_server.py.
+POLYMARKET_GAMMA_URL = (os.getenv("POLYMARKET_GAMMA_URL") or "https://gamma-api.polymarket.com").rstrip("/")
+POLYMARKET_EVENTS_URL = f"{POLYMARKET_GAMMA_URL}/events"
+# CLOB REST host (order books); overridable the same way
+POLYMARKET_CLOB_URL = (os.getenv("POLYMARKET_CLOB_URL") or "https://clob.polymarket.com").rstrip("/")
+
+# Shared by every Gamma API call: throttled/failed requests back off and retry,
+# and a run of failures makes further calls fail fast until Gamma recovers.
+POLYMARKET_BREAKER = get_circuit_breaker("polymarket")
+
+# Concurrent page requests used by fetch_all_open_events()
+PAGE_FETCH_WORKERS = 8
+
+# Event ids per request when re-checking which indexed events have closed
+CLOSED_CHECK_BATCH_SIZE = 100
+
+# refresh_events_index() re-checks every indexed event (about one request per
+# CLOSED_CHECK_BATCH_SIZE events) at most this often unless asked explicitly;
+# the time of the last check is the mtime of "<events_path>.verified".
+CLOSED_CHECK_INTERVAL_SECONDS = 24 * 60 * 60
+
+# Pages fetched so far are appended here (one JSON line per page) so an
+# interrupted fetch_all_open_events() can resume; removed once a fetch completes.
+DEFAULT_FETCH_CHECKPOINT_PATH = "data/polymarket_fetch_checkpoint.jsonl"
+
+# Checkpoints older than this are considered stale and ignored
+FETCH_CHECKPOINT_MAX_AGE_SECONDS = 6 * 60 * 60
+
+
+def _fetch_events_page(offset: int, limit: int) -> List[Dict[str, Any]]:
+    """
+    Fetch one page of non-closed events (ordered by id, newest first).
+
+    Throttling and server errors are retried with backoff. Raises
+    requests.exceptions.RequestException once retries are exhausted (or
+    resilience.CircuitOpenError while Gamma is failing).
+    """
+    # Use query parameters to filter for open events
+    params = {
+        "order": "id",
+        "ascending": "false",
+        "closed": "false",  # Only get non-closed events
+        "limit": limit,
+        "offset": offset
+    }
 
+    # Always revalidated: unchanged pages come back as cheap 304s
+    response = send_with_retry(
+        lambda: cached_get(POLYMARKET_EVENTS_URL, params=params, max_age=FRESH),
+        POLYMARKET_BREAKER,
+    )
+    response.raise_for_status()
+    events = response.json()
+
+    # Check if response is a list or a dict with a list inside
+    if isinstance(events, dict):
+        # Try common keys that might contain the events list
+        events = events.get("data", events.get("events", events.get("results", [])))
+
+    if not isinstance(events, list):
+        print(f"Warning: Expected list but got {type(events)}")
+        return []
+    # Date each event's embedded prices, so an index mixing events from
+    # several fetches (see refresh_events_index()) keeps per-event ages
+    received_at = time.time()
+    for event in events:
+        if isinstance(event, dict):
+            event[RECEIVED_AT] = received_at
+    return events
 
-def fetch_all_open_events(limit: int = 100) -> List[Dict[str, Any]]:
+
+def _is_open_event(event: Any) -> bool:
     """
-    Fetch all open/active events from Polymarket and return them as a list of dicts.
+    True for active, non-closed, non-archived event dicts.
+    """
+    if not isinstance(event, dict):
+        return False
+    archived = event.get("archived")
+    return (
+        event.get("active") is True
+        and event.get("closed") is False
+        and (archived is False or archived is None)
+    )
+
+
+def _load_fetch_checkpoint(
+    checkpoint_path: str,
+    limit: int,
+) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Read the pages recorded by an interrupted fetch.
+
+    Returns (events, last_page_record). Missing, stale or incompatible
+    checkpoints (different page size) yield ([], None). A truncated last line
+    (crash mid-write) is ignored.
+    """
+    if not os.path.exists(checkpoint_path):
+        return [], None
+    if time.time() - os.path.getmtime(checkpoint_path) > FETCH_CHECKPOINT_MAX_AGE_SECONDS:
+        print(f"Ignoring stale Polymarket fetch checkpoint {checkpoint_path}")
+        return [], None
+
+    events: List[Dict[str, Any]] = []
+    last: Optional[Dict[str, Any]] = None
+    with open(checkpoint_path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            if record.get("page_size") != limit:
+                return [], None
+            events.extend(record.get("events", []))
+            last = record
+    return events, last
+
+
+def iter_open_event_pages(
+    limit: int = 100,
+    max_workers: int = PAGE_FETCH_WORKERS,
+    checkpoint_path: Optional[str] = DEFAULT_FETCH_CHECKPOINT_PATH,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield open/active Polymarket events page by page, deduplicated by id.
     
     Uses Polymarket API with query parameters:
     - closed=false: Only fetch events that are not closed
+    - order=id: Stable ordering, newest events first
     - limit: Number of events per page
     - offset: For pagination
     
+    Pages are requested concurrently (up to `max_workers` in flight) and
+    yielded in offset order; fetching stops at the first short page, with no
+    upper bound on the catalog size. Events are deduplicated by id, since the
+    live catalog can shift between pages.
+    
+    Each completed page is appended to `checkpoint_path` together with the
+    last id seen. If a previous fetch was interrupted, the recorded events are
+    yielded first and fetching resumes by re-reading the last recorded page
+    (the overlap absorbs events that closed in the meantime). The checkpoint
+    is deleted once the last page has been yielded. Pass checkpoint_path=None
+    to disable.
+    
+    Raises requests.exceptions.RequestException on HTTP errors; the
+    checkpoint is kept so the next call resumes from it.
+    """
+    seen_ids = set()
+    start_offset = 0
+
+    def is_new(event: Dict[str, Any]) -> bool:
+        event_id = event_key(event)
+        if event_id is None:
+            return True
+        if event_id in seen_ids:
+            return False
+        seen_ids.add(event_id)
+        return True
+
+    checkpoint = None
+    resumed: List[Dict[str, Any]] = []
+    if checkpoint_path:
+        recorded, last_page = _load_fetch_checkpoint(checkpoint_path, limit)
+        if last_page is not None:
+            resumed = [event for event in recorded if is_new(event)]
+            start_offset = last_page["offset"]
+            print(
+                f"Resuming Polymarket fetch at offset {start_offset} "
+                f"(last id {last_page.get('last_id')}, {len(resumed)} events recorded)"
+            )
+        os.makedirs(os.path.dirname(checkpoint_path) or ".", exist_ok=True)
+        checkpoint = open(checkpoint_path, "a" if last_page is not None else "w")
+
+    try:
+        if resumed:
+            yield resumed
+
+        pages = iter_offset_pages(
+            _fetch_events_page,
+            page_size=limit,
+            max_workers=max_workers,
+            start_offset=start_offset,
+        )
+        for offset, events in pages:
+            # All events from this endpoint should already be open (closed=false)
+            # But we'll still filter to be safe
+            new_events = [
+                event for event in events
+                if _is_open_event(event) and is_new(event)
+            ]
+            if checkpoint is not None:
+                last_id = event_key(events[-1]) if events and isinstance(events[-1], dict) else None
+                record = {
+                    "page_size": limit,
+                    "offset": offset,
+                    "last_id": last_id,
+                    "events": new_events,
+                }
+                checkpoint.write(json.dumps(record, default=str) + "\n")
+                checkpoint.flush()
+            yield new_events
+    except requests.exceptions.RequestException:
+        if checkpoint is not None:
+            print(f"Progress saved to {checkpoint_path}; the next fetch will resume from it")
+        raise
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+
+def fetch_all_open_events(
+    limit: int = 100,
+    max_workers: int = PAGE_FETCH_WORKERS,
+    checkpoint_path: Optional[str] = DEFAULT_FETCH_CHECKPOINT_PATH,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch all open/active events from Polymarket and return them as a list of dicts.
+    
+    Collects iter_open_event_pages(); see there for pagination and resume
+    behaviour.
+    
     Args:
         limit: Number of events to fetch per API call (default 100)
+        max_workers: Maximum number of concurrent page requests
+        checkpoint_path: JSON-lines file used to resume interrupted fetches
     
     Returns:
         List of open/active event dicts
+
+    Raises requests.exceptions.RequestException if the fetch still fails
+    after retries.
     """
-    base_url = "https://gamma-api.polymarket.com/events"
-    
     all_events: List[Dict[str, Any]] = []
-    offset = 0
     
     try:
-        while True:
-            # Use query parameters to filter for open events
-            params = {
-                "order": "id",
-                "ascending": "false",
-                "closed": "false",  # Only get non-closed events
-                "limit": limit,
-                "offset": offset
-            }
-            
-            # Add cache-busting headers to ensure fresh data
-            headers = {
-                'Cache-Control': 'no-cache, no-store, must-revalidate',
-                'Pragma': 'no-cache',
-                'Expires': '0'
-            }
-            
-            response = requests.get(base_url, params=params, headers=headers, timeout=30)
-            response.raise_for_status()
-            events = response.json()
-            
-            # Check if response is a list or a dict with a list inside
-            if isinstance(events, dict):
-                # Try common keys that might contain the events list
-                events = events.get("data", events.get("events", events.get("results", [])))
-            
-            if not isinstance(events, list):
-                print(f"Warning: Expected list but got {type(events)}")
-                break
-            
-            if len(events) == 0:
-                # No more events to fetch
-                break
-            
-            # All events from this endpoint should already be open (closed=false)
-            # But we'll still filter to be safe
-            for event in events:
-                if not isinstance(event, dict):
-                    continue
-                
-                active = event.get("active")
-                closed = event.get("closed")
-                archived = event.get("archived")
-                
-                # Filter for open/active events
-                if (
-                    active is True
-                    and closed is False
-                    and (archived is False or archived is None)
-                ):
-                    all_events.append(event)
-            
-            # If we got fewer events than the limit, we've reached the end
-            if len(events) < limit:
-                break
-            
-            # Move to next page
-            offset += limit
-            
-            # Safety limit to prevent infinite loops
-            if offset > 10000:  # Max 10k events
-                print("Warning: Reached safety limit of 10,000 events")
-                break
+        for page in iter_open_event_pages(limit, max_workers, checkpoint_path):
+            all_events.extend(page)
                 
     except requests.exceptions.RequestException as e:
+        # Retries are exhausted (or the circuit is open). Raise rather than
+        # return [] so callers don't build or cache an empty catalog; the
+        # checkpoint lets the next call pick up where this one stopped.
         print(f"Error fetching Polymarket events: {e}")
-        return []
+        raise
     except (json.JSONDecodeError, KeyError, TypeError) as e:
         print(f"Error parsing Polymarket response: {e}")
         import traceback
@@ -114,6 +313,103 @@ def fetch_all_open_events(limit: int = 100) -> List[Dict[str, Any]]:
     return all_events
 
 
+def _numeric_id(event: Dict[str, Any]) -> Optional[int]:
+    try:
+        return int(event.get("id"))
+    except (TypeError, ValueError):
+        return None
+
+
+def max_event_id(events: List[Dict[str, Any]]) -> Optional[int]:
+    """
+    Highest numeric event id in `events`, or None if there is none.
+    """
+    ids = [i for i in (_numeric_id(ev) for ev in events) if i is not None]
+    return max(ids) if ids else None
+
+
+def iter_new_open_event_pages(since_id: int, limit: int = 100) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Yield open events with an id above `since_id`, one page at a time.
+
+    The events endpoint is ordered by id, newest first, so paging stops at the
+    first page that reaches `since_id`: a refresh shortly after the last one
+    costs one or two requests instead of the whole catalog.
+    """
+    offset = 0
+    seen_ids = set()
+    while True:
+        page = _fetch_events_page(offset, limit)
+        new_events = []
+        reached_known = False
+        for event in page:
+            event_id = _numeric_id(event) if isinstance(event, dict) else None
+            if event_id is not None and event_id <= since_id:
+                reached_known = True
+                continue
+            if not _is_open_event(event):
+                continue
+            key = event_key(event)
+            if key in seen_ids:
+                continue
+            seen_ids.add(key)
+            new_events.append(event)
+        if new_events:
+            yield new_events
+        if reached_known or len(page) < limit:
+            break
+        offset += limit
+
+
+def _fetch_open_ids(event_ids: List[str]) -> set:
+    """
+    Return the subset of `event_ids` that Polymarket still lists as open.
+    """
+    params = {
+        "id": event_ids,
+        "closed": "false",
+        "limit": len(event_ids),
+    }
+    response = send_with_retry(
+        lambda: cached_get(POLYMARKET_EVENTS_URL, params=params, max_age=FRESH),
+        POLYMARKET_BREAKER,
+    )
+    response.raise_for_status()
+    events = response.json()
+    if isinstance(events, dict):
+        events = events.get("data", events.get("events", events.get("results", [])))
+    wanted = set(event_ids)
+    return {
+        str(ev.get("id"))
+        for ev in events or []
+        if _is_open_event(ev) and str(ev.get("id")) in wanted
+    }
+
+
+def find_delisted_event_ids(
+    event_ids: List[str],
+    batch_size: int = CLOSED_CHECK_BATCH_SIZE,
+    max_workers: int = PAGE_FETCH_WORKERS,
+) -> set:
+    """
+    Re-verify which of `event_ids` are no longer open: closed, archived or
+    deleted since they were indexed.
+
+    Asks for the open events among each batch of ids and treats every id
+    missing from the answer as delisted. Costs ceil(len(event_ids) /
+    batch_size) requests, run concurrently.
+    """
+    ids = [str(i) for i in event_ids if i]
+    batches = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+    if not batches:
+        return set()
+    still_open: set = set()
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches)))) as pool:
+        for found in pool.map(_fetch_open_ids, batches):
+            still_open |= found
+    return set(ids) - still_open
+
+
 def save_events_to_json(events: List[Dict[str, Any]], output_path: str) -> None:
     """
     Save events (list of dicts) to a JSON file, creating parent dirs if needed.
@@ -125,10 +421,25 @@ def save_events_to_json(events: List[Dict[str, Any]], output_path: str) -> None:
 
 _EVENTS_CACHE: Optional[List[Dict[str, Any]]] = None
 _EVENT_EMBEDS: Optional[Dict[str, List[float]]] = None
+_VECTOR_INDEX: Optional[EventVectorIndex] = None
+_IDENTIFIER_INDEX: Optional[IdentifierIndex] = None
+# When the cached events (and the quotes embedded in their markets) were fetched
+_EVENTS_FETCHED_AT: Optional[float] = None
+
+# Event fields indexed for exact / prefix identifier lookup
+IDENTIFIER_FIELDS = ("id", "slug", "ticker")
+
+# Fields returned by search_open_events() unless full_payload=True.
+# `endDate` is the Polymarket event close time.
+SLIM_EVENT_FIELDS = ("id", "slug", "ticker", "title", "category", "endDate")
+
+# Event id/slug/ticker -> open markets; metadata served for hours, prices for seconds
+MARKET_CACHE = MarketCache()
 
 # Default on-disk locations for the precomputed index
 DEFAULT_EVENTS_PATH = "data/polymarket_open_events.json"
 DEFAULT_EMBEDS_PATH = "data/polymarket_open_events_embeds.json"
+DEFAULT_KNN_PATH = "data/polymarket_open_events_knn.npz"
 
 
 def _load_open_events_cached() -> List[Dict[str, Any]]:
@@ -141,20 +452,50 @@ def _load_open_events_cached() -> List[Dict[str, Any]]:
     return _EVENTS_CACHE
 
 
-def _cosine_similarity(a: List[float], b: List[float]) -> float:
+def event_key(ev: Dict[str, Any]) -> Optional[str]:
+    """
+    Identifier used as the key of a Polymarket event in the embeddings index.
+    """
+    event_id = ev.get("id") or ev.get("ticker") or ev.get("slug")
+    return str(event_id) if event_id else None
+
+
+def _event_text(ev: Dict[str, Any]) -> str:
     """
-    Compute cosine similarity between two dense vectors.
+    Text embedded for a Polymarket event.
     """
-    if not a or not b or len(a) != len(b):
-        return 0.0
-    dot = sum(x * y for x, y in zip(a, b))
-    if dot == 0.0:
-        return 0.0
-    na = math.sqrt(sum(x * x for x in a))
-    nb = math.sqrt(sum(x * x for x in b))
-    if na == 0.0 or nb == 0.0:
-        return 0.0
-    return dot / (na * nb)
+    title = str(ev.get("title") or "")
+    description = str(ev.get("description") or "")
+    category = str(ev.get("category") or "")
+    # Polymarket events can have series info too
+    series_info = ""
+    if ev.get("series"):
+        series_list = ev.get("series", [])
+        if series_list and isinstance(series_list, list) and len(series_list) > 0:
+            series_title = series_list[0].get("title", "")
+            if series_title:
+                series_info = f" [series: {series_title}]"
+
+    return f"{title}. {description} [category: {category}]{series_info}"
+
+
+def _set_events_cache(
+    events: List[Dict[str, Any]],
+    embeds: Dict[str, List[float]],
+    fetched_at: Optional[float] = None,
+) -> None:
+    """
+    Replace the in-process events/embeddings cache and rebuild the shared
+    id/slug/ticker index alongside it, so lookups never rebuild it per call.
+    `fetched_at` (default: now) dates the prices embedded in events that
+    carry no RECEIVED_AT stamp of their own (indexes written before events
+    were stamped).
+    """
+    global _EVENTS_CACHE, _EVENT_EMBEDS, _IDENTIFIER_INDEX, _EVENTS_FETCHED_AT
+    _EVENTS_CACHE = events
+    _EVENTS_FETCHED_AT = fetched_at if fetched_at is not None else time.time()
+    _EVENT_EMBEDS = embeds
+    _IDENTIFIER_INDEX = IdentifierIndex(events, IDENTIFIER_FIELDS)
 
 
 def _load_events_and_embeddings(
@@ -184,8 +525,7 @@ def _load_events_and_embeddings(
         with open(embeds_path, "r") as f:
             embeds = json.load(f)
 
-        _EVENTS_CACHE = events
-        _EVENT_EMBEDS = embeds
+        _set_events_cache(events, embeds, fetched_at=os.path.getmtime(events_path))
         return _EVENTS_CACHE, _EVENT_EMBEDS
 
     # Fallback: build in-memory index for this process only
@@ -194,26 +534,12 @@ def _load_events_and_embeddings(
     texts: List[str] = []
     event_ids: List[str] = []
     for ev in events:
-        event_id = ev.get("id") or ev.get("ticker") or ev.get("slug")
+        event_id = event_key(ev)
         if not event_id:
             continue
 
-        title = str(ev.get("title") or "")
-        description = str(ev.get("description") or "")
-        category = str(ev.get("category") or "")
-        # Polymarket events can have series info too
-        series_info = ""
-        if ev.get("series"):
-            series_list = ev.get("series", [])
-            if series_list and isinstance(series_list, list) and len(series_list) > 0:
-                series_title = series_list[0].get("title", "")
-                if series_title:
-                    series_info = f" [series: {series_title}]"
-        
-        text = f"{title}. {description} [category: {category}]{series_info}"
-
-        event_ids.append(str(event_id))
-        texts.append(text)
+        event_ids.append(event_id)
+        texts.append(_event_text(ev))
 
     if texts:
         vectors = embed_texts(texts)
@@ -221,8 +547,7 @@ def _load_events_and_embeddings(
     else:
         embeds = {}
 
-    _EVENTS_CACHE = events
-    _EVENT_EMBEDS = embeds
+    _set_events_cache(events, embeds)
 
     return _EVENTS_CACHE, _EVENT_EMBEDS
 
@@ -236,130 +561,287 @@ def setup_events_index(
     - Fetch all open events from Polymarket
     - Save them to `events_path`
     - Embed each event and save a small vector index to `embeds_path`
+    - Precompute the top-k related-events graph (CSR) and save it to
+      DEFAULT_KNN_PATH, where related_events.get_neighbor_graph() reads it
 
     After this has been run, search_open_events() will load everything from disk,
     which is much faster than re-embedding on each cold start.
+
+    Pages stream from iter_open_event_pages() into embedding batches while
+    later pages are still downloading (see build_index_streaming()).
     """
-    events = fetch_all_open_events()
-    save_events_to_json(events, events_path)
+    events, embeds = build_index_streaming(
+        iter_open_event_pages(),
+        key_fn=event_key,
+        text_fn=_event_text,
+        events_path=events_path,
+        embeds_path=embeds_path,
+    )
+    print(f"Indexed {len(events)} open/active events from Polymarket")
 
-    texts: List[str] = []
-    event_ids: List[str] = []
-    for ev in events:
-        event_id = ev.get("id") or ev.get("ticker") or ev.get("slug")
-        if not event_id:
-            continue
+    # Populate in-process cache (and identifier index) as well
+    _set_events_cache(events, embeds)
 
-        title = str(ev.get("title") or "")
-        description = str(ev.get("description") or "")
-        category = str(ev.get("category") or "")
-        # Polymarket events can have series info too
-        series_info = ""
-        if ev.get("series"):
-            series_list = ev.get("series", [])
-            if series_list and isinstance(series_list, list) and len(series_list) > 0:
-                series_title = series_list[0].get("title", "")
-                if series_title:
-                    series_info = f" [series: {series_title}]"
-        
-        text = f"{title}. {description} [category: {category}]{series_info}"
-
-        event_ids.append(str(event_id))
-        texts.append(text)
+    # Related-events graph within this venue (self-matches excluded)
+    index = get_vector_index()
+    graph = NeighborGraph.build(
+        index.keys, index.matrix, index.keys, index.matrix, exclude_self=True
+    )
+    graph.save(DEFAULT_KNN_PATH)
 
-    if texts:
-        vectors = embed_texts(texts)
-        embeds = {eid: v for eid, v in zip(event_ids, vectors)}
-    else:
-        embeds = {}
 
-    os.makedirs(os.path.dirname(embeds_path) or ".", exist_ok=True)
-    with open(embeds_path, "w") as f:
-        json.dump(embeds, f)
+def _write_json_atomic(obj: Any, path: str) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(obj, f, default=str)
+    os.replace(tmp, path)
 
-    # Populate in-process cache as well
-    global _EVENTS_CACHE, _EVENT_EMBEDS
-    _EVENTS_CACHE = events
-    _EVENT_EMBEDS = embeds
+
+def _closed_check_due(events_path: str) -> bool:
+    marker = events_path + ".verified"
+    if not os.path.exists(marker):
+        return True
+    return time.time() - os.path.getmtime(marker) >= CLOSED_CHECK_INTERVAL_SECONDS
+
+
+def _mark_closed_checked(events_path: str) -> None:
+    with open(events_path + ".verified", "w"):
+        pass
+
+
+def refresh_events_index(
+    events_path: str = DEFAULT_EVENTS_PATH,
+    embeds_path: str = DEFAULT_EMBEDS_PATH,
+    limit: int = 100,
+    verify_closed: Optional[bool] = None,
+) -> None:
+    """
+    Incrementally update the on-disk index instead of rebuilding it.
+
+    - Fetches only events newer than the highest id already indexed
+      (iter_new_open_event_pages()) and embeds just those.
+    - Appends new events after the indexed ones and extends the related-events
+      graph with just their rows (NeighborGraph.extend()); it is rebuilt in
+      full only when events were dropped.
+    - Drops indexed events that are no longer open: closed, archived or
+      deleted (find_delisted_event_ids()). That check costs one request per
+      CLOSED_CHECK_BATCH_SIZE indexed events, so by default
+      (verify_closed=None) it runs at most every CLOSED_CHECK_INTERVAL_SECONDS;
+      pass True / False to force or skip it.
+
+    Falls back to a full setup_events_index() when no index exists on disk.
+    ensure_events_index_on_disk(refresh=True) calls this for an existing index.
+    """
+    if not (os.path.exists(events_path) and os.path.exists(embeds_path)):
+        setup_events_index(events_path=events_path, embeds_path=embeds_path)
+        return
+
+    with open(events_path, "r") as f:
+        events = json.load(f)
+    with open(embeds_path, "r") as f:
+        embeds = json.load(f)
+    # Indexed prices date from the previous fetch, not from this refresh
+    fetched_at = os.path.getmtime(events_path)
+    for ev in events:
+        ev.setdefault(RECEIVED_AT, fetched_at)
+
+    since_id = max_event_id(events)
+    if since_id is None:
+        setup_events_index(events_path=events_path, embeds_path=embeds_path)
+        return
+
+    # Keyless events could be neither embedded nor found again; leave them out
+    known = {event_key(ev) for ev in events}
+    new_events = [
+        ev
+        for page in iter_new_open_event_pages(since_id, limit=limit)
+        for ev in page
+        if event_key(ev) and event_key(ev) not in known
+    ]
+
+    if verify_closed is None:
+        verify_closed = _closed_check_due(events_path)
+    delisted: set = set()
+    if verify_closed:
+        delisted = find_delisted_event_ids([event_key(ev) for ev in events])
+        _mark_closed_checked(events_path)
+
+    if not new_events and not delisted:
+        print(f"Polymarket index is up to date ({len(events)} events, max id {since_id})")
+        _set_events_cache(events, embeds, fetched_at=fetched_at)
+        return
+
+    events = [ev for ev in events if event_key(ev) not in delisted]
+    embeds = {k: v for k, v in embeds.items() if k not in delisted}
+
+    if new_events:
+        vectors = embed_texts([_event_text(ev) for ev in new_events])
+        for ev, vec in zip(new_events, vectors):
+            embeds[event_key(ev)] = vec
+    # Appended, so indexed keys keep their order and the kNN graphs (this
+    # venue's and the cross-venue ones) only need rows for the new events
+    events = events + new_events
+
+    _write_json_atomic(events, events_path)
+    _write_json_atomic(embeds, embeds_path)
+    print(
+        f"Refreshed Polymarket index: +{len(new_events)} new, "
+        f"-{len(delisted)} delisted, {len(events)} events"
+    )
+
+    _set_events_cache(events, embeds, fetched_at=fetched_at)
+    index = get_vector_index()
+    graph = None
+    if not delisted and os.path.exists(DEFAULT_KNN_PATH):
+        graph = NeighborGraph.load(DEFAULT_KNN_PATH).extend(
+            index.keys, index.matrix, index.keys, index.matrix, exclude_self=True
+        )
+    if graph is None:
+        graph = NeighborGraph.build(
+            index.keys, index.matrix, index.keys, index.matrix, exclude_self=True
+        )
+    graph.save(DEFAULT_KNN_PATH)
 
 
 def ensure_events_index_on_disk(
     events_path: str = DEFAULT_EVENTS_PATH,
     embeds_path: str = DEFAULT_EMBEDS_PATH,
+    refresh: bool = False,
 ) -> None:
     """
     Ensure that the Polymarket events JSON and embeddings index exist on disk.
 
-    - If both files already exist: do nothing.
+    - If both files already exist: do nothing, or with refresh=True bring
+      them up to date via refresh_events_index() (new events only, plus the
+      periodic closed-event check).
     - If one or both are missing: build them once via setup_events_index().
     """
     if os.path.exists(events_path) and os.path.exists(embeds_path):
+        if refresh:
+            refresh_events_index(events_path=events_path, embeds_path=embeds_path)
         return
     setup_events_index(events_path=events_path, embeds_path=embeds_path)
 
 
+def get_vector_index() -> EventVectorIndex:
+    """
+    Return the normalized embedding matrix for all open Polymarket events.
+
+    Built lazily from _load_events_and_embeddings() and rebuilt automatically
+    whenever the in-process events/embeddings cache is replaced.
+    """
+    global _VECTOR_INDEX
+    events, embeds = _load_events_and_embeddings()
+    if _VECTOR_INDEX is None or not _VECTOR_INDEX.is_built_from(events, embeds):
+        _VECTOR_INDEX = EventVectorIndex("polymarket", events, embeds, event_key)
+    return _VECTOR_INDEX
+
+
+def get_identifier_index() -> IdentifierIndex:
+    """
+    Return the hash + sorted-prefix index over Polymarket event ids, slugs and tickers.
+
+    Built together with the in-process events cache (see _set_events_cache())
+    and rebuilt lazily if that cache was replaced some other way. Shared by
+    search, related-events and market lookups and the arbitrage pipeline.
+    """
+    global _IDENTIFIER_INDEX
+    events, _ = _load_events_and_embeddings()
+    if _IDENTIFIER_INDEX is None or not _IDENTIFIER_INDEX.is_built_from(events):
+        _IDENTIFIER_INDEX = IdentifierIndex(events, IDENTIFIER_FIELDS)
+    return _IDENTIFIER_INDEX
+
+
+def get_event_by_identifier(identifier: Any) -> Optional[Dict[str, Any]]:
+    """
+    Return the cached open event whose id, slug or ticker equals `identifier`
+    (case-insensitive), or None. O(1) via the shared identifier index.
+    """
+    if identifier is None or identifier == "":
+        return None
+    return get_identifier_index().get_one(identifier)
+
+
 def search_open_events(
     topic: str,
     limit: int = 10,
     categories: Optional[List[str]] = None,
+    full_payload: bool = False,
 ) -> Dict[str, Any]:
     """
     Embedding-based search over all open Polymarket events using Gemini embeddings.
 
     - Considers every open event (no hard keyword gate), so paraphrases can still match.
     - Keeps everything local to this process: tiny in-memory "vector DB".
+    - Queries that look like an identifier are first resolved through
+      get_identifier_index(); only misses fall through to embedding search.
+    - Each hit is projected to SLIM_EVENT_FIELDS plus "score"; pass
+      full_payload=True to get the complete event payload instead.
     """
     q = (topic or "").strip()
     if not q:
         return {"topic": topic, "limit": limit, "total_matches": 0, "events": []}
 
-    events, embeds = _load_events_and_embeddings()
-    query_vec = embed_text(q)
-    if not query_vec:
-        return {"topic": topic, "limit": limit, "total_matches": 0, "events": []}
+    fields = None if full_payload else SLIM_EVENT_FIELDS
 
-    cat_set = {c.lower() for c in categories} if categories else None
+    # Pasted tickers / ids that match a key exactly skip the embedding call;
+    # anything else ("2028", "covid-19") falls through to semantic search.
+    if looks_like_identifier(q):
+        matches = get_identifier_index().lookup(q, limit=limit, exact_required=True)
+        if matches:
+            return identifier_search_result(topic, limit, matches, fields=fields)
 
-    scored: List[Dict[str, Any]] = []
-    for ev in events:
-        event_id = ev.get("id") or ev.get("ticker") or ev.get("slug")
-        if not event_id:
-            continue
-
-        # Optional category filter
-        ev_cat = (ev.get("category") or "").lower()
-        if cat_set and ev_cat not in cat_set:
-            continue
-
-        ev_vec = embeds.get(str(event_id))
-        if not ev_vec:
-            continue
-
-        sim = _cosine_similarity(query_vec, ev_vec)
-        if sim <= 0.0:
-            continue
-
-        # Return the full event payload plus a similarity score.
-        ev_with_score = dict(ev)
-        ev_with_score["score"] = sim
-        scored.append(ev_with_score)
+    index = get_vector_index()
+    query_vec = normalize_vector(embed_text(q))
+    if query_vec is None:
+        return {"topic": topic, "limit": limit, "total_matches": 0, "events": []}
 
-    scored.sort(key=lambda x: x["score"], reverse=True)
-    top = scored[: max(0, limit)]
+    total, hits = index.search(query_vec, limit=limit, categories=categories)
 
     return {
         "topic": topic,
         "limit": limit,
-        "total_matches": len(scored),
-        "events": top,
+        "total_matches": total,
+        "events": [scored_event(ev, sim, fields) for ev, sim in hits],
     }
 
 
+def _markets_from_cached_event(identifier: Any) -> List[Dict[str, Any]]:
+    """
+    Return active/open markets of a cached event matched by id, slug or ticker,
+    stamped with the time that event was fetched (source "polymarket_index");
+    their prices may be hours old.
+
+    Only consults an index that is already loaded or on disk: this runs when
+    Gamma is failing, so it must not start a whole-catalog fetch. Returns []
+    otherwise.
+    """
+    if _EVENTS_CACHE is None and not (
+        os.path.exists(DEFAULT_EVENTS_PATH) and os.path.exists(DEFAULT_EMBEDS_PATH)
+    ):
+        return []
+    ev = get_event_by_identifier(identifier)
+    if ev is None:
+        return []
+    markets = ev.get("markets", []) or []
+    return stamp_quotes(
+        [
+            dict(m) for m in markets
+            if m.get("active") is True and m.get("closed") is False
+        ],
+        "polymarket_index",
+        ev.get(RECEIVED_AT, _EVENTS_FETCHED_AT),
+    )
+
+
 def get_markets_for_event(
     event_id: Optional[str] = None, # use this one
     event_slug: Optional[str] = None,
     event_ticker: Optional[str] = None,
     event_dict: Optional[Dict[str, Any]] = None,
+    max_age: float = FRESH,
+    fields: str = MARKET_PRICES,
 ) -> List[Dict[str, Any]]:
     """
     Retrieve all open/active markets for a given Polymarket event.
@@ -373,9 +855,18 @@ def get_markets_for_event(
         event_slug: Polymarket event slug
         event_ticker: Polymarket event ticker
         event_dict: Full event dict (if you already have it, use this for efficiency)
+        max_age: Freshness policy for the event fetch (see tools/http_cache.py).
+                 FRESH (default) always revalidates with the API, which is what
+                 price checks need; metadata-only callers can pass
+                 METADATA_MAX_AGE to reuse a recent response without a request.
+        fields: MARKET_PRICES (default) for full markets with quotes no older
+                than MARKET_PRICE_TTL; MARKET_METADATA for price-free markets
+                that may come from the long-lived metadata cache.
     
     Returns:
         List of market dicts for the specified event, filtered to active/open markets.
+        With MARKET_PRICES each carries _received_at / _source stamps (see
+        market_cache.stamp_quotes).
     """
     # If event dict is provided, extract markets directly
     if event_dict:
@@ -385,7 +876,14 @@ def get_markets_for_event(
             m for m in markets
             if m.get("active") is True and m.get("closed") is False
         ]
-        return active_markets
+        if fields == MARKET_METADATA:
+            return [metadata_only(m) for m in active_markets]
+        # Unknown receive time unless the caller stamped the event itself
+        return stamp_quotes(
+            [dict(m) for m in active_markets],
+            "event_dict",
+            event_dict.get(RECEIVED_AT),
+        )
     if event_id:
         print("fetching polymarket event using event_id: ", event_id)
     if event_slug:
@@ -397,76 +895,42 @@ def get_markets_for_event(
     identifier = event_id or event_slug or event_ticker
     if not identifier:
         return []
+
+    cached = MARKET_CACHE.get(str(identifier), fields)
+    if cached is not None:
+        return cached
     
     # Try to fetch the specific event
     # Polymarket API might support fetching by slug: /events/{slug}
     # Or we can search through all events
-    url = f"https://gamma-api.polymarket.com/events/{identifier}"
-    
-    # Add cache-busting headers and query parameter to ensure fresh data
-    headers = {
-        'Cache-Control': 'no-cache, no-store, must-revalidate',
-        'Pragma': 'no-cache',
-        'Expires': '0'
-    }
-    # Add timestamp to query string to bust any URL-based caching
-    params = {'_t': int(time.time() * 1000)}  # milliseconds timestamp
+    url = f"{POLYMARKET_EVENTS_URL}/{identifier}"
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        # Conditional request: a 304 reuses the cached payload
+        response = send_with_retry(lambda: cached_get(url, max_age=max_age), POLYMARKET_BREAKER)
         if response.status_code == 200:
             event = response.json()
             markets = event.get("markets", [])
             # Filter for active/open markets
-            active_markets = [
-                m for m in markets
-                if m.get("active") is True and m.get("closed") is False
-            ]
+            active_markets = stamp_quotes(
+                [
+                    m for m in markets
+                    if m.get("active") is True and m.get("closed") is False
+                ],
+                "polymarket_gamma",
+            )
+            MARKET_CACHE.put(str(identifier), active_markets)
+            if fields == MARKET_METADATA:
+                return [metadata_only(m) for m in active_markets]
             return active_markets
         else:
-            # If direct fetch fails, try searching through cached events
-            events, _ = _load_events_and_embeddings()
-            for ev in events:
-                ev_id = str(ev.get("id") or "")
-                ev_slug = ev.get("slug") or ""
-                ev_ticker = ev.get("ticker") or ""
-                
-                if (
-                    str(identifier) == ev_id
-                    or identifier == ev_slug
-                    or identifier == ev_ticker
-                ):
-                    markets = ev.get("markets", [])
-                    active_markets = [
-                        m for m in markets
-                        if m.get("active") is True and m.get("closed") is False
-                    ]
-                    return active_markets
-            
-            return []
+            # If direct fetch fails, fall back to the cached event (O(1) lookup)
+            return _markets_from_cached_event(identifier)
             
     except requests.exceptions.RequestException as e:
         print(f"Error fetching Polymarket event {identifier}: {e}")
-        # Fallback: search through cached events
-        events, _ = _load_events_and_embeddings()
-        for ev in events:
-            ev_id = str(ev.get("id") or "")
-            ev_slug = ev.get("slug") or ""
-            ev_ticker = ev.get("ticker") or ""
-            
-            if (
-                str(identifier) == ev_id
-                or identifier == ev_slug
-                or identifier == ev_ticker
-            ):
-                markets = ev.get("markets", [])
-                active_markets = [
-                    m for m in markets
-                    if m.get("active") is True and m.get("closed") is False
-                ]
-                return active_markets
-        
-        return []
+        # Fallback: look the event up in the cached index
+        return _markets_from_cached_event(identifier)
 
 
 if __name__ == "__main__":
@@ -493,16 +957,10 @@ if __name__ == "__main__":
     print_full_json = True  # Set to True to print full markets JSON, False to only print event title
     
     # Fetch the event to get its title
-    url = f"https://gamma-api.polymarket.com/events/{id}"
-    headers = {
-        'Cache-Control': 'no-cache, no-store, must-revalidate',
-        'Pragma': 'no-cache',
-        'Expires': '0'
-    }
-    params = {'_t': int(time.time() * 1000)}
+    url = f"{POLYMARKET_EVENTS_URL}/{id}"
     
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=30)
+        response = cached_get(url)
         if response.status_code == 200:
             event = response.json()
             event_title = event.get('title', 'N/A')
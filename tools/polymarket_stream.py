@@ -0,0 +1,244 @@
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from websockets.sync.client import ClientConnection
+
+# Handle both package import and direct execution
+try:
+    from .market_cache import QUOTE_SOURCE, RECEIVED_AT
+    from .quote_book import Quote, QuoteBook
+    from .ws_feed import WebSocketFeed
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.market_cache import QUOTE_SOURCE, RECEIVED_AT
+    from tools.quote_book import Quote, QuoteBook
+    from tools.ws_feed import WebSocketFeed
+
+
+POLYMARKET_CLOB_WS_URL = (
+    os.getenv("POLYMARKET_CLOB_WS_URL") or "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+)
+
+
+def clob_token_ids(market: Dict[str, Any]) -> List[str]:
+    """
+    CLOB token ids of a Gamma market, in `outcomes` order ([YES, NO] for
+    binary markets). Gamma sends the list JSON-encoded as a string.
+    """
+    tokens = market.get("clobTokenIds")
+    if isinstance(tokens, str):
+        try:
+            tokens = json.loads(tokens)
+        except ValueError:
+            return []
+    return [str(t) for t in tokens or [] if t]
+
+
+class _TokenBook:
+    """
+    Price levels for one CLOB token: price -> size, per side.
+    """
+
+    __slots__ = ("bids", "asks")
+
+    def __init__(self, bids: Iterable[Dict[str, Any]], asks: Iterable[Dict[str, Any]]):
+        self.bids: Dict[float, float] = {}
+        self.asks: Dict[float, float] = {}
+        for level in bids or []:
+            self.set_level("BUY", level.get("price"), level.get("size"))
+        for level in asks or []:
+            self.set_level("SELL", level.get("price"), level.get("size"))
+
+    def set_level(self, side: str, price: Any, size: Any) -> None:
+        levels = self.bids if str(side).upper() == "BUY" else self.asks
+        price, size = float(price), float(size)
+        if size > 0:
+            levels[price] = size
+        else:
+            levels.pop(price, None)
+
+    def levels(self) -> Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]:
+        """(bids best-first, asks best-first) as (price, size) lists."""
+        bids = sorted(self.bids.items(), reverse=True)
+        asks = sorted(self.asks.items())
+        return bids, asks
+
+    def top(self) -> Dict[str, Optional[float]]:
+        best_bid = max(self.bids) if self.bids else None
+        best_ask = min(self.asks) if self.asks else None
+        return {
+            "yes_bid": best_bid,
+            "yes_bid_size": self.bids[best_bid] if best_bid is not None else None,
+            "yes_ask": best_ask,
+            "yes_ask_size": self.asks[best_ask] if best_ask is not None else None,
+        }
+
+
+class PolymarketBookStream(WebSocketFeed):
+    """
+    Streams CLOB order books for the tokens behind a set of Polymarket
+    markets and publishes each market's top of book (from its YES token) to a
+    QuoteBook keyed by Gamma market id.
+
+    Usage:
+        stream = PolymarketBookStream(markets).start()   # Gamma market dicts
+        stream.wait_connected(10)
+        quote = stream.get(markets[0]["id"])
+
+    Full per-token depth is available from token_levels(). `url` may point at
+    a local replay server.
+    """
+
+    name = "polymarket"
+
+    def __init__(
+        self,
+        markets: Iterable[Dict[str, Any]],
+        book: Optional[QuoteBook] = None,
+        url: str = POLYMARKET_CLOB_WS_URL,
+    ):
+        super().__init__(url)
+        self.book = book if book is not None else QuoteBook("polymarket")
+        # YES token <-> market id; every subscribed token -> its book
+        self._market_by_token: Dict[str, str] = {}
+        self._token_by_market: Dict[str, str] = {}
+        self.asset_ids: List[str] = []
+        for market in markets:
+            tokens = clob_token_ids(market)
+            if not tokens or market.get("id") is None:
+                continue
+            self._market_by_token[tokens[0]] = str(market["id"])
+            self._token_by_market[str(market["id"])] = tokens[0]
+            self.asset_ids.extend(tokens)
+        self.asset_ids = list(dict.fromkeys(self.asset_ids))
+        self._books: Dict[str, _TokenBook] = {}
+
+    def on_open(self, ws: ClientConnection) -> None:
+        ws.send(json.dumps({"type": "market", "assets_ids": self.asset_ids}))
+
+    def on_disconnect(self) -> None:
+        # A fresh "book" message per token follows the next subscription
+        self._books = {}
+
+    def get(self, market_id: Any) -> Optional[Quote]:
+        return self.book.get(str(market_id))
+
+    def live_quote(self, market_id: Any) -> Optional[Quote]:
+        """
+        The streamed quote for `market_id` if it is current, else None.
+
+        A quote is current while the feed is connected and the market's YES
+        token book arrived on this connection: the book then holds as of the
+        last message received, even if this market has been quiet, so the
+        quote is dated last_message_at rather than its last change.
+        """
+        market_id = str(market_id)
+        quote = self.book.get(market_id)
+        last_message_at = self.last_message_at
+        if quote is None or last_message_at is None or not self.connected:
+            return None
+        if self._token_by_market.get(market_id) not in self._books:
+            return None
+        return quote._replace(received_at=max(quote.received_at, last_message_at))
+
+    def token_levels(self, token_id: str) -> Optional[Tuple[List[Tuple[float, float]], List[Tuple[float, float]]]]:
+        """(bids, asks) for one token, best price first, or None before its snapshot."""
+        token_book = self._books.get(token_id)
+        return token_book.levels() if token_book is not None else None
+
+    def _publish(self, token_id: str, ts: Any) -> None:
+        market_id = self._market_by_token.get(token_id)
+        token_book = self._books.get(token_id)
+        if market_id is None or token_book is None:
+            return
+        self.book.update(
+            market_id,
+            ts=float(ts) / 1000.0 if ts else None,
+            **token_book.top(),
+        )
+
+    def handle_message(self, message: Any) -> None:
+        # The server batches events into JSON arrays
+        if isinstance(message, list):
+            for item in message:
+                self.handle_message(item)
+            return
+        if not isinstance(message, dict):
+            return
+
+        kind = message.get("event_type")
+        ts = message.get("timestamp")
+        if kind == "book":
+            token_id = str(message.get("asset_id"))
+            self._books[token_id] = _TokenBook(
+                message.get("bids", message.get("buys")),
+                message.get("asks", message.get("sells")),
+            )
+            self._publish(token_id, ts)
+        elif kind == "price_change":
+            changes = message.get("price_changes")
+            if changes is None:
+                # Older payloads: one asset per message
+                changes = [
+                    dict(change, asset_id=message.get("asset_id"))
+                    for change in message.get("changes") or []
+                ]
+            touched = []
+            for change in changes:
+                token_id = str(change.get("asset_id"))
+                token_book = self._books.get(token_id)
+                if token_book is None:
+                    continue
+                token_book.set_level(change.get("side"), change.get("price"), change.get("size"))
+                touched.append(token_id)
+            for token_id in dict.fromkeys(touched):
+                self._publish(token_id, ts)
+
+
+def overlay_quotes(markets: List[Dict[str, Any]], stream: PolymarketBookStream) -> List[Dict[str, Any]]:
+    """
+    Return copies of Gamma market dicts with bestBid / bestAsk replaced by
+    the stream's quotes.
+
+    While the feed is connected, subscribed markets always take the streamed
+    quote (see live_quote()). Otherwise a stored quote is used only if it is
+    newer than the market's own REST quotes. Overlaid markets are stamped
+    with the stream quote's receive time.
+    """
+    out: List[Dict[str, Any]] = []
+    for market in markets:
+        market_id = market.get("id")
+        quote = stream.live_quote(market_id)
+        if quote is None:
+            # Feed down: fall back to REST unless the stream saw something later
+            quote = stream.get(market_id)
+            received_at = market.get(RECEIVED_AT)
+            if quote is None or (received_at is not None and received_at > quote.received_at):
+                out.append(market)
+                continue
+        market = dict(market)
+        market[RECEIVED_AT] = quote.received_at
+        market[QUOTE_SOURCE] = "polymarket_ws"
+        market["bestBid"] = quote.yes_bid
+        market["bestAsk"] = quote.yes_ask
+        out.append(market)
+    return out
+
+
+if __name__ == "__main__":
+    import time
+
+    from tools.polymarket import get_markets_for_event
+
+    # Simple manual test: stream the markets of a sample event for ten seconds.
+    sample_event_id = "16085"
+    with PolymarketBookStream(get_markets_for_event(event_id=sample_event_id)) as stream:
+        stream.wait_connected(10)
+        for _ in range(10):
+            time.sleep(1)
+            for quote in stream.book.snapshot().values():
+                print(quote)
@@ -0,0 +1,31 @@
+from typing import Any, Dict, Iterable, Optional
+
+
+def project_fields(
+    record: Dict[str, Any],
+    fields: Optional[Iterable[str]],
+) -> Dict[str, Any]:
+    """
+    Return a new dict with only `fields` from `record` (missing fields -> None).
+
+    `fields=None` means "full payload": a shallow copy of the whole record.
+    """
+    if fields is None:
+        return dict(record)
+    return {f: record.get(f) for f in fields}
+
+
+def scored_event(
+    ev: Dict[str, Any],
+    score: float,
+    fields: Optional[Iterable[str]],
+    **extra: Any,
+) -> Dict[str, Any]:
+    """
+    Project a search hit and attach its score plus any extra tags
+    (e.g. venue, match_type).
+    """
+    out = project_fields(ev, fields)
+    out.update(extra)
+    out["score"] = score
+    return out
@@ -0,0 +1,123 @@
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+
+class Quote(NamedTuple):
+    """
+    Top of book for one binary market, in dollars (0-1) per YES contract.
+
+    NO prices mirror YES: buying NO means selling YES, so no_ask = 1 - yes_bid
+    and no_bid = 1 - yes_ask, with the sizes swapped accordingly.
+    """
+
+    venue: str
+    market_id: str
+    yes_bid: Optional[float]
+    yes_ask: Optional[float]
+    yes_bid_size: Optional[float]
+    yes_ask_size: Optional[float]
+    # Exchange timestamp (epoch seconds) if the venue sent one, else received_at
+    ts: float
+    # Local wall-clock time (epoch seconds) the update was received
+    received_at: float
+
+    @property
+    def no_bid(self) -> Optional[float]:
+        return None if self.yes_ask is None else round(1.0 - self.yes_ask, 6)
+
+    @property
+    def no_ask(self) -> Optional[float]:
+        return None if self.yes_bid is None else round(1.0 - self.yes_bid, 6)
+
+    @property
+    def no_bid_size(self) -> Optional[float]:
+        return self.yes_ask_size
+
+    @property
+    def no_ask_size(self) -> Optional[float]:
+        return self.yes_bid_size
+
+    @property
+    def age(self) -> float:
+        """Seconds since this quote was received."""
+        return time.time() - self.received_at
+
+
+QuoteListener = Callable[[Quote], None]
+
+
+class QuoteBook:
+    """
+    In-memory latest quote per market, written by one feed thread and read
+    by any number of threads.
+
+    Quotes are immutable tuples and each update replaces the dict entry in a
+    single assignment, so get() / snapshot() take no lock and never see a
+    half-written quote. Listeners registered with subscribe() are called on
+    the feed thread after every update and should return quickly.
+    """
+
+    def __init__(self, venue: str):
+        self.venue = venue
+        self._quotes: Dict[str, Quote] = {}
+        self._listeners: List[QuoteListener] = []
+        self._listeners_lock = threading.Lock()
+        self.updates = 0
+
+    def __len__(self) -> int:
+        return len(self._quotes)
+
+    def __contains__(self, market_id: object) -> bool:
+        return market_id in self._quotes
+
+    def get(self, market_id: str) -> Optional[Quote]:
+        """Latest quote for `market_id`, or None if none has arrived yet."""
+        return self._quotes.get(market_id)
+
+    def snapshot(self) -> Dict[str, Quote]:
+        """Copy of every current quote, keyed by market id."""
+        return dict(self._quotes)
+
+    def subscribe(self, listener: QuoteListener) -> None:
+        with self._listeners_lock:
+            self._listeners = self._listeners + [listener]
+
+    def unsubscribe(self, listener: QuoteListener) -> None:
+        with self._listeners_lock:
+            self._listeners = [l for l in self._listeners if l is not listener]
+
+    def update(
+        self,
+        market_id: str,
+        yes_bid: Optional[float],
+        yes_ask: Optional[float],
+        yes_bid_size: Optional[float] = None,
+        yes_ask_size: Optional[float] = None,
+        ts: Optional[float] = None,
+    ) -> Quote:
+        """
+        Publish a new top of book for `market_id` (feed thread only).
+        """
+        received_at = time.time()
+        quote = Quote(
+            venue=self.venue,
+            market_id=market_id,
+            yes_bid=yes_bid,
+            yes_ask=yes_ask,
+            yes_bid_size=yes_bid_size,
+            yes_ask_size=yes_ask_size,
+            ts=ts if ts is not None else received_at,
+            received_at=received_at,
+        )
+        self._quotes[market_id] = quote
+        self.updates += 1
+        for listener in self._listeners:
+            try:
+                listener(quote)
+            except Exception as e:
+                print(f"{self.venue} quote listener failed: {e}")
+        return quote
+
+    def discard(self, market_id: str) -> None:
+        self._quotes.pop(market_id, None)
@@ -0,0 +1,183 @@
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Handle both package import and direct execution
+try:
+    from .cross_venue_search import DEFAULT_VENUES, VENUE_MODULES
+    from .knn_graph import DEFAULT_KNN_K, NeighborGraph
+    from .projection import project_fields, scored_event
+    from .vector_index import EventVectorIndex
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.cross_venue_search import DEFAULT_VENUES, VENUE_MODULES
+    from tools.knn_graph import DEFAULT_KNN_K, NeighborGraph
+    from tools.projection import project_fields, scored_event
+    from tools.vector_index import EventVectorIndex
+
+
+# Default on-disk locations for the cross-venue graphs. Within-venue graphs
+# live next to each venue's index (see DEFAULT_KNN_PATH in the venue modules).
+CROSS_VENUE_KNN_PATHS = {
+    ("kalshi", "polymarket"): "data/knn_kalshi_to_polymarket.npz",
+    ("polymarket", "kalshi"): "data/knn_polymarket_to_kalshi.npz",
+}
+
+# (src_venue, dst_venue) -> (src_index, dst_index, graph) the graph was validated against
+_GRAPHS: Dict[Tuple[str, str], Tuple[EventVectorIndex, EventVectorIndex, NeighborGraph]] = {}
+
+
+def _graph_path(src_venue: str, dst_venue: str) -> str:
+    if src_venue == dst_venue:
+        return VENUE_MODULES[src_venue].DEFAULT_KNN_PATH
+    return CROSS_VENUE_KNN_PATHS[(src_venue, dst_venue)]
+
+
+def get_neighbor_graph(
+    src_venue: str,
+    dst_venue: str,
+    k: int = DEFAULT_KNN_K,
+) -> NeighborGraph:
+    """
+    Return the top-k neighbor graph from `src_venue` events to `dst_venue` events.
+
+    Loaded from disk when the stored key lists still match the current
+    indexes. If the indexes only gained events (appended by an incremental
+    refresh), just the new rows and columns are scored and merged in;
+    otherwise the graph is rebuilt once (blocked matmul). Either way it is
+    written back and cached in-process until either venue's index is replaced.
+    """
+    src_index = VENUE_MODULES[src_venue].get_vector_index()
+    dst_index = VENUE_MODULES[dst_venue].get_vector_index()
+
+    cached = _GRAPHS.get((src_venue, dst_venue))
+    if cached is not None and cached[0] is src_index and cached[1] is dst_index:
+        return cached[2]
+
+    path = _graph_path(src_venue, dst_venue)
+    graph: Optional[NeighborGraph] = None
+    if os.path.exists(path):
+        graph = NeighborGraph.load(path)
+        if not graph.matches_keys(src_index.keys, dst_index.keys):
+            graph = graph.extend(
+                src_index.keys,
+                src_index.matrix,
+                dst_index.keys,
+                dst_index.matrix,
+                k=k,
+                exclude_self=src_venue == dst_venue,
+            )
+            if graph is not None:
+                graph.save(path)
+
+    if graph is None:
+        print(f"Building {src_venue} -> {dst_venue} related-events graph (k={k})...")
+        graph = NeighborGraph.build(
+            src_index.keys,
+            src_index.matrix,
+            dst_index.keys,
+            dst_index.matrix,
+            k=k,
+            exclude_self=src_venue == dst_venue,
+        )
+        graph.save(path)
+
+    _GRAPHS[(src_venue, dst_venue)] = (src_index, dst_index, graph)
+    return graph
+
+
+def ensure_related_graphs_on_disk(
+    venues: Sequence[str] = DEFAULT_VENUES,
+    k: int = DEFAULT_KNN_K,
+) -> None:
+    """
+    Make sure every within-venue and cross-venue graph exists and is current.
+    """
+    for src_venue in venues:
+        for dst_venue in venues:
+            get_neighbor_graph(src_venue, dst_venue, k=k)
+
+
+def _resolve_identifier(
+    identifier: str,
+    venues: Sequence[str],
+) -> Optional[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Map a ticker/id/slug to (venue, index_key, event) via the identifier indexes.
+    """
+    for venue in venues:
+        module = VENUE_MODULES[venue]
+        ev = module.get_event_by_identifier(identifier)
+        if ev is not None:
+            key = module.event_key(ev)
+            if key:
+                return venue, key, ev
+    return None
+
+
+def find_related_events(
+    identifier: str,
+    limit: int = 5,
+    venues: Sequence[str] = DEFAULT_VENUES,
+    full_payload: bool = False,
+) -> Dict[str, Any]:
+    """
+    Return events related to the event identified by `identifier`.
+
+    Reads the precomputed top-k graphs, so each venue costs an O(1) key lookup
+    plus an O(k) slice instead of a fresh similarity scan or embedding call.
+
+    Returns a dict with:
+    - identifier
+    - venue: venue of the source event (None if not found)
+    - event: the source event (None if not found)
+    - related: {venue -> list of event dicts with "venue" and "score"}
+
+    Events are projected to each venue's SLIM_EVENT_FIELDS unless
+    full_payload=True.
+    """
+    resolved = _resolve_identifier(identifier, venues)
+    if resolved is None:
+        return {"identifier": identifier, "venue": None, "event": None, "related": {}}
+
+    src_venue, src_key, src_event = resolved
+
+    related: Dict[str, List[Dict[str, Any]]] = {}
+    for dst_venue in venues:
+        graph = get_neighbor_graph(src_venue, dst_venue)
+        dst_index = VENUE_MODULES[dst_venue].get_vector_index()
+
+        fields = None if full_payload else VENUE_MODULES[dst_venue].SLIM_EVENT_FIELDS
+
+        hits: List[Dict[str, Any]] = []
+        for dst_key, score in graph.neighbors(src_key, k=limit):
+            ev = dst_index.get_event(dst_key)
+            if ev is None:
+                continue
+            hits.append(scored_event(ev, score, fields, venue=dst_venue))
+        related[dst_venue] = hits
+
+    src_fields = None if full_payload else VENUE_MODULES[src_venue].SLIM_EVENT_FIELDS
+    return {
+        "identifier": identifier,
+        "venue": src_venue,
+        "event": project_fields(src_event, src_fields),
+        "related": related,
+    }
+
+
+if __name__ == "__main__":
+    import time
+    start_time = time.time()
+    ensure_related_graphs_on_disk()
+    end_time = time.time()
+    print(f"Time taken to ensure related-events graphs: {end_time - start_time} seconds")
+    start_time = time.time()
+    results = find_related_events("KXBALANCE-29")
+    end_time = time.time()
+    print(f"Time taken to read related events: {end_time - start_time} seconds")
+    for venue, events in results["related"].items():
+        for event in events:
+            print(f"[{venue}] {event['score']:.4f} {event.get('title', 'N/A')}")
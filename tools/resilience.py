@@ -0,0 +1,205 @@
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+import dotenv
+import requests
+
+dotenv.load_dotenv()
+
+
+# Attempts per request (first try included) before giving up
+RETRY_MAX_ATTEMPTS = int(os.getenv("RETRY_MAX_ATTEMPTS") or 6)
+
+# Exponential backoff: base * 2**attempt, capped, with full jitter
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY") or 0.5)
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY") or 30)
+
+# Consecutive failed requests that open a venue's circuit, and seconds it
+# stays open before a single trial request is let through
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD") or 5)
+CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT") or 30)
+
+# 429 means "slow down", not "broken": it is retried (honouring Retry-After)
+# but does not count towards opening the circuit.
+THROTTLED_STATUS = 429
+RETRY_SERVER_STATUSES = frozenset({500, 502, 503, 504})
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """
+    Raised instead of sending a request while a venue's circuit is open.
+
+    Subclasses RequestException so existing `except RequestException`
+    handlers treat it like any other failed request.
+    """
+
+
+class CircuitBreaker:
+    """
+    Per-venue circuit breaker.
+
+    closed -> open after `failure_threshold` consecutive failures; while open,
+    calls fail fast with CircuitOpenError. After `reset_timeout` seconds one
+    trial call is allowed (half-open): success closes the circuit, failure
+    re-opens it. Thread-safe.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return self._opened_at is not None
+
+    def before_call(self) -> None:
+        """
+        Raise CircuitOpenError unless a request may be sent now.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if remaining > 0 or self._trial_in_flight:
+                raise CircuitOpenError(
+                    f"{self.name} circuit open after {self._failures} consecutive failures; "
+                    f"retry in {max(remaining, 0):.1f}s"
+                )
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    print(f"{self.name}: opening circuit after {self._failures} consecutive failures")
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def release_trial(self) -> None:
+        """
+        End a half-open trial that was neither a success nor a failure
+        (e.g. throttled), so the next call may try again.
+        """
+        with self._lock:
+            self._trial_in_flight = False
+
+
+_BREAKERS: Dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Return the shared breaker for `name` (e.g. "kalshi", "polymarket").
+    """
+    with _BREAKERS_LOCK:
+        breaker = _BREAKERS.get(name)
+        if breaker is None:
+            breaker = _BREAKERS[name] = CircuitBreaker(name)
+        return breaker
+
+
+def retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """
+    Parse a Retry-After header (delta-seconds or HTTP date), if any.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(
+    attempt: int,
+    base_delay: float = RETRY_BASE_DELAY,
+    max_delay: float = RETRY_MAX_DELAY,
+) -> float:
+    """
+    Full-jitter exponential backoff for the given (0-based) retry attempt.
+    """
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+def send_with_retry(
+    send: Callable[[], requests.Response],
+    breaker: CircuitBreaker,
+    max_attempts: int = RETRY_MAX_ATTEMPTS,
+    base_delay: float = RETRY_BASE_DELAY,
+    max_delay: float = RETRY_MAX_DELAY,
+) -> requests.Response:
+    """
+    Call `send()` (one HTTP request) until it succeeds or retries run out.
+
+    - 429: waits Retry-After (or backoff) and retries; the circuit is not
+      affected, so throttled bulk fetches slow down instead of failing. A
+      Retry-After longer than `max_delay` is not waited out: the 429 is
+      returned at once.
+    - 5xx / connection errors / timeouts: backoff with jitter and retry;
+      each counts as a failure towards opening `breaker`.
+    - Anything else (2xx, 304, other 4xx) is returned as is.
+
+    Once retries run out the last response is returned (callers still call
+    raise_for_status()) or the last exception re-raised. While the circuit is
+    open no request is sent and CircuitOpenError is raised.
+    """
+    attempt = 0
+    while True:
+        breaker.before_call()
+        try:
+            response = send()
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            breaker.record_failure()
+            if attempt + 1 >= max_attempts:
+                raise
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
+            attempt += 1
+            continue
+
+        status = response.status_code
+        if status == THROTTLED_STATUS:
+            breaker.release_trial()
+            delay = retry_after_seconds(response)
+            if delay is not None and delay > max_delay:
+                return response
+        elif status in RETRY_SERVER_STATUSES:
+            breaker.record_failure()
+            delay = None
+        else:
+            breaker.record_success()
+            return response
+
+        if attempt + 1 >= max_attempts:
+            return response
+        if delay is None:
+            delay = backoff_delay(attempt, base_delay, max_delay)
+        time.sleep(delay)
+        attempt += 1
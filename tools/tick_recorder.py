@@ -0,0 +1,238 @@
+import glob
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Handle both package import and direct execution
+try:
+    from .quote_book import Quote
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.quote_book import Quote
+
+
+# Root directory; ticks land in <dir>/<YYYY-MM-DD>/ticks-<HHMMSS>-<n>.npz (UTC)
+DEFAULT_TICK_DIR = "data/ticks"
+
+# A chunk file is written when this many ticks are buffered ...
+TICK_FLUSH_ROWS = 50_000
+# ... or when the oldest buffered tick is this old (seconds)
+TICK_FLUSH_SECONDS = 30.0
+# Ticks held in memory at most; beyond this new ticks are dropped (and
+# counted) rather than slowing down the caller.
+TICK_BUFFER_MAX = 500_000
+
+TICK_COLUMNS = ("venue", "market_id", "bid", "ask", "bid_size", "ask_size", "received_at")
+
+_Tick = Tuple[str, str, float, float, float, float, float]
+
+_NAN = float("nan")
+
+_SECONDS_PER_DAY = 86_400
+
+
+def _f(value: Any) -> float:
+    return _NAN if value is None else float(value)
+
+
+def _day(ts: float) -> str:
+    return datetime.fromtimestamp(float(ts), tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+class TickRecorder:
+    """
+    Append-only recorder of observed quotes (YES bid/ask in dollars, sizes,
+    receive time) in compressed columnar chunk files partitioned by UTC day.
+
+    record() only appends a tuple to an in-memory buffer; a background thread
+    turns full (or old) buffers into numpy column arrays and writes them with
+    np.savez_compressed, so callers never wait on disk or compression. The
+    buffer is bounded by `max_buffered`: if the writer falls that far behind,
+    further ticks are dropped and counted in `dropped`.
+
+    Read back with load_ticks().
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_TICK_DIR,
+        flush_rows: int = TICK_FLUSH_ROWS,
+        flush_seconds: float = TICK_FLUSH_SECONDS,
+        max_buffered: int = TICK_BUFFER_MAX,
+    ):
+        self.directory = directory
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.max_buffered = max_buffered
+        self.recorded = 0
+        self.dropped = 0
+        self.files_written = 0
+
+        self._buffer: List[_Tick] = []
+        self._pending = 0
+        self._oldest: Optional[float] = None
+        self._lock = threading.Lock()
+        # Serializes chunk writes between the writer thread and flush()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._seq = 0
+        self._writer = threading.Thread(target=self._run, name="tick-recorder", daemon=True)
+        self._writer.start()
+
+    def record(
+        self,
+        venue: str,
+        market_id: Any,
+        bid: Optional[float],
+        ask: Optional[float],
+        bid_size: Optional[float] = None,
+        ask_size: Optional[float] = None,
+        received_at: Optional[float] = None,
+    ) -> bool:
+        """
+        Buffer one tick. Returns False if it was dropped (buffer full or closed).
+        """
+        tick = (
+            venue,
+            str(market_id),
+            _f(bid),
+            _f(ask),
+            _f(bid_size),
+            _f(ask_size),
+            received_at if received_at is not None else time.time(),
+        )
+        with self._lock:
+            if self._closed or self._pending >= self.max_buffered:
+                self.dropped += 1
+                return False
+            self._buffer.append(tick)
+            self._pending += 1
+            self.recorded += 1
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if len(self._buffer) >= self.flush_rows:
+                self._wake.set()
+        return True
+
+    def record_quote(self, quote: Quote) -> bool:
+        """
+        Buffer a streamed Quote; usable directly as a QuoteBook listener.
+        """
+        return self.record(
+            quote.venue,
+            quote.market_id,
+            quote.yes_bid,
+            quote.yes_ask,
+            quote.yes_bid_size,
+            quote.yes_ask_size,
+            quote.received_at,
+        )
+
+    def flush(self) -> None:
+        """Write everything buffered so far (synchronously)."""
+        with self._write_lock:
+            self._write(self._take())
+
+    def close(self) -> None:
+        """Stop accepting ticks, write the remainder and stop the writer thread."""
+        with self._lock:
+            self._closed = True
+        self._wake.set()
+        self._writer.join()
+
+    def __enter__(self) -> "TickRecorder":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _take(self) -> List[_Tick]:
+        with self._lock:
+            ticks, self._buffer = self._buffer, []
+            self._oldest = None
+        return ticks
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(timeout=min(1.0, self.flush_seconds))
+            self._wake.clear()
+            with self._lock:
+                closed = self._closed
+                due = (
+                    len(self._buffer) >= self.flush_rows
+                    or (self._oldest is not None and time.monotonic() - self._oldest >= self.flush_seconds)
+                )
+            if due or closed:
+                try:
+                    with self._write_lock:
+                        self._write(self._take())
+                except Exception as e:
+                    print(f"Tick recorder failed to write chunk: {e}")
+            if closed:
+                return
+
+    def _write(self, ticks: List[_Tick]) -> None:
+        if not ticks:
+            return
+        try:
+            venue, market_id, bid, ask, bid_size, ask_size, received_at = zip(*ticks)
+            columns = {
+                "venue": np.array(venue),
+                "market_id": np.array(market_id),
+                "bid": np.array(bid, dtype=np.float32),
+                "ask": np.array(ask, dtype=np.float32),
+                "bid_size": np.array(bid_size, dtype=np.float32),
+                "ask_size": np.array(ask_size, dtype=np.float32),
+                "received_at": np.array(received_at, dtype=np.float64),
+            }
+            # Ticks may arrive out of order (received_at comes from the
+            # caller), so partition by every tick's day
+            days = (columns["received_at"] // _SECONDS_PER_DAY).astype(np.int64)
+            unique_days = np.unique(days)
+            if len(unique_days) == 1:
+                self._write_chunk(_day(unique_days[0] * _SECONDS_PER_DAY), columns)
+            else:
+                for day in unique_days:
+                    mask = days == day
+                    self._write_chunk(_day(day * _SECONDS_PER_DAY), {k: v[mask] for k, v in columns.items()})
+        finally:
+            with self._lock:
+                self._pending -= len(ticks)
+
+    def _write_chunk(self, day: str, columns: Dict[str, np.ndarray]) -> None:
+        day_dir = os.path.join(self.directory, day)
+        os.makedirs(day_dir, exist_ok=True)
+        self._seq += 1
+        name = f"ticks-{datetime.now(timezone.utc).strftime('%H%M%S')}-{os.getpid()}-{self._seq}.npz"
+        path = os.path.join(day_dir, name)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **columns)
+        # Readers only ever see complete chunks
+        os.replace(tmp, path)
+        self.files_written += 1
+
+
+def load_ticks(day: str, directory: str = DEFAULT_TICK_DIR) -> Dict[str, np.ndarray]:
+    """
+    Load every tick recorded on `day` ("YYYY-MM-DD", UTC) as columns
+    (see TICK_COLUMNS), sorted by receive time.
+    """
+    paths = sorted(glob.glob(os.path.join(directory, day, "ticks-*.npz")))
+    if not paths:
+        return {name: np.array([]) for name in TICK_COLUMNS}
+    chunks = []
+    for path in paths:
+        with np.load(path) as data:
+            chunks.append({name: data[name] for name in TICK_COLUMNS})
+    columns = {name: np.concatenate([c[name] for c in chunks]) for name in TICK_COLUMNS}
+    order = np.argsort(columns["received_at"], kind="stable")
+    return {name: col[order] for name, col in columns.items()}
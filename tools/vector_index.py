@@ -0,0 +1,139 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize_vector(vec: Sequence[float]) -> Optional[np.ndarray]:
+    """
+    L2-normalize a single embedding vector.
+
+    Returns None for empty or all-zero vectors so callers can bail out early.
+    """
+    if vec is None or len(vec) == 0:
+        return None
+    arr = np.asarray(vec, dtype=np.float32)
+    norm = float(np.linalg.norm(arr))
+    if norm == 0.0:
+        return None
+    return arr / norm
+
+
+class EventVectorIndex:
+    """
+    In-memory vector index over one venue's events.
+
+    Holds a single L2-normalized float32 matrix (one row per event that has an
+    embedding), so scoring a query is one matrix-vector product instead of a
+    Python loop over every event.
+    """
+
+    def __init__(
+        self,
+        venue: str,
+        events: List[Dict[str, Any]],
+        embeds: Dict[str, List[float]],
+        key_fn: Callable[[Dict[str, Any]], Optional[str]],
+    ) -> None:
+        self.venue = venue
+        self.events = events
+        self.embeds = embeds
+
+        self.keys: List[str] = []
+        self.rows: List[Dict[str, Any]] = []
+        vectors: List[List[float]] = []
+        categories: List[str] = []
+
+        dim: Optional[int] = None
+        for ev in events:
+            key = key_fn(ev)
+            if not key:
+                continue
+            vec = embeds.get(key)
+            if not vec:
+                continue
+            if dim is None:
+                dim = len(vec)
+            elif len(vec) != dim:
+                continue
+            self.keys.append(key)
+            self.rows.append(ev)
+            vectors.append(vec)
+            categories.append((ev.get("category") or "").lower())
+
+        self.dim = dim or 0
+        if vectors:
+            matrix = np.asarray(vectors, dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            norms[norms == 0] = 1
+            self.matrix = matrix / norms
+        else:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+        self.categories = np.asarray(categories, dtype=object)
+        self._key_pos: Dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def is_built_from(
+        self,
+        events: List[Dict[str, Any]],
+        embeds: Dict[str, List[float]],
+    ) -> bool:
+        """True if this index was built from exactly these (cached) objects."""
+        return self.events is events and self.embeds is embeds
+
+    def get_event(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the event stored under index key `key`, or None."""
+        pos = self._key_pos.get(key)
+        return self.rows[pos] if pos is not None else None
+
+    def score(
+        self,
+        query_vec: np.ndarray,
+        categories: Optional[List[str]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Score every event against a normalized query vector.
+
+        Returns (row_positions, similarities) for rows with positive similarity
+        that pass the optional category filter, in no particular order.
+        """
+        if len(self.rows) == 0 or query_vec is None or query_vec.shape[0] != self.dim:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, np.zeros(0, dtype=np.float32)
+
+        sims = self.matrix @ query_vec
+        mask = sims > 0.0
+        if categories:
+            cat_set = {c.lower() for c in categories}
+            mask &= np.fromiter(
+                (c in cat_set for c in self.categories),
+                dtype=bool,
+                count=len(self.categories),
+            )
+
+        positions = np.nonzero(mask)[0]
+        return positions, sims[positions]
+
+    def search(
+        self,
+        query_vec: np.ndarray,
+        limit: int = 10,
+        categories: Optional[List[str]] = None,
+    ) -> Tuple[int, List[Tuple[Dict[str, Any], float]]]:
+        """
+        Return (total_matches, [(event, score), ...]) for the top `limit` rows.
+        """
+        positions, sims = self.score(query_vec, categories=categories)
+        total = int(positions.shape[0])
+        k = max(0, min(limit, total))
+        if k == 0:
+            return total, []
+
+        if k < total:
+            top = np.argpartition(-sims, k - 1)[:k]
+        else:
+            top = np.arange(total)
+        top = top[np.argsort(-sims[top], kind="stable")]
+
+        return total, [(self.rows[positions[i]], float(sims[i])) for i in top]
@@ -0,0 +1,158 @@
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from websockets.exceptions import ConnectionClosed, WebSocketException
+from websockets.sync.client import ClientConnection, connect
+
+# Handle both package import and direct execution
+try:
+    from .resilience import backoff_delay
+except ImportError:
+    # When running directly, add parent directory to path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from tools.resilience import backoff_delay
+
+
+# Longest pause between reconnect attempts, seconds
+WS_RECONNECT_MAX_DELAY = 30.0
+
+
+class ResubscribeRequired(Exception):
+    """
+    Raised from handle_message() when the local book can no longer be trusted
+    (e.g. a sequence gap); the feed reconnects and resubscribes.
+    """
+
+
+class WebSocketFeed:
+    """
+    Background thread that keeps one market-data WebSocket connected.
+
+    Subclasses implement:
+    - connect_headers(): extra handshake headers (e.g. auth), evaluated on
+      every (re)connect.
+    - on_open(ws): send subscriptions.
+    - handle_message(message): apply one decoded JSON message.
+
+    Dropped connections, and any error while connecting or applying a
+    message, are retried with jittered exponential backoff; local state is
+    rebuilt from the snapshots the venue sends after resubscribing. `running`,
+    `connected`, `last_message_at` and `last_error` expose the feed's health.
+    """
+
+    name = "ws"
+
+    def __init__(self, url: str):
+        self.url = url
+        self._stop = threading.Event()
+        self._connected = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._ws: Optional[ClientConnection] = None
+        self.reconnects = 0
+        # Most recent error that forced a reconnect (None if none yet)
+        self.last_error: Optional[BaseException] = None
+        # Wall-clock time the last message was applied; local books are
+        # current as of then while the feed stays connected
+        self.last_message_at: Optional[float] = None
+
+    # --- subclass hooks -------------------------------------------------
+    def connect_headers(self) -> Dict[str, str]:
+        return {}
+
+    def on_open(self, ws: ClientConnection) -> None:
+        pass
+
+    def on_disconnect(self) -> None:
+        pass
+
+    def handle_message(self, message: Any) -> None:
+        raise NotImplementedError
+
+    # --- lifecycle ------------------------------------------------------
+    def start(self) -> "WebSocketFeed":
+        if self._thread is not None and self._thread.is_alive():
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wait_connected(self, timeout: Optional[float] = None) -> bool:
+        """Block until the first subscription has been sent."""
+        return self._connected.wait(timeout)
+
+    def __enter__(self) -> "WebSocketFeed":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    @property
+    def running(self) -> bool:
+        """True while the feed thread is alive (connected or reconnecting)."""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def connected(self) -> bool:
+        """True while a connection is open (between reconnects it is False)."""
+        return self._ws is not None
+
+    def _run(self) -> None:
+        attempt = 0
+        while not self._stop.is_set():
+            try:
+                headers = self.connect_headers()
+                with connect(self.url, additional_headers=headers) as ws:
+                    self._ws = ws
+                    self.on_open(ws)
+                    self._connected.set()
+                    attempt = 0
+                    for raw in ws:
+                        if self._stop.is_set():
+                            break
+                        try:
+                            message = json.loads(raw)
+                        except (TypeError, ValueError):
+                            continue
+                        try:
+                            self.handle_message(message)
+                        except ResubscribeRequired:
+                            raise
+                        except Exception as e:
+                            # A malformed message leaves the local book in an
+                            # unknown state: rebuild it from fresh snapshots
+                            raise ResubscribeRequired(f"failed to apply message ({type(e).__name__}: {e})") from e
+                        self.last_message_at = time.time()
+            except ResubscribeRequired as e:
+                self.last_error = e
+                print(f"{self.name}: {e}; resubscribing")
+            except (ConnectionClosed, WebSocketException, OSError) as e:
+                if not self._stop.is_set():
+                    self.last_error = e
+                    print(f"{self.name}: connection lost ({e})")
+            except Exception as e:
+                # e.g. connect_headers() failing to sign; retry with backoff
+                # rather than letting the thread die silently
+                self.last_error = e
+                print(f"{self.name}: {type(e).__name__}: {e}; reconnecting")
+            finally:
+                self._ws = None
+                self.on_disconnect()
+
+            if self._stop.is_set():
+                break
+            self.reconnects += 1
+            self._stop.wait(backoff_delay(attempt, max_delay=WS_RECONNECT_MAX_DELAY))
+            attempt += 1